@@ -4,11 +4,15 @@ Supports multiple environments and providers.
 """
 
 from pydantic_settings import BaseSettings
-from pydantic import Field
-from typing import Optional, Dict, Any
-from functools import lru_cache
+from pydantic import Field, PrivateAttr, field_validator, model_validator
+from typing import Optional, Any, Mapping
+from functools import cached_property
+from types import MappingProxyType
 from enum import Enum
 
+# Shared read-only result for unknown providers
+_EMPTY_CONFIG: Mapping[str, Any] = MappingProxyType({})
+
 
 class Environment(str, Enum):
     """Application environment."""
@@ -67,6 +71,13 @@ class Settings(BaseSettings):
     # Default LLM Provider
     default_llm_provider: str = Field(
         default="gemini", env="DEFAULT_LLM_PROVIDER")
+    warmup_providers: bool = Field(default=True, env="WARMUP_PROVIDERS")
+
+    # LLM response cache (deterministic calls only, temperature == 0)
+    llm_cache_enabled: bool = Field(default=True, env="LLM_CACHE_ENABLED")
+    llm_cache_backend: str = Field(default="memory", env="LLM_CACHE_BACKEND")
+    llm_cache_ttl_seconds: int = Field(
+        default=3600, env="LLM_CACHE_TTL_SECONDS")
 
     # Search Providers
     google_search_api_key: str = Field(default="", env="GOOGLE_SEARCH_API_KEY")
@@ -80,6 +91,8 @@ class Settings(BaseSettings):
     search_timeout_seconds: int = Field(
         default=15, env="SEARCH_TIMEOUT_SECONDS")
     search_max_retries: int = Field(default=2, env="SEARCH_MAX_RETRIES")
+    search_max_concurrency: int = Field(
+        default=5, env="SEARCH_MAX_CONCURRENCY")
     search_cache_ttl_minutes: int = Field(
         default=20, env="SEARCH_CACHE_TTL_MINUTES")
 
@@ -125,50 +138,107 @@ class Settings(BaseSettings):
         env="DATABASE_URL"
     )
     database_echo: bool = Field(default=False, env="DATABASE_ECHO")
-    database_pool_size: int = Field(default=5, env="DATABASE_POOL_SIZE")
-    database_max_overflow: int = Field(default=10, env="DATABASE_MAX_OVERFLOW")
+    database_pool_size: int = Field(default=10, env="DATABASE_POOL_SIZE")
+    database_max_overflow: int = Field(default=20, env="DATABASE_MAX_OVERFLOW")
+    # Recycle pooled connections before server-side idle timeouts kill them
+    database_pool_recycle: int = Field(
+        default=1800, env="DATABASE_POOL_RECYCLE")
+    database_pool_pre_ping: bool = Field(
+        default=True, env="DATABASE_POOL_PRE_PING")
+
+    # SQLite tuning (applied as PRAGMAs on every new connection)
+    sqlite_journal_mode: str = Field(default="WAL", env="SQLITE_JOURNAL_MODE")
+    sqlite_synchronous: str = Field(default="NORMAL", env="SQLITE_SYNCHRONOUS")
+    sqlite_cache_size: int = Field(default=-64000, env="SQLITE_CACHE_SIZE")
+    sqlite_mmap_size: int = Field(default=268435456, env="SQLITE_MMAP_SIZE")
+    sqlite_busy_timeout_ms: int = Field(
+        default=5000, env="SQLITE_BUSY_TIMEOUT_MS")
 
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
         case_sensitive = False
 
-    def get_llm_config(self, provider: str) -> Dict[str, Any]:
-        """Get configuration for a specific LLM provider."""
-        configs = {
-            "gemini": {
+    # Read-only per-provider LLM table, built once after validation
+    _llm_configs: Mapping[str, Mapping[str, Any]] = PrivateAttr(
+        default_factory=dict)
+
+    @field_validator("database_url")
+    @classmethod
+    def _use_async_postgres_driver(cls, v: str) -> str:
+        # Plain or psycopg2 PostgreSQL URLs can't back an async engine;
+        # run them through asyncpg
+        scheme, sep, rest = v.partition("://")
+        if sep and scheme in ("postgres", "postgresql", "postgresql+psycopg2"):
+            return f"postgresql+asyncpg://{rest}"
+        return v
+
+    @model_validator(mode="after")
+    def _build_llm_configs(self) -> "Settings":
+        self._llm_configs = MappingProxyType({
+            "gemini": MappingProxyType({
                 "api_key": self.gemini_api_key,
                 "model": self.gemini_model,
-            },
-            "openai": {
+            }),
+            "openai": MappingProxyType({
                 "api_key": self.openai_api_key,
                 "model": self.openai_model,
-            },
-            "anthropic": {
+            }),
+            "anthropic": MappingProxyType({
                 "api_key": self.anthropic_api_key,
                 "model": self.anthropic_model,
-            }
-        }
-        return configs.get(provider, {})
+            })
+        })
+        return self
 
-    def is_provider_configured(self, provider: str) -> bool:
-        """Check if a provider has its API key configured."""
-        config = self.get_llm_config(provider)
-        return bool(config.get("api_key"))
+    @model_validator(mode="after")
+    def _coerce_sqlite_pool(self) -> "Settings":
+        # SQLite doesn't use a sized pool; overflow settings would be ignored
+        # or rejected by the dialect, so pin them to zero
+        if self.is_sqlite:
+            self.database_pool_size = 0
+            self.database_max_overflow = 0
+        return self
+
+    @property
+    def is_sqlite(self) -> bool:
+        """Whether database_url points at SQLite."""
+        return self.database_url.startswith("sqlite")
 
-    def parsed_allowed_origins(self) -> list[str]:
-        """Return allowed origins for CORS as list."""
+    @property
+    def sql_echo(self) -> bool:
+        """Log SQL statements; only ever enabled for development debugging."""
+        return self.debug and self.environment == Environment.DEVELOPMENT
+
+    @cached_property
+    def _allowed_origins(self) -> tuple[str, ...]:
+        """CORS origins parsed once from the comma-separated setting."""
         raw = self.allowed_origins.strip()
         if not raw:
-            return ["*"]
-        origins = [o.strip() for o in raw.split(",") if o.strip()]
-        return origins or ["*"]
+            return ("*",)
+        origins = tuple(o.strip() for o in raw.split(",") if o.strip())
+        return origins or ("*",)
+
+    def get_llm_config(self, provider: str) -> Mapping[str, Any]:
+        """Get read-only configuration for a specific LLM provider."""
+        return self._llm_configs.get(provider, _EMPTY_CONFIG)
+
+    def is_provider_configured(self, provider: str) -> bool:
+        """Check if a provider has its API key configured."""
+        return bool(self._llm_configs.get(provider, _EMPTY_CONFIG).get("api_key"))
+
+    def parsed_allowed_origins(self) -> tuple[str, ...]:
+        """Return allowed origins for CORS as a tuple."""
+        return self._allowed_origins
+
+
+# Environment is parsed once at import; get_settings() hands out this instance
+_SETTINGS = Settings()
 
 
-@lru_cache()
 def get_settings() -> Settings:
-    """Get cached settings instance."""
-    return Settings()
+    """Get the process-wide settings instance."""
+    return _SETTINGS
 
 
 def get_available_llm_providers() -> list:
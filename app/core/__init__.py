@@ -21,6 +21,7 @@ from app.core.protocols import (
     SearchProvider,
     ScraperProvider,
     LLMConfig,
+    CacheBackend,
     ProviderState,
     ProviderMixin,
     managed_provider,
@@ -47,6 +48,7 @@ __all__ = [
     "SearchProvider",
     "ScraperProvider",
     "LLMConfig",
+    "CacheBackend",
     "ProviderState",
     "ProviderMixin",
     "managed_provider",
@@ -3,15 +3,44 @@ Event system for decoupled communication between components.
 Implements a simple pub/sub pattern for application events.
 """
 
-from typing import Callable, Dict, List, Any, Optional
+from typing import Callable, Dict, List, Any, Optional, Set
 from dataclasses import dataclass, field
-from datetime import datetime
+from datetime import datetime, timezone
+from collections import OrderedDict, deque
+from contextvars import ContextVar
 from enum import Enum
+from weakref import WeakKeyDictionary
 import asyncio
+import json
 import logging
+import time
+
+try:  # Optional fast encoder; falls back to the stdlib json module
+    import msgspec
+except ImportError:
+    msgspec = None
 
 logger = logging.getLogger(__name__)
 
+# handler (or underlying function of a bound method) -> is coroutine function
+_is_coro_cache: "WeakKeyDictionary[Callable, bool]" = WeakKeyDictionary()
+
+
+def _is_coroutine_handler(handler: Callable) -> bool:
+    """Classify a handler as async, memoizing the inspection per function."""
+    # Bound methods are recreated on every attribute access; key on __func__
+    key = getattr(handler, "__func__", handler)
+    try:
+        is_coro = _is_coro_cache.get(key)
+    except TypeError:
+        # Not weak-referenceable; inspect directly
+        return asyncio.iscoroutinefunction(handler)
+
+    if is_coro is None:
+        is_coro = asyncio.iscoroutinefunction(handler)
+        _is_coro_cache[key] = is_coro
+    return is_coro
+
 
 class EventType(str, Enum):
     """Enumeration of event types in the application."""
@@ -40,16 +69,22 @@ class EventType(str, Enum):
     RATE_LIMIT_EXCEEDED = "rate_limit.exceeded"
 
 
-@dataclass
+@dataclass(slots=True)
 class Event:
     """Represents an application event."""
 
     type: EventType
     data: Dict[str, Any] = field(default_factory=dict)
-    timestamp: datetime = field(default_factory=datetime.utcnow)
+    # Epoch nanoseconds; converted to datetime only when read or serialized
+    timestamp_ns: int = field(default_factory=time.time_ns)
     source: Optional[str] = None
     correlation_id: Optional[str] = None
 
+    @property
+    def timestamp(self) -> datetime:
+        """Event time as a UTC datetime."""
+        return datetime.fromtimestamp(self.timestamp_ns / 1e9, tz=timezone.utc)
+
     def to_dict(self) -> Dict[str, Any]:
         """Convert event to dictionary."""
         return {
@@ -60,10 +95,42 @@ class Event:
             "correlation_id": self.correlation_id
         }
 
+    def to_json(self) -> bytes:
+        """Encode the event as compact UTF-8 JSON in one pass."""
+        if msgspec is not None:
+            return _MSGSPEC_ENCODER.encode(self.to_dict())
+        return json.dumps(
+            self.to_dict(), separators=(",", ":"), default=str
+        ).encode("utf-8")
+
+
+# Reused encoder instance (msgspec caches per-type encoding state on it)
+_MSGSPEC_ENCODER = msgspec.json.Encoder(enc_hook=str) if msgspec else None
+
+
+class _Drain:
+    """Events queued by handlers while one publish() call chain drains."""
+
+    __slots__ = ("events", "open")
+
+    def __init__(self, first: tuple):
+        self.events = deque((first,))
+        self.open = True
+
+
+# The drain owned by the current call chain, if any. A context variable so
+# concurrent publishers (requests, the background worker) each drain only
+# their own cascade; handler tasks inherit it and queue onto it.
+_current_drain: ContextVar[Optional[_Drain]] = ContextVar(
+    "event_bus_drain", default=None)
+
 
 # Type alias for event handlers
 EventHandler = Callable[[Event], Any]
 
+# Every known event type, for O(1) validation
+_VALID_TYPES = frozenset(EventType)
+
 
 class EventBus:
     """
@@ -73,66 +140,175 @@ class EventBus:
 
     _instance: Optional["EventBus"] = None
 
+    # Progress events where only the most recent pending one matters
+    conflatable: Set[EventType] = {
+        EventType.SEARCH_STARTED,
+        EventType.SCRAPE_STARTED,
+    }
+
+    # Bound on events waiting for the background worker
+    max_pending: int = 10_000
+
     def __new__(cls) -> "EventBus":
         """Singleton pattern for global event bus."""
         if cls._instance is None:
             cls._instance = super().__new__(cls)
-            cls._instance._handlers = {}
-            cls._instance._async_handlers = {}
+            # event type -> (sync handlers, async handlers); each an
+            # insertion-ordered OrderedDict[handler, None] for O(1) removal
+            cls._instance._dispatch = {}
+            # Background delivery for publish_nowait(); created lazily per loop
+            cls._instance._bg_queue = None
+            cls._instance._worker = None
+            # Latest pending event per conflatable type
+            cls._instance._latest = {}
         return cls._instance
 
     def subscribe(self, event_type: EventType, handler: EventHandler) -> None:
         """Subscribe a handler to an event type."""
-        if asyncio.iscoroutinefunction(handler):
-            if event_type not in self._async_handlers:
-                self._async_handlers[event_type] = []
-            self._async_handlers[event_type].append(handler)
-        else:
-            if event_type not in self._handlers:
-                self._handlers[event_type] = []
-            self._handlers[event_type].append(handler)
+        if event_type not in _VALID_TYPES:
+            raise ValueError(f"Unknown event type: {event_type}")
+
+        is_async = _is_coroutine_handler(handler)
+        self._dispatch.setdefault(event_type, (OrderedDict(), OrderedDict()))[
+            1 if is_async else 0][handler] = None
 
-        logger.debug(f"Handler subscribed to {event_type.value}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Handler subscribed to %s", event_type.value)
 
     def unsubscribe(self, event_type: EventType, handler: EventHandler) -> None:
         """Unsubscribe a handler from an event type."""
-        if event_type in self._handlers and handler in self._handlers[event_type]:
-            self._handlers[event_type].remove(handler)
-        if event_type in self._async_handlers and handler in self._async_handlers[event_type]:
-            self._async_handlers[event_type].remove(handler)
+        entry = self._dispatch.get(event_type)
+        if entry is None:
+            return
+        for handlers in entry:
+            handlers.pop(handler, None)
 
     async def publish(self, event: Event) -> None:
-        """Publish an event to all subscribers."""
-        logger.debug(f"Publishing event: {event.type.value}")
+        """
+        Publish an event to all subscribers.
 
-        # Call sync handlers
-        if event.type in self._handlers:
-            for handler in self._handlers[event.type]:
-                try:
-                    handler(event)
-                except Exception as e:
-                    logger.error(f"Error in sync event handler: {e}")
+        Events published from inside a handler are queued and dispatched by
+        the outermost publish() call of the same call chain, so cascaded
+        events share one drain loop without holding up other publishers.
+        """
+        if event.type not in _VALID_TYPES:
+            raise ValueError(f"Unknown event type: {event.type}")
 
-        # Call async handlers
-        if event.type in self._async_handlers:
-            tasks = []
-            for handler in self._async_handlers[event.type]:
-                tasks.append(self._safe_call_async(handler, event))
+        entry = self._dispatch.get(event.type)
+        if entry is None or not (entry[0] or entry[1]):
+            return
+
+        drain = _current_drain.get()
+        if drain is not None and drain.open:
+            drain.events.append((event, entry))
+            return
+
+        drain = _Drain((event, entry))
+        token = _current_drain.set(drain)
+        try:
+            while drain.events:
+                await self._deliver(*drain.events.popleft())
+        finally:
+            # A task spawned by a handler may outlive this drain; its
+            # publishes must start their own instead of joining a dead one
+            drain.open = False
+            _current_drain.reset(token)
+
+    def publish_nowait(self, event: Event) -> None:
+        """
+        Hand an event to the background worker and return immediately.
+
+        Use for events the caller doesn't need delivered before it continues.
+        For conflatable types, a newer event replaces one still waiting in
+        the queue instead of being queued behind it.
+        """
+        entry = self._dispatch.get(event.type)
+        if entry is None or not (entry[0] or entry[1]):
+            return
+
+        if event.type in self.conflatable:
+            already_pending = event.type in self._latest
+            self._latest[event.type] = event
+            if already_pending:
+                return
+
+        queue = self._ensure_worker()
+        try:
+            queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self._latest.pop(event.type, None)
+            logger.warning("Event queue full, dropping %s", event.type.value)
 
-            if tasks:
-                await asyncio.gather(*tasks)
+    def _ensure_worker(self) -> asyncio.Queue:
+        """Start the background worker on the running loop if needed."""
+        if self._worker is None or self._worker.done():
+            self._bg_queue = asyncio.Queue(maxsize=self.max_pending)
+            self._worker = asyncio.get_running_loop().create_task(
+                self._run_worker(self._bg_queue))
+        return self._bg_queue
+
+    async def _run_worker(self, queue: asyncio.Queue) -> None:
+        """Deliver queued events one at a time, in order."""
+        while True:
+            event = await queue.get()
+            try:
+                if event.type in self.conflatable:
+                    event = self._latest.pop(event.type, event)
+                await self.publish(event)
+            except Exception as e:
+                logger.error("Error delivering queued event: %s", e)
+            finally:
+                queue.task_done()
+
+    async def flush(self) -> None:
+        """Wait until every event from publish_nowait() has been delivered."""
+        if self._worker is not None and not self._worker.done():
+            await self._bg_queue.join()
+
+    async def shutdown(self) -> None:
+        """Deliver pending background events, then stop the worker."""
+        await self.flush()
+        self._stop_worker()
+
+    def _stop_worker(self) -> None:
+        """Cancel the background worker, if its loop is still alive."""
+        if self._worker is not None:
+            if not self._worker.get_loop().is_closed():
+                self._worker.cancel()
+            self._worker = None
+            self._bg_queue = None
+
+    async def _deliver(self, event: Event, entry: tuple) -> None:
+        """Deliver a single event to its sync and async handlers."""
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Publishing event: %s", event.type.value)
+
+        sync_handlers, async_handlers = entry
+
+        # Call sync handlers (snapshot: a handler may (un)subscribe)
+        for handler in tuple(sync_handlers):
+            try:
+                handler(event)
+            except Exception as e:
+                logger.error("Error in sync event handler: %s", e)
+
+        # Call async handlers
+        if async_handlers:
+            await asyncio.gather(
+                *[self._safe_call_async(h, event) for h in async_handlers])
 
     async def _safe_call_async(self, handler: EventHandler, event: Event) -> None:
         """Safely call an async handler, catching exceptions."""
         try:
             await handler(event)
         except Exception as e:
-            logger.error(f"Error in async event handler: {e}")
+            logger.error("Error in async event handler: %s", e)
 
     def clear(self) -> None:
         """Clear all handlers (useful for testing)."""
-        self._handlers.clear()
-        self._async_handlers.clear()
+        self._dispatch.clear()
+        self._latest.clear()
+        self._stop_worker()
 
 
 # Global event bus instance
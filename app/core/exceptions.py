@@ -3,25 +3,51 @@ Custom exceptions for the application.
 Provides a hierarchy of exceptions for different error scenarios.
 """
 
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
 
 
 class AppException(Exception):
-    """Base exception for all application errors."""
+    """
+    Base exception for all application errors.
+
+    Subclasses record their fixed context (provider, url, ...) as key/value
+    pairs in _context; the details dict is only built when first read, so
+    errors that are caught and logged never pay for the merge.
+    """
 
     def __init__(
         self,
         message: str,
         code: str = "UNKNOWN_ERROR",
         details: Optional[Dict[str, Any]] = None,
-        original_error: Optional[Exception] = None
+        original_error: Optional[Exception] = None,
+        _context: Tuple[Tuple[str, Any], ...] = ()
     ):
         self.message = message
         self.code = code
-        self.details = details or {}
         self.original_error = original_error
+        self._context = _context
+        self._extra = details
+        self._details = None
         super().__init__(self.message)
 
+    @property
+    def details(self) -> Dict[str, Any]:
+        """Context pairs merged with caller-supplied details."""
+        if self._details is None:
+            if self._context:
+                details = dict(self._context)
+                if self._extra:
+                    details.update(self._extra)
+            else:
+                details = self._extra if self._extra is not None else {}
+            self._details = details
+        return self._details
+
+    @details.setter
+    def details(self, value: Dict[str, Any]) -> None:
+        self._details = value
+
     def to_dict(self) -> Dict[str, Any]:
         """Convert exception to dictionary for API responses."""
         return {
@@ -57,7 +83,8 @@ class LLMProviderError(AppException):
         super().__init__(
             message=message,
             code="LLM_PROVIDER_ERROR",
-            details={"provider": provider, **(details or {})},
+            details=details,
+            _context=(("provider", provider),),
             original_error=original_error
         )
 
@@ -76,7 +103,8 @@ class SearchProviderError(AppException):
         super().__init__(
             message=message,
             code="SEARCH_PROVIDER_ERROR",
-            details={"provider": provider, "query": query, **(details or {})},
+            details=details,
+            _context=(("provider", provider), ("query", query)),
             original_error=original_error
         )
 
@@ -94,7 +122,8 @@ class ScraperError(AppException):
         super().__init__(
             message=message,
             code="SCRAPER_ERROR",
-            details={"url": url, **(details or {})},
+            details=details,
+            _context=(("url", url),),
             original_error=original_error
         )
 
@@ -111,7 +140,8 @@ class RateLimitError(AppException):
         super().__init__(
             message=message,
             code="RATE_LIMIT_ERROR",
-            details={"retry_after": retry_after, **(details or {})}
+            details=details,
+            _context=(("retry_after", retry_after),)
         )
 
 
@@ -127,7 +157,8 @@ class ValidationError(AppException):
         super().__init__(
             message=message,
             code="VALIDATION_ERROR",
-            details={"field": field, **(details or {})}
+            details=details,
+            _context=(("field", field),)
         )
 
 
@@ -158,6 +189,7 @@ class ResourceNotFoundError(AppException):
         super().__init__(
             message=f"{resource_type} with id '{resource_id}' not found",
             code="RESOURCE_NOT_FOUND",
-            details={"resource_type": resource_type,
-                     "resource_id": resource_id, **(details or {})}
+            details=details,
+            _context=(("resource_type", resource_type),
+                      ("resource_id", resource_id))
         )
@@ -10,12 +10,14 @@ Advantages over ABC:
 """
 
 from typing import (
-    List, Optional, Dict, Any,
-    AsyncIterator, Protocol, runtime_checkable
+    List, Optional, Dict, Any, Tuple, Union,
+    AsyncIterator, Protocol
 )
 from dataclasses import dataclass, field
 from contextlib import asynccontextmanager
 from datetime import datetime
+import asyncio
+import time
 
 from app.models.schemas import InvestorProfile, SearchResult, ChatMessage
 
@@ -24,7 +26,7 @@ from app.models.schemas import InvestorProfile, SearchResult, ChatMessage
 # Configuration Dataclasses
 # ============================================================================
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class LLMConfig:
     """Immutable configuration for LLM providers."""
     model_name: str
@@ -34,7 +36,7 @@ class LLMConfig:
     extra_params: Dict[str, Any] = field(default_factory=dict)
 
 
-@dataclass
+@dataclass(slots=True)
 class ProviderState:
     """Mutable state for providers."""
     initialized: bool = False
@@ -47,7 +49,6 @@ class ProviderState:
 # Provider Protocols (Structural Subtyping)
 # ============================================================================
 
-@runtime_checkable
 class LLMProvider(Protocol):
     """
     Protocol for Language Model providers.
@@ -85,8 +86,15 @@ class LLMProvider(Protocol):
         """Generate a streaming response from the model."""
         ...
 
+    async def generate_batch(
+        self,
+        batches: List[List[ChatMessage]],
+        context: Optional[Dict[str, Any]] = None
+    ) -> List[str]:
+        """Generate one response per conversation, in input order."""
+        ...
+
 
-@runtime_checkable
 class SearchProvider(Protocol):
     """Protocol for search providers."""
 
@@ -114,7 +122,6 @@ class SearchProvider(Protocol):
         ...
 
 
-@runtime_checkable
 class ScraperProvider(Protocol):
     """Protocol for web scraping providers."""
 
@@ -137,7 +144,22 @@ class ScraperProvider(Protocol):
         ...
 
 
-@runtime_checkable
+class CacheBackend(Protocol):
+    """Protocol for response cache storage (in-memory, Redis, DB table...)."""
+
+    async def get(self, key: str) -> Optional[str]:
+        """Return the cached value, or None on a miss."""
+        ...
+
+    async def set(self, key: str, value: str, ttl: Optional[int] = None) -> None:
+        """Store a value, optionally expiring after ttl seconds."""
+        ...
+
+    async def delete(self, key: str) -> None:
+        """Remove a cached value."""
+        ...
+
+
 class Initializable(Protocol):
     """Protocol for providers that need initialization."""
 
@@ -150,7 +172,6 @@ class Initializable(Protocol):
         ...
 
 
-@runtime_checkable
 class HealthCheckable(Protocol):
     """Protocol for providers that support health checks."""
 
@@ -163,6 +184,37 @@ class HealthCheckable(Protocol):
 # Base Implementation Mixin (Optional helpers)
 # ============================================================================
 
+# Minimum interval between last_used refreshes in record_request()
+_LAST_USED_INTERVAL_NS = 1_000_000_000
+
+# Default in-flight limit for generate_batch(); override per provider with
+# LLMConfig.extra_params["max_concurrency"]
+DEFAULT_BATCH_CONCURRENCY = 8
+
+
+async def gather_responses(
+    provider: "LLMProvider",
+    requests: List[Tuple[List[ChatMessage], Optional[Dict[str, Any]]]],
+    return_exceptions: bool = False
+) -> List[Union[str, BaseException]]:
+    """
+    Run provider.generate_response() for each (messages, context) pair
+    concurrently, bounded by the provider's max_concurrency. Results follow
+    input order. With return_exceptions, a failed call yields whatever it
+    raised (including CancelledError) in its slot instead of propagating.
+    """
+    limit = provider.config.extra_params.get(
+        "max_concurrency", DEFAULT_BATCH_CONCURRENCY)
+    semaphore = asyncio.Semaphore(max(1, int(limit)))
+
+    async def _one(messages: List[ChatMessage], context) -> str:
+        async with semaphore:
+            return await provider.generate_response(messages, context)
+
+    return list(await asyncio.gather(
+        *(_one(m, c) for m, c in requests), return_exceptions=return_exceptions))
+
+
 class ProviderMixin:
     """
     Mixin providing common functionality for providers.
@@ -171,6 +223,7 @@ class ProviderMixin:
 
     def __init__(self):
         self._state = ProviderState()
+        self._last_used_ns = 0
 
     @property
     def state(self) -> ProviderState:
@@ -183,10 +236,15 @@ class ProviderMixin:
     def mark_initialized(self) -> None:
         self._state.initialized = True
         self._state.last_used = datetime.utcnow()
+        self._last_used_ns = time.monotonic_ns()
 
     def record_request(self) -> None:
         self._state.request_count += 1
-        self._state.last_used = datetime.utcnow()
+        # last_used is coarse; refresh it at most once per interval
+        now = time.monotonic_ns()
+        if now - self._last_used_ns >= _LAST_USED_INTERVAL_NS:
+            self._last_used_ns = now
+            self._state.last_used = datetime.utcnow()
 
     def record_error(self) -> None:
         self._state.error_count += 1
@@ -194,6 +252,18 @@ class ProviderMixin:
     async def health_check(self) -> bool:
         return self._state.initialized
 
+    async def generate_batch(
+        self,
+        batches: List[List[ChatMessage]],
+        context: Optional[Dict[str, Any]] = None
+    ) -> List[str]:
+        """
+        Default batch inference: concurrent generate_response() calls,
+        bounded by a semaphore. Providers with a native batch endpoint
+        can override this.
+        """
+        return await gather_responses(self, [(m, context) for m in batches])
+
 
 # ============================================================================
 # Context Managers for Resource Management
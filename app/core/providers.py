@@ -9,24 +9,89 @@ Features:
 - Type-safe with Protocol checking
 """
 
-from typing import Dict, Type, Optional, List, TypeVar, Callable, Any
-from functools import wraps
+from typing import (
+    Dict, Type, Optional, List, Tuple, TypeVar, Callable, Awaitable, Any
+)
+from collections import OrderedDict
+from dataclasses import replace
+from functools import partial, wraps
+import asyncio
+import hashlib
+import http.cookiejar
+import importlib
+import importlib.util
+import json
 import logging
+import sys
+import threading
+import time
+
+import httpx
+from pydantic import BaseModel
 
 from app.core.protocols import (
     LLMProvider,
     SearchProvider,
     ScraperProvider,
     LLMConfig,
-    Initializable
+    CacheBackend,
+    Initializable,
+    ProviderMixin
 )
 from app.core.exceptions import ConfigurationError
+from app.config import Settings, get_settings, get_available_llm_providers
+from app.models.schemas import ChatMessage
 
 logger = logging.getLogger(__name__)
 
 # Type variable for generic provider
 T = TypeVar('T')
 
+# Connection pool shared by every provider that talks HTTP
+HTTP_LIMITS = httpx.Limits(
+    max_connections=100,
+    max_keepalive_connections=20,
+    keepalive_expiry=30
+)
+
+
+def cookieless_client(**kwargs: Any) -> httpx.AsyncClient:
+    """
+    Create a pooled client for fetching third-party pages. Its cookie jar
+    refuses every cookie, so nothing one site sets is replayed on a later
+    request for another user or scrape.
+    """
+    jar = http.cookiejar.CookieJar(
+        http.cookiejar.DefaultCookiePolicy(allowed_domains=[]))
+    return httpx.AsyncClient(
+        http2=importlib.util.find_spec("h2") is not None,
+        limits=HTTP_LIMITS,
+        cookies=jar,
+        **kwargs
+    )
+
+
+# Lifecycle capability bits, recorded on each class as _provider_caps
+CAP_INITIALIZE = 1
+CAP_CLEANUP = 2
+
+
+def _lifecycle_caps(cls: type) -> int:
+    """Compute the lifecycle capability bits for a provider class."""
+    caps = 0
+    if callable(getattr(cls, 'initialize', None)):
+        caps |= CAP_INITIALIZE
+    if callable(getattr(cls, 'cleanup', None)):
+        caps |= CAP_CLEANUP
+    return caps
+
+
+def _instance_caps(instance: Any) -> int:
+    """Capability bits for an instance, probing unregistered classes."""
+    cls = type(instance)
+    caps = cls.__dict__.get('_provider_caps')
+    return _lifecycle_caps(cls) if caps is None else caps
+
 
 # ============================================================================
 # Simple Registry (Just dictionaries!)
@@ -36,62 +101,143 @@ class Registry:
     """
     Simple provider registry using dictionaries.
     Much cleaner than class-based approach with @classmethod everywhere.
+
+    Classes are stored in a flat dict keyed by (provider_type, lowercased
+    name), so every lookup is a single hash. Cached instances live in one
+    dict per provider type so the types never share a structure.
+    Providers can also be registered lazily as "module:Class" paths; the
+    module (and its SDK) is only imported the first time it is looked up.
     """
 
+    PROVIDER_TYPES = ("llm", "search", "scraper")
+
     def __init__(self):
-        self._providers: Dict[str, Dict[str, type]] = {
-            "llm": {},
-            "search": {},
-            "scraper": {}
-        }
+        self._classes: Dict[Tuple[str, str], type] = {}
         self._instances: Dict[str, Dict[str, Any]] = {
-            "llm": {},
-            "search": {},
-            "scraper": {}
+            ptype: {} for ptype in self.PROVIDER_TYPES
         }
+        # Not-yet-imported providers: key -> "package.module:ClassName"
+        self._lazy: Dict[Tuple[str, str], str] = {}
+        # Per-key creation locks; _locks_guard protects the dict itself
+        self._locks: Dict[Tuple[str, str], asyncio.Lock] = {}
+        self._locks_guard = threading.Lock()
+        self._http_client: Optional[httpx.AsyncClient] = None
+
+    @property
+    def http_client(self) -> httpx.AsyncClient:
+        """
+        Shared pooled HTTP client, created on first use.
+
+        Reusing one client keeps TCP/TLS connections warm across providers.
+        HTTP/2 is enabled when the optional h2 package is installed.
+        """
+        if self._http_client is None or self._http_client.is_closed:
+            self._http_client = httpx.AsyncClient(
+                http2=importlib.util.find_spec("h2") is not None,
+                limits=HTTP_LIMITS
+            )
+        return self._http_client
 
     def register(self, provider_type: str, name: str, cls: type) -> None:
         """Register a provider class."""
-        if provider_type not in self._providers:
+        if provider_type not in self.PROVIDER_TYPES:
+            raise ValueError(f"Unknown provider type: {provider_type}")
+
+        self._classes[(provider_type, sys.intern(name.lower()))] = cls
+        # Probe lifecycle methods once instead of on every get/cleanup
+        cls._provider_caps = _lifecycle_caps(cls)
+        logger.info("Registered %s provider: %s", provider_type, name)
+
+    def register_lazy(self, provider_type: str, name: str, path: str) -> None:
+        """Register a provider by import path ("module:Class") without importing it."""
+        if provider_type not in self.PROVIDER_TYPES:
             raise ValueError(f"Unknown provider type: {provider_type}")
 
-        self._providers[provider_type][name.lower()] = cls
-        logger.info(f"Registered {provider_type} provider: {name}")
+        self._lazy[(provider_type, sys.intern(name.lower()))] = path
 
     def get_class(self, provider_type: str, name: str) -> Optional[type]:
         """Get a provider class by type and name."""
-        return self._providers.get(provider_type, {}).get(name.lower())
+        key = (provider_type, name.lower())
+        cls = self._classes.get(key)
+        if cls is None and key in self._lazy:
+            cls = self._import_lazy(key)
+        return cls
+
+    def _import_lazy(self, key: Tuple[str, str]) -> type:
+        """Import a lazily registered provider and cache its class."""
+        module_name, class_name = self._lazy[key].split(":")
+        cls = getattr(importlib.import_module(module_name), class_name)
+        del self._lazy[key]
+        # Importing usually registers via @register; cover plain classes too
+        if self._classes.get(key) is not cls:
+            self.register(key[0], key[1], cls)
+        return cls
 
     def get_instance(self, provider_type: str, name: str) -> Optional[Any]:
         """Get a cached provider instance."""
-        return self._instances.get(provider_type, {}).get(name.lower())
+        instances = self._instances.get(provider_type)
+        return instances.get(name.lower()) if instances is not None else None
 
     def set_instance(self, provider_type: str, name: str, instance: Any) -> None:
         """Cache a provider instance."""
-        self._instances[provider_type][name.lower()] = instance
+        if provider_type not in self._instances:
+            raise ValueError(f"Unknown provider type: {provider_type}")
+
+        self._instances[provider_type][sys.intern(name.lower())] = instance
+
+    def get_lock(self, provider_type: str, name: str) -> asyncio.Lock:
+        """Get the lock guarding creation of a cached instance."""
+        key = (provider_type, name.lower())
+        lock = self._locks.get(key)
+        if lock is None:
+            with self._locks_guard:
+                lock = self._locks.setdefault(key, asyncio.Lock())
+        return lock
 
     def list_providers(self, provider_type: str) -> List[str]:
         """List all registered providers of a type."""
-        return list(self._providers.get(provider_type, {}).keys())
+        names = [name for ptype, name in self._classes if ptype == provider_type]
+        names.extend(name for ptype, name in self._lazy
+                     if ptype == provider_type and name not in names)
+        return names
 
     async def cleanup_all(self) -> None:
-        """Cleanup all cached instances."""
-        for provider_type, instances in self._instances.items():
-            for name, instance in instances.items():
-                if hasattr(instance, 'cleanup'):
-                    try:
-                        await instance.cleanup()
-                    except Exception as e:
-                        logger.error(
-                            f"Error cleaning up {provider_type}/{name}: {e}")
-
-        self._instances = {"llm": {}, "search": {}, "scraper": {}}
+        """Cleanup all cached instances concurrently."""
+        # Swap in empty dicts first so nothing registered during cleanup is
+        # lost or iterated mid-mutation
+        snapshot = self._instances
+        self._instances = {ptype: {} for ptype in self.PROVIDER_TYPES}
+
+        async def safe_cleanup(provider_type: str, name: str, instance: Any) -> None:
+            try:
+                await instance.cleanup()
+            except Exception as e:
+                logger.error(
+                    "Error cleaning up %s/%s: %s", provider_type, name, e)
+
+        await asyncio.gather(*(
+            safe_cleanup(provider_type, name, instance)
+            for provider_type, instances in snapshot.items()
+            for name, instance in instances.items()
+            if _instance_caps(instance) & CAP_CLEANUP
+        ))
+
+        if self._http_client is not None:
+            await self._http_client.aclose()
+            self._http_client = None
         logger.info("All provider instances cleaned up")
 
 
 # Global registry instance
 registry = Registry()
 
+# Built-in providers, imported on first lookup so unused SDKs never load
+from app.providers import llm as _llm, search as _search, scraper as _scraper  # noqa: E402
+
+for _ptype, _package in (("llm", _llm), ("search", _search), ("scraper", _scraper)):
+    for _name, _path in _package.AVAILABLE.items():
+        registry.register_lazy(_ptype, _name, _path)
+
 
 # ============================================================================
 # Registration Decorator
@@ -133,10 +279,173 @@ def scraper_provider(name: str):
     return register("scraper", name)
 
 
+# ============================================================================
+# LLM Response Cache
+# ============================================================================
+
+# Responses kept by the in-process cache before the least recently used
+# is dropped
+MEMORY_CACHE_MAX_ENTRIES = 1024
+
+# Fields that change on every request without changing the prompt
+_VOLATILE_FIELDS = frozenset({"created_at", "timestamp"})
+
+
+class MemoryCacheBackend:
+    """In-process CacheBackend with per-entry expiry and an LRU size cap."""
+
+    def __init__(self, max_entries: int = MEMORY_CACHE_MAX_ENTRIES):
+        self._max_entries = max_entries
+        # Least recently used first: key -> (value, expires_at)
+        self._data: OrderedDict[str, Tuple[str, Optional[float]]] = OrderedDict()
+
+    async def get(self, key: str) -> Optional[str]:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at is not None and time.monotonic() >= expires_at:
+            self._data.pop(key, None)
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: str, ttl: Optional[int] = None) -> None:
+        expires_at = time.monotonic() + ttl if ttl else None
+        self._data[key] = (value, expires_at)
+        self._data.move_to_end(key)
+        while len(self._data) > self._max_entries:
+            self._data.popitem(last=False)
+
+    async def delete(self, key: str) -> None:
+        self._data.pop(key, None)
+
+
+class LLMCache:
+    """
+    Wraps an LLMProvider and short-circuits repeated generate_response calls.
+
+    Only meant for deterministic configs (temperature == 0); streaming and
+    every other attribute are passed through to the wrapped provider.
+    """
+
+    def __init__(
+        self,
+        provider: LLMProvider,
+        backend: CacheBackend,
+        ttl: Optional[int] = None
+    ):
+        self._provider = provider
+        self._backend = backend
+        self._ttl = ttl
+
+    _provider_caps = CAP_CLEANUP
+
+    def __getattr__(self, item: str) -> Any:
+        return getattr(self._provider, item)
+
+    async def cleanup(self) -> None:
+        if _instance_caps(self._provider) & CAP_CLEANUP:
+            await self._provider.cleanup()
+
+    def cache_key(
+        self,
+        messages: List[ChatMessage],
+        context: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """
+        SHA-256 over provider, model, messages and context. Models in the
+        context are keyed on their fields minus per-request timestamps, so
+        the same investors produce the same key on every request.
+        """
+        payload = json.dumps({
+            "provider": self._provider.name,
+            "model": self._provider.config.model_name,
+            "system_prompt": self._provider.config.system_prompt,
+            "messages": [(m.role.value, m.content) for m in messages],
+            "context": context,
+        }, sort_keys=True, default=_stable_json)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    async def generate_response(
+        self,
+        messages: List[ChatMessage],
+        context: Optional[Dict[str, Any]] = None
+    ) -> str:
+        key = self.cache_key(messages, context)
+        cached = await self._backend.get(key)
+        if cached is not None:
+            return cached
+
+        response = await self._provider.generate_response(messages, context)
+        await self._backend.set(key, response, self._ttl)
+        return response
+
+    async def generate_batch(
+        self,
+        batches: List[List[ChatMessage]],
+        context: Optional[Dict[str, Any]] = None
+    ) -> List[str]:
+        # Bounded fan-out over our cached generate_response, not the
+        # provider's own batch path
+        return await ProviderMixin.generate_batch(self, batches, context)
+
+
+def _stable_json(value: Any) -> Any:
+    """json.dumps fallback for cache keys: models without volatile fields."""
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json", exclude=_VOLATILE_FIELDS)
+    return str(value)
+
+
+_cache_backends: Dict[str, CacheBackend] = {}
+
+
+def get_cache_backend(name: str) -> CacheBackend:
+    """Get the shared cache backend registered under name."""
+    backend = _cache_backends.get(name)
+    if backend is None:
+        if name != "memory":
+            raise ConfigurationError(
+                f"LLM cache backend '{name}' not found. Available: ['memory']"
+            )
+        backend = _cache_backends.setdefault(name, MemoryCacheBackend())
+    return backend
+
+
 # ============================================================================
 # Factory Functions
 # ============================================================================
 
+async def _get_or_create(
+    provider_type: str,
+    cache_key: str,
+    cache: bool,
+    create: Callable[[], Awaitable[Any]]
+) -> Any:
+    """
+    Return the cached instance for cache_key, creating it at most once.
+
+    Concurrent first calls for the same key wait on a per-key lock and
+    re-check the cache, so only one constructor + initialize() runs.
+    """
+    if not cache:
+        return await create()
+
+    cached = registry.get_instance(provider_type, cache_key)
+    if cached is not None:
+        return cached
+
+    async with registry.get_lock(provider_type, cache_key):
+        cached = registry.get_instance(provider_type, cache_key)
+        if cached is not None:
+            return cached
+
+        instance = await create()
+        registry.set_instance(provider_type, cache_key, instance)
+        return instance
+
+
 async def get_llm(
     name: str,
     config: LLMConfig,
@@ -153,76 +462,111 @@ async def get_llm(
     Returns:
         LLM provider instance
     """
-    cache_key = f"{name}:{config.model_name}"
+    async def create() -> LLMProvider:
+        cls = registry.get_class("llm", name)
+        if not cls:
+            available = registry.list_providers("llm")
+            raise ConfigurationError(
+                f"LLM provider '{name}' not found. Available: {available}"
+            )
 
-    if cache:
-        cached = registry.get_instance("llm", cache_key)
-        if cached:
-            return cached
+        # Hand the provider the shared connection pool for its SDK client
+        provider_config = config
+        if "http_client" not in config.extra_params:
+            provider_config = replace(config, extra_params={
+                **config.extra_params, "http_client": registry.http_client})
 
-    cls = registry.get_class("llm", name)
-    if not cls:
-        available = registry.list_providers("llm")
-        raise ConfigurationError(
-            f"LLM provider '{name}' not found. Available: {available}"
-        )
+        instance = cls(provider_config)
 
-    instance = cls(config)
+        if cls._provider_caps & CAP_INITIALIZE:
+            await instance.initialize()
 
-    if hasattr(instance, 'initialize'):
-        await instance.initialize()
+        settings = get_settings()
+        if settings.llm_cache_enabled and config.temperature == 0:
+            instance = LLMCache(
+                instance,
+                get_cache_backend(settings.llm_cache_backend),
+                settings.llm_cache_ttl_seconds
+            )
 
-    if cache:
-        registry.set_instance("llm", cache_key, instance)
+        return instance
 
-    return instance
+    return await _get_or_create("llm", _llm_key(name, config), cache, create)
+
+
+def _llm_key(name: str, config: LLMConfig) -> str:
+    """
+    Instance key for an LLM config. Temperature is part of it because it
+    decides whether the instance is wrapped in LLMCache.
+    """
+    return f"{name}:{config.model_name}:{config.temperature}".lower()
 
 
 async def get_search(name: str, cache: bool = True, **kwargs) -> SearchProvider:
     """Get or create a search provider instance."""
-    if cache:
-        cached = registry.get_instance("search", name)
-        if cached:
-            return cached
+    async def create() -> SearchProvider:
+        cls = registry.get_class("search", name)
+        if not cls:
+            available = registry.list_providers("search")
+            raise ConfigurationError(
+                f"Search provider '{name}' not found. Available: {available}"
+            )
 
-    cls = registry.get_class("search", name)
-    if not cls:
-        available = registry.list_providers("search")
-        raise ConfigurationError(
-            f"Search provider '{name}' not found. Available: {available}"
-        )
+        instance = cls(**kwargs)
 
-    instance = cls(**kwargs)
+        if cls._provider_caps & CAP_INITIALIZE:
+            await instance.initialize()
 
-    if cache:
-        registry.set_instance("search", name, instance)
+        return instance
 
-    return instance
+    return await _get_or_create("search", name, cache, create)
 
 
 async def get_scraper(name: str, cache: bool = True, **kwargs) -> ScraperProvider:
     """Get or create a scraper provider instance."""
-    if cache:
-        cached = registry.get_instance("scraper", name)
-        if cached:
-            return cached
+    async def create() -> ScraperProvider:
+        cls = registry.get_class("scraper", name)
+        if not cls:
+            available = registry.list_providers("scraper")
+            raise ConfigurationError(
+                f"Scraper provider '{name}' not found. Available: {available}"
+            )
 
-    cls = registry.get_class("scraper", name)
-    if not cls:
-        available = registry.list_providers("scraper")
-        raise ConfigurationError(
-            f"Scraper provider '{name}' not found. Available: {available}"
-        )
+        instance = cls(**kwargs)
 
-    instance = cls(**kwargs)
+        if cls._provider_caps & CAP_INITIALIZE:
+            await instance.initialize()
 
-    if hasattr(instance, 'initialize'):
-        await instance.initialize()
+        return instance
 
-    if cache:
-        registry.set_instance("scraper", name, instance)
+    return await _get_or_create("scraper", name, cache, create)
 
-    return instance
+
+async def warmup(settings: Optional[Settings] = None) -> None:
+    """
+    Create and initialize the configured providers ahead of traffic.
+
+    Moves first-call construction/initialize() cost from the first request
+    to startup. Failures are logged, never raised, so a misconfigured
+    provider can't block the app from booting.
+    """
+    settings = settings or get_settings()
+
+    async def warm(label: str, factory: Awaitable[Any]) -> None:
+        try:
+            await factory
+            logger.info("Warmed up %s", label)
+        except Exception as e:
+            logger.warning("Warmup failed for %s: %s", label, e)
+
+    jobs = [
+        warm(f"llm/{name}", get_llm(
+            name, LLMConfig(model_name=settings.get_llm_config(name)["model"])))
+        for name in get_available_llm_providers()
+    ]
+    jobs.append(warm("search/google", get_search("google")))
+
+    await asyncio.gather(*jobs)
 
 
 # ============================================================================
@@ -241,25 +585,42 @@ def llm_dependency(
         async def chat(llm: LLMProvider = Depends(llm_dependency("gemini"))):
             return await llm.generate_response(messages)
     """
+    # Resolved once here so a warm request is a single registry lookup;
+    # cleanup_all() empties the registry, so nothing goes stale
+    config = LLMConfig(model_name=model)
+    cache_key = _llm_key(name, config)
+
     async def dependency() -> LLMProvider:
-        config = LLMConfig(model_name=model)
-        return await get_llm(name, config)
+        instance = registry.get_instance("llm", cache_key)
+        if instance is None:
+            instance = await get_llm(name, config)
+        return instance
 
     return dependency
 
 
 def search_dependency(name: str = "google") -> Callable:
     """Create a FastAPI dependency for search provider."""
+    cache_key = name.lower()
+
     async def dependency() -> SearchProvider:
-        return await get_search(name)
+        instance = registry.get_instance("search", cache_key)
+        if instance is None:
+            instance = await get_search(name)
+        return instance
 
     return dependency
 
 
 def scraper_dependency(name: str = "linkedin") -> Callable:
     """Create a FastAPI dependency for scraper provider."""
+    cache_key = name.lower()
+
     async def dependency() -> ScraperProvider:
-        return await get_scraper(name)
+        instance = registry.get_instance("scraper", cache_key)
+        if instance is None:
+            instance = await get_scraper(name)
+        return instance
 
     return dependency
 
@@ -268,64 +629,39 @@ def scraper_dependency(name: str = "linkedin") -> Callable:
 # Backward Compatibility Layer
 # ============================================================================
 
-class ProviderRegistry:
-    """Backward compatible registry interface."""
+# Bound once at import so compat calls skip classmethod dispatch
+register_llm = partial(registry.register, "llm")
+register_search = partial(registry.register, "search")
+register_scraper = partial(registry.register, "scraper")
+get_llm_provider = partial(registry.get_class, "llm")
+get_search_provider = partial(registry.get_class, "search")
+get_scraper_provider = partial(registry.get_class, "scraper")
+list_llm_providers = partial(registry.list_providers, "llm")
+list_search_providers = partial(registry.list_providers, "search")
+list_scraper_providers = partial(registry.list_providers, "scraper")
 
-    @classmethod
-    def register_llm(cls, name: str, provider_class: type) -> None:
-        registry.register("llm", name, provider_class)
 
-    @classmethod
-    def register_search(cls, name: str, provider_class: type) -> None:
-        registry.register("search", name, provider_class)
-
-    @classmethod
-    def register_scraper(cls, name: str, provider_class: type) -> None:
-        registry.register("scraper", name, provider_class)
-
-    @classmethod
-    def get_llm_provider(cls, name: str) -> Optional[type]:
-        return registry.get_class("llm", name)
-
-    @classmethod
-    def get_search_provider(cls, name: str) -> Optional[type]:
-        return registry.get_class("search", name)
-
-    @classmethod
-    def get_scraper_provider(cls, name: str) -> Optional[type]:
-        return registry.get_class("scraper", name)
-
-    @classmethod
-    def list_llm_providers(cls) -> List[str]:
-        return registry.list_providers("llm")
-
-    @classmethod
-    def list_search_providers(cls) -> List[str]:
-        return registry.list_providers("search")
+class ProviderRegistry:
+    """Backward compatible registry interface."""
 
-    @classmethod
-    def list_scraper_providers(cls) -> List[str]:
-        return registry.list_providers("scraper")
+    register_llm = staticmethod(register_llm)
+    register_search = staticmethod(register_search)
+    register_scraper = staticmethod(register_scraper)
+    get_llm_provider = staticmethod(get_llm_provider)
+    get_search_provider = staticmethod(get_search_provider)
+    get_scraper_provider = staticmethod(get_scraper_provider)
+    list_llm_providers = staticmethod(list_llm_providers)
+    list_search_providers = staticmethod(list_search_providers)
+    list_scraper_providers = staticmethod(list_scraper_providers)
 
 
 class ProviderFactory:
     """Backward compatible factory interface."""
 
-    @classmethod
-    async def create_llm_provider(cls, name: str, config: LLMConfig, cache: bool = True):
-        return await get_llm(name, config, cache)
-
-    @classmethod
-    async def create_search_provider(cls, name: str, cache: bool = True, **kwargs):
-        return await get_search(name, cache, **kwargs)
-
-    @classmethod
-    async def create_scraper_provider(cls, name: str, cache: bool = True, **kwargs):
-        return await get_scraper(name, cache, **kwargs)
-
-    @classmethod
-    async def cleanup_all(cls) -> None:
-        await registry.cleanup_all()
+    create_llm_provider = staticmethod(get_llm)
+    create_search_provider = staticmethod(get_search)
+    create_scraper_provider = staticmethod(get_scraper)
+    cleanup_all = staticmethod(registry.cleanup_all)
 
 
 # Keep old decorator for compatibility
@@ -9,7 +9,10 @@ This package provides:
 
 from app.database.connection import (
     DatabaseManager,
+    apply_sqlite_pragmas,
     get_db,
+    get_db_ro,
+    get_db_rw,
     init_db,
     close_db,
     db_manager
@@ -20,13 +23,18 @@ from app.database.models import (
     Conversation,
     Message,
     Investor,
+    InvestorProfileRecord,
     ConversationInvestor,
     SearchResultRecord,
     UserSession,
     ProviderUsage,
+    ProviderUsageDaily,
+    ProviderUsageHourly,
     User
 )
 
+from app.database.usage_sink import UsageSink, usage_sink
+
 from app.database.repositories import (
     ConversationRepository,
     MessageRepository,
@@ -38,7 +46,10 @@ from app.database.repositories import (
 __all__ = [
     # Connection
     'DatabaseManager',
+    'apply_sqlite_pragmas',
     'get_db',
+    'get_db_ro',
+    'get_db_rw',
     'init_db',
     'close_db',
     'db_manager',
@@ -47,14 +58,20 @@ __all__ = [
     'Conversation',
     'Message',
     'Investor',
+    'InvestorProfileRecord',
     'ConversationInvestor',
     'SearchResultRecord',
     'UserSession',
     'ProviderUsage',
+    'ProviderUsageDaily',
+    'ProviderUsageHourly',
     # Repositories
     'ConversationRepository',
     'MessageRepository',
     'InvestorRepository',
     'SearchResultRepository',
     'UsageRepository',
+    # Background writers
+    'UsageSink',
+    'usage_sink',
 ]
@@ -4,56 +4,132 @@ Supports SQLite for development and PostgreSQL for production.
 """
 
 import os
+from functools import lru_cache
 from pathlib import Path
 from typing import AsyncGenerator
+from fastapi import Request
 from sqlalchemy.ext.asyncio import (
     create_async_engine,
     AsyncSession,
     async_sessionmaker,
     AsyncEngine
 )
+from sqlalchemy import event
 from sqlalchemy.orm import DeclarativeBase
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.pool import AsyncAdaptedQueuePool, StaticPool
 import logging
 
-from app.config import get_settings
+from app.config import Settings, get_settings
 
 logger = logging.getLogger(__name__)
 
+# asyncpg connection options. JIT compilation costs more than it saves on
+# this app's short OLTP queries, and a larger prepared statement cache
+# keeps repeated repository queries from being re-parsed. UUID and JSONB
+# already use asyncpg's binary codecs through SQLAlchemy's dialect.
+ASYNCPG_CONNECT_ARGS = {
+    "server_settings": {"jit": "off"},
+    "prepared_statement_cache_size": 256,
+}
+
 
 class Base(DeclarativeBase):
     """Base class for all database models."""
-    pass
 
+    # Fetch server-generated defaults (timestamps) in the INSERT/UPDATE
+    # itself via RETURNING, so they're never lazy-loaded in async code
+    __mapper_args__ = {"eager_defaults": True}
 
-class DatabaseManager:
+
+def build_sqlite_pragmas(
+    settings: Settings,
+    read_only: bool = False
+) -> tuple[str, ...]:
     """
-    Manages database connections and sessions.
-    Singleton pattern for application-wide access.
+    Render the SQLite tuning PRAGMAs once, as plain SQL strings.
+
+    WAL + synchronous=NORMAL avoids an fsync per commit, and a larger page
+    cache plus mmap keeps hot reads out of the syscall path. The journal
+    mode is persistent and set by the writer, so read-only connections
+    skip it.
     """
+    pragmas = (
+        f"PRAGMA cache_size={int(settings.sqlite_cache_size)}",
+        f"PRAGMA mmap_size={int(settings.sqlite_mmap_size)}",
+        "PRAGMA temp_store=MEMORY",
+        f"PRAGMA busy_timeout={int(settings.sqlite_busy_timeout_ms)}",
+    )
+    if read_only:
+        return pragmas
+    return (
+        f"PRAGMA journal_mode={settings.sqlite_journal_mode}",
+        f"PRAGMA synchronous={settings.sqlite_synchronous}",
+    ) + pragmas
 
-    _instance: "DatabaseManager | None" = None
-    _engine: AsyncEngine | None = None
-    _session_factory: async_sessionmaker[AsyncSession] | None = None
 
-    def __new__(cls) -> "DatabaseManager":
-        if cls._instance is None:
-            cls._instance = super().__new__(cls)
-        return cls._instance
+def _execute_pragmas(dbapi_connection, pragmas: tuple[str, ...]) -> None:
+    """Run prebuilt PRAGMAs on a raw DBAPI connection (no text()/compile)."""
+    cursor = dbapi_connection.cursor()
+    try:
+        for pragma in pragmas:
+            cursor.execute(pragma)
+    finally:
+        cursor.close()
 
-    @property
-    def engine(self) -> AsyncEngine:
-        if self._engine is None:
-            raise RuntimeError(
-                "Database not initialized. Call initialize() first.")
-        return self._engine
 
-    @property
-    def session_factory(self) -> async_sessionmaker[AsyncSession]:
-        if self._session_factory is None:
+def apply_sqlite_pragmas(
+    dbapi_connection,
+    settings: Settings | None = None,
+    read_only: bool = False
+) -> None:
+    """Apply SQLite tuning PRAGMAs to a freshly opened DBAPI connection."""
+    _execute_pragmas(
+        dbapi_connection,
+        build_sqlite_pragmas(settings or get_settings(), read_only)
+    )
+
+
+def _sqlite_read_only_url(url: str) -> str:
+    """Turn a file-based SQLite URL into a read-only URI connection URL."""
+    prefix, _, path = url.partition(":///")
+    return f"{prefix}:///file:{path}?mode=ro&uri=true"
+
+
+@lru_cache(maxsize=8)
+def _ensure_sqlite_dir(url: str) -> None:
+    """Create the directory holding a SQLite database file, once per URL."""
+    # Format: sqlite+aiosqlite:///./data/investor_finder.db
+    db_path = url.partition(":///")[2]
+    if not db_path or db_path == ":memory:":
+        return
+    db_dir = Path(db_path).parent
+    if not db_dir.exists():
+        db_dir.mkdir(parents=True, exist_ok=True)
+        logger.info(f"Created database directory: {db_dir}")
+
+
+class DatabaseManager:
+    """
+    Manages database connections and sessions.
+    The application shares the module-level db_manager instance.
+    """
+
+    def __init__(self, settings: Settings | None = None):
+        self._settings = settings or get_settings()
+        # Plain attributes so the per-request session path is a single
+        # attribute load; all None until initialize()
+        self.engine: AsyncEngine | None = None
+        self.session_factory: async_sessionmaker[AsyncSession] | None = None
+        # Read-only engine for SQLite files; None means reads share engine
+        self.read_engine: AsyncEngine | None = None
+        self.read_session_factory: async_sessionmaker[AsyncSession] | None = None
+        self.is_sqlite = False
+
+    def _assert_ready(self) -> AsyncEngine:
+        if self.engine is None:
             raise RuntimeError(
                 "Database not initialized. Call initialize() first.")
-        return self._session_factory
+        return self.engine
 
     async def initialize(self, database_url: str | None = None) -> None:
         """
@@ -62,94 +138,158 @@ class DatabaseManager:
         Args:
             database_url: Database URL. If None, uses settings.
         """
-        if self._engine is not None:
+        if self.engine is not None:
             logger.warning("Database already initialized")
             return
 
-        settings = get_settings()
+        settings = self._settings
         url = database_url or settings.database_url
+        is_sqlite = url.startswith("sqlite")
+        self.is_sqlite = is_sqlite
 
-        # Ensure data directory exists for SQLite
-        if url.startswith("sqlite"):
-            # Extract the db file path from URL
-            # Format: sqlite+aiosqlite:///./data/investor_finder.db
-            db_path = url.split("///")[-1]
-            db_dir = Path(db_path).parent
-            db_dir.mkdir(parents=True, exist_ok=True)
-            logger.info(f"Ensured database directory exists: {db_dir}")
+        if is_sqlite:
+            _ensure_sqlite_dir(url)
 
-        # Determine if using SQLite
-        is_sqlite = url.startswith("sqlite")
+        echo = settings.sql_echo
 
         # Create engine with appropriate settings
         if is_sqlite:
-            # SQLite-specific settings
-            self._engine = create_async_engine(
-                url,
-                echo=settings.debug,
-                connect_args={"check_same_thread": False},
-                poolclass=StaticPool,
-            )
+            # SQLite-specific settings. An in-memory database only lives as
+            # long as its connection, so it has to share a single one.
+            # File databases get one pooled writer connection (SQLite allows
+            # a single writer anyway) plus a pool of read-only connections
+            # that WAL lets run alongside it.
+            in_memory = ":memory:" in url or url.rstrip("/").endswith(":")
+            if in_memory:
+                self.engine = create_async_engine(
+                    url,
+                    echo=echo,
+                    connect_args={"check_same_thread": False},
+                    poolclass=StaticPool,
+                )
+            else:
+                self.engine = create_async_engine(
+                    url,
+                    echo=echo,
+                    connect_args={"check_same_thread": False},
+                    poolclass=AsyncAdaptedQueuePool,
+                    pool_size=1,
+                    max_overflow=0,
+                )
+                self.read_engine = create_async_engine(
+                    _sqlite_read_only_url(url),
+                    echo=echo,
+                    connect_args={"check_same_thread": False},
+                    poolclass=AsyncAdaptedQueuePool,
+                    pool_size=max(4, os.cpu_count() or 1),
+                    max_overflow=0,
+                )
+
+                read_pragmas = build_sqlite_pragmas(settings, read_only=True)
+
+                @event.listens_for(self.read_engine.sync_engine, "connect")
+                def _on_read_connect(dbapi_connection, connection_record):
+                    _execute_pragmas(dbapi_connection, read_pragmas)
+
+            write_pragmas = build_sqlite_pragmas(settings)
+
+            @event.listens_for(self.engine.sync_engine, "connect")
+            def _on_connect(dbapi_connection, connection_record):
+                _execute_pragmas(dbapi_connection, write_pragmas)
         else:
             # PostgreSQL settings
-            self._engine = create_async_engine(
+            self.engine = create_async_engine(
                 url,
-                echo=settings.debug,
-                pool_size=5,
-                max_overflow=10,
-                pool_pre_ping=True,
+                echo=echo,
+                pool_size=settings.database_pool_size,
+                max_overflow=settings.database_max_overflow,
+                pool_recycle=settings.database_pool_recycle,
+                pool_pre_ping=settings.database_pool_pre_ping,
+                connect_args=ASYNCPG_CONNECT_ARGS if "+asyncpg" in url else {},
             )
 
         # Create session factory
-        self._session_factory = async_sessionmaker(
-            bind=self._engine,
+        self.session_factory = async_sessionmaker(
+            bind=self.engine,
             class_=AsyncSession,
             expire_on_commit=False,
             autoflush=False,
         )
+        if self.read_engine is not None:
+            self.read_session_factory = async_sessionmaker(
+                bind=self.read_engine,
+                class_=AsyncSession,
+                expire_on_commit=False,
+                autoflush=False,
+            )
+        else:
+            self.read_session_factory = self.session_factory
 
         logger.info(
             f"Database initialized: {url.split('@')[-1] if '@' in url else url}")
 
     async def create_tables(self) -> None:
         """Create all tables defined in models."""
-        async with self.engine.begin() as conn:
+        async with self._assert_ready().begin() as conn:
             await conn.run_sync(Base.metadata.create_all)
         logger.info("Database tables created")
 
     async def drop_tables(self) -> None:
         """Drop all tables. Use with caution!"""
-        async with self.engine.begin() as conn:
+        async with self._assert_ready().begin() as conn:
             await conn.run_sync(Base.metadata.drop_all)
         logger.warning("All database tables dropped")
 
     async def close(self) -> None:
         """Close database connections."""
-        if self._engine:
-            await self._engine.dispose()
-            self._engine = None
-            self._session_factory = None
+        if self.read_engine:
+            await self.read_engine.dispose()
+            self.read_engine = None
+        if self.engine:
+            await self.engine.dispose()
+            self.engine = None
+            self.session_factory = None
+            self.read_session_factory = None
             logger.info("Database connections closed")
 
-    async def get_session(self) -> AsyncGenerator[AsyncSession, None]:
-        """Get a database session."""
-        async with self.session_factory() as session:
-            try:
-                yield session
-                await session.commit()
-            except Exception:
-                await session.rollback()
-                raise
 
 
 # Global database manager instance
 db_manager = DatabaseManager()
 
 
-async def get_db() -> AsyncGenerator[AsyncSession, None]:
-    """FastAPI dependency for database sessions."""
-    async for session in db_manager.get_session():
-        yield session
+async def get_db_rw(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """
+    FastAPI dependency for sessions that write; commits on success.
+
+    Uses the session factory the lifespan stored on app.state, so each
+    request costs one generator frame and one attribute load.
+    """
+    async with request.app.state.session_factory() as session:
+        try:
+            yield session
+            await session.commit()
+        except Exception:
+            await session.rollback()
+            raise
+
+
+async def get_db_ro(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """
+    FastAPI dependency for read-only sessions.
+
+    Never commits, so read endpoints don't open a write transaction (or
+    force a WAL sync); whatever was read is rolled back on exit.
+    """
+    async with request.app.state.read_session_factory() as session:
+        try:
+            yield session
+        finally:
+            await session.rollback()
+
+
+# Writing session remains the default dependency
+get_db = get_db_rw
 
 
 async def init_db(database_url: str | None = None) -> None:
@@ -3,15 +3,94 @@ Database models for conversation and investor storage.
 Uses SQLAlchemy ORM with async support.
 """
 
-from datetime import datetime
-from typing import Optional, List
+from datetime import date, datetime
+from typing import Optional, List, Dict, Any
 from sqlalchemy import (
-    String, Text, DateTime, Integer, Float,
-    ForeignKey, JSON, Boolean, Index
+    String, Text, Date, DateTime, Integer, Float,
+    ForeignKey, JSON, Boolean, Index, Uuid, DDL, event, text
 )
+from sqlalchemy.dialects.postgresql import JSONB, insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.sql.expression import FunctionElement
 
 from app.database.connection import Base
+from app.database.types import CompressedText
+
+
+# UUID primary/foreign keys: native UUID on PostgreSQL, 32-char hex on
+# SQLite. Values stay canonical strings in Python so callers are unchanged.
+UuidKey = Uuid(as_uuid=False)
+
+# Binary JSONB on PostgreSQL (no reparse on read, GIN-indexable); plain
+# JSON elsewhere.
+JsonDocument = JSON().with_variant(JSONB(), "postgresql")
+
+
+class utcnow(FunctionElement):
+    """
+    Current UTC time, evaluated by the database.
+
+    Used for server-side defaults so rows are stamped without building a
+    Python datetime per insert/update.
+    """
+    type = DateTime()
+    inherit_cache = True
+
+
+@compiles(utcnow)
+def _utcnow_default(element, compiler, **kw):
+    return "CURRENT_TIMESTAMP"
+
+
+@compiles(utcnow, "postgresql")
+def _utcnow_postgresql(element, compiler, **kw):
+    return "TIMEZONE('utc', CURRENT_TIMESTAMP)"
+
+
+@compiles(utcnow, "sqlite")
+def _utcnow_sqlite(element, compiler, **kw):
+    # CURRENT_TIMESTAMP has second resolution; keep milliseconds so rows
+    # created in the same second still order correctly
+    return "(STRFTIME('%Y-%m-%d %H:%M:%f', 'now'))"
+
+
+class utc_hours_ago(FunctionElement):
+    """
+    UTC time the given number of hours ago, evaluated by the database.
+
+    Keeps retention cutoffs on the same clock as the utcnow() stamps they
+    are compared against.
+    """
+    type = DateTime()
+    inherit_cache = True
+
+
+@compiles(utc_hours_ago)
+def _utc_hours_ago_default(element, compiler, **kw):
+    hours = compiler.process(element.clauses, **kw)
+    return f"(CURRENT_TIMESTAMP - {hours} * INTERVAL '1' HOUR)"
+
+
+@compiles(utc_hours_ago, "postgresql")
+def _utc_hours_ago_postgresql(element, compiler, **kw):
+    hours = compiler.process(element.clauses, **kw)
+    return f"(TIMEZONE('utc', CURRENT_TIMESTAMP) - make_interval(hours => {hours}))"
+
+
+@compiles(utc_hours_ago, "sqlite")
+def _utc_hours_ago_sqlite(element, compiler, **kw):
+    hours = compiler.process(element.clauses, **kw)
+    return f"(STRFTIME('%Y-%m-%d %H:%M:%f', 'now', '-' || {hours} || ' hours'))"
+
+
+def _dialect_insert(session: AsyncSession, model):
+    """INSERT construct for the session's dialect, with ON CONFLICT support."""
+    dialect = session.get_bind().dialect.name
+    insert_fn = pg_insert if dialect == "postgresql" else sqlite_insert
+    return insert_fn(model)
 
 
 class Conversation(Base):
@@ -21,31 +100,40 @@ class Conversation(Base):
     """
     __tablename__ = "conversations"
 
-    id: Mapped[str] = mapped_column(String(36), primary_key=True)
+    id: Mapped[str] = mapped_column(UuidKey, primary_key=True)
     created_at: Mapped[datetime] = mapped_column(
-        DateTime, default=datetime.utcnow)
+        DateTime, server_default=utcnow())
     updated_at: Mapped[datetime] = mapped_column(
-        DateTime, default=datetime.utcnow, onupdate=datetime.utcnow
+        DateTime, server_default=utcnow(), onupdate=utcnow()
     )
-    sectors_discussed: Mapped[dict] = mapped_column(JSON, default=list)
-    extra_data: Mapped[dict] = mapped_column(JSON, default=dict)
+    sectors_discussed: Mapped[dict] = mapped_column(JsonDocument, default=list)
+    extra_data: Mapped[dict] = mapped_column(JsonDocument, default=dict)
     is_active: Mapped[bool] = mapped_column(Boolean, default=True)
 
-    # Relationships
+    # Relationships. Investors are small and almost always needed, so they
+    # load with one extra IN query per batch of conversations; override per
+    # query with selectinload()/raiseload(). Messages and search results
+    # grow without bound, so they never lazy-load: use an explicit loader
+    # option or stream them through the repositories.
     messages: Mapped[List["Message"]] = relationship(
-        "Message", back_populates="conversation", cascade="all, delete-orphan"
+        "Message", back_populates="conversation", cascade="all, delete-orphan",
+        lazy="raise"
     )
     investors: Mapped[List["ConversationInvestor"]] = relationship(
-        "ConversationInvestor", back_populates="conversation", cascade="all, delete-orphan"
+        "ConversationInvestor", back_populates="conversation", cascade="all, delete-orphan",
+        lazy="selectin"
     )
     search_results: Mapped[List["SearchResultRecord"]] = relationship(
-        "SearchResultRecord", back_populates="conversation", cascade="all, delete-orphan"
+        "SearchResultRecord", back_populates="conversation", cascade="all, delete-orphan",
+        lazy="raise"
     )
 
     # Indexes for common queries
     __table_args__ = (
         Index("idx_conversation_updated", "updated_at"),
         Index("idx_conversation_active", "is_active"),
+        Index("idx_conv_sectors_gin", "sectors_discussed",
+              postgresql_using="gin").ddl_if(dialect="postgresql"),
     )
 
 
@@ -62,9 +150,9 @@ class User(Base):
     hashed_password: Mapped[str] = mapped_column(String(255), nullable=False)
     is_active: Mapped[bool] = mapped_column(Boolean, default=True)
     created_at: Mapped[datetime] = mapped_column(
-        DateTime, default=datetime.utcnow)
+        DateTime, server_default=utcnow())
     updated_at: Mapped[datetime] = mapped_column(
-        DateTime, default=datetime.utcnow, onupdate=datetime.utcnow
+        DateTime, server_default=utcnow(), onupdate=utcnow()
     )
 
     __table_args__ = (
@@ -82,26 +170,40 @@ class Message(Base):
     id: Mapped[int] = mapped_column(
         Integer, primary_key=True, autoincrement=True)
     conversation_id: Mapped[str] = mapped_column(
-        String(36), ForeignKey("conversations.id", ondelete="CASCADE")
+        UuidKey, ForeignKey("conversations.id", ondelete="CASCADE")
     )
     role: Mapped[str] = mapped_column(String(20))  # 'user' or 'assistant'
-    content: Mapped[str] = mapped_column(Text)
+    content: Mapped[str] = mapped_column(CompressedText)
     timestamp: Mapped[datetime] = mapped_column(
-        DateTime, default=datetime.utcnow)
+        DateTime, server_default=utcnow())
 
     # Token tracking for analytics
     token_count: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
 
     # Relationship
     conversation: Mapped["Conversation"] = relationship(
-        "Conversation", back_populates="messages")
+        "Conversation", back_populates="messages", lazy="raise_on_sql")
 
     __table_args__ = (
-        Index("idx_message_conversation", "conversation_id"),
+        # Serves "messages in conversation ordered by time" without a sort
+        Index("idx_message_conv_ts", "conversation_id", "timestamp"),
         Index("idx_message_timestamp", "timestamp"),
     )
 
 
+def fold_name(name: str) -> str:
+    """
+    Case-fold an investor name for lookup. Folded in Python rather than by
+    the database, since SQLite's lower() only folds ASCII and the
+    repository keys its caches with this same function.
+    """
+    return name.lower()
+
+
+def _name_lower_default(context) -> str:
+    return fold_name(context.get_current_parameters()["name"])
+
+
 class Investor(Base):
     """
     Represents an investor profile.
@@ -112,37 +214,140 @@ class Investor(Base):
     id: Mapped[int] = mapped_column(
         Integer, primary_key=True, autoincrement=True)
     name: Mapped[str] = mapped_column(String(255), nullable=False)
+    # fold_name(name), for case-insensitive lookup
     name_lower: Mapped[str] = mapped_column(
-        String(255), index=True)  # For case-insensitive lookup
+        String(255), default=_name_lower_default, index=True)
     title: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
     company: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
     email: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
     linkedin_url: Mapped[Optional[str]] = mapped_column(
         String(500), nullable=True, unique=True)
     location: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
-    bio: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
-    investment_focus: Mapped[dict] = mapped_column(JSON, default=list)
+    investment_focus: Mapped[dict] = mapped_column(JsonDocument, default=list)
     source: Mapped[Optional[str]] = mapped_column(String(50), nullable=True)
 
     # Metadata
     created_at: Mapped[datetime] = mapped_column(
-        DateTime, default=datetime.utcnow)
+        DateTime, server_default=utcnow())
     updated_at: Mapped[datetime] = mapped_column(
-        DateTime, default=datetime.utcnow, onupdate=datetime.utcnow
+        DateTime, server_default=utcnow(), onupdate=utcnow()
     )
     enriched: Mapped[bool] = mapped_column(Boolean, default=False)
 
     # Relationships
     conversations: Mapped[List["ConversationInvestor"]] = relationship(
-        "ConversationInvestor", back_populates="investor"
+        "ConversationInvestor", back_populates="investor", lazy="raise_on_sql"
+    )
+    # Wide text lives in its own table so listing queries stay narrow
+    profile: Mapped[Optional["InvestorProfileRecord"]] = relationship(
+        "InvestorProfileRecord", back_populates="investor",
+        cascade="all, delete-orphan", lazy="raise_on_sql"
     )
 
     __table_args__ = (
         Index("idx_investor_name", "name_lower"),
+        # Investors without a LinkedIn URL are identified by name; this is
+        # the conflict target for their upserts
+        Index("uq_investor_name_no_url", "name_lower", unique=True,
+              sqlite_where=text("linkedin_url IS NULL"),
+              postgresql_where=text("linkedin_url IS NULL")),
         Index("idx_investor_company", "company"),
         Index("idx_investor_source", "source"),
+        # Trigram indexes serve the substring filters in search()
+        Index("ix_inv_name_trgm", "name_lower", postgresql_using="gin",
+              postgresql_ops={"name_lower": "gin_trgm_ops"}
+              ).ddl_if(dialect="postgresql"),
+        Index("ix_inv_company_trgm", "company", postgresql_using="gin",
+              postgresql_ops={"company": "gin_trgm_ops"}
+              ).ddl_if(dialect="postgresql"),
     )
 
+    @classmethod
+    async def bulk_upsert(
+        cls,
+        session: AsyncSession,
+        rows: List[Dict[str, Any]]
+    ) -> None:
+        """
+        Insert many investors in one statement, skipping LinkedIn URLs that
+        already exist.
+        """
+        if not rows:
+            return
+        stmt = _dialect_insert(session, cls).on_conflict_do_nothing(
+            index_elements=[cls.linkedin_url])
+        await session.execute(stmt, rows)
+
+    @classmethod
+    async def upsert_returning(
+        cls,
+        session: AsyncSession,
+        rows: List[Dict[str, Any]],
+        by_url: bool
+    ) -> List["Investor"]:
+        """
+        Insert or touch investors in one statement and return them in
+        input order. Rows are matched on linkedin_url when by_url is set,
+        otherwise on name_lower among investors without a URL.
+        """
+        if not rows:
+            return []
+        stmt = _dialect_insert(session, cls)
+        if by_url:
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[cls.linkedin_url],
+                set_={"name": stmt.excluded.name,
+                      "name_lower": stmt.excluded.name_lower,
+                      "updated_at": utcnow()})
+        else:
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[cls.name_lower],
+                index_where=cls.linkedin_url.is_(None),
+                set_={"name": stmt.excluded.name,
+                      "name_lower": stmt.excluded.name_lower,
+                      "updated_at": utcnow()})
+        stmt = stmt.returning(cls, sort_by_parameter_order=True)
+        result = await session.scalars(
+            stmt, rows, execution_options={"populate_existing": True})
+        return list(result.all())
+
+
+event.listen(
+    Investor.__table__, "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql")
+)
+
+
+class InvestorProfileRecord(Base):
+    """
+    Long-form investor details, one row per investor.
+    Kept out of the investors table to keep its rows small.
+    """
+    __tablename__ = "investor_profiles"
+
+    investor_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("investors.id", ondelete="CASCADE"), primary_key=True
+    )
+    bio: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+
+    # Relationship
+    investor: Mapped["Investor"] = relationship(
+        "Investor", back_populates="profile", lazy="raise_on_sql"
+    )
+
+    @classmethod
+    async def bulk_insert(
+        cls,
+        session: AsyncSession,
+        rows: List[Dict[str, Any]]
+    ) -> None:
+        """Insert many profiles in one statement, keeping existing ones."""
+        if not rows:
+            return
+        stmt = _dialect_insert(session, cls).on_conflict_do_nothing(
+            index_elements=[cls.investor_id])
+        await session.execute(stmt, rows)
+
 
 class ConversationInvestor(Base):
     """
@@ -154,29 +359,48 @@ class ConversationInvestor(Base):
     id: Mapped[int] = mapped_column(
         Integer, primary_key=True, autoincrement=True)
     conversation_id: Mapped[str] = mapped_column(
-        String(36), ForeignKey("conversations.id", ondelete="CASCADE")
+        UuidKey, ForeignKey("conversations.id", ondelete="CASCADE")
     )
     investor_id: Mapped[int] = mapped_column(
         Integer, ForeignKey("investors.id", ondelete="CASCADE")
     )
     added_at: Mapped[datetime] = mapped_column(
-        DateTime, default=datetime.utcnow)
+        DateTime, server_default=utcnow())
     page_number: Mapped[int] = mapped_column(
         Integer, default=0)  # For pagination tracking
 
     # Relationships
     conversation: Mapped["Conversation"] = relationship(
-        "Conversation", back_populates="investors"
+        "Conversation", back_populates="investors", lazy="raise_on_sql"
     )
     investor: Mapped["Investor"] = relationship(
-        "Investor", back_populates="conversations"
+        "Investor", back_populates="conversations", lazy="selectin"
     )
 
     __table_args__ = (
         Index("idx_conv_investor", "conversation_id",
               "investor_id", unique=True),
+        # Serves a page of a conversation's investors in added order
+        Index("ix_convinv_cid_page_added", "conversation_id",
+              "page_number", "added_at"),
     )
 
+    @classmethod
+    async def bulk_insert(
+        cls,
+        session: AsyncSession,
+        rows: List[Dict[str, Any]]
+    ) -> None:
+        """
+        Link many investors in one statement, skipping investors already
+        linked to the same conversation.
+        """
+        if not rows:
+            return
+        stmt = _dialect_insert(session, cls).on_conflict_do_nothing(
+            index_elements=[cls.conversation_id, cls.investor_id])
+        await session.execute(stmt, rows)
+
 
 class SearchResultRecord(Base):
     """
@@ -187,24 +411,41 @@ class SearchResultRecord(Base):
     id: Mapped[int] = mapped_column(
         Integer, primary_key=True, autoincrement=True)
     conversation_id: Mapped[str] = mapped_column(
-        String(36), ForeignKey("conversations.id", ondelete="CASCADE")
+        UuidKey, ForeignKey("conversations.id", ondelete="CASCADE")
     )
     title: Mapped[str] = mapped_column(String(500))
     url: Mapped[str] = mapped_column(String(1000))
-    snippet: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    snippet: Mapped[Optional[str]] = mapped_column(
+        CompressedText, nullable=True)
     created_at: Mapped[datetime] = mapped_column(
-        DateTime, default=datetime.utcnow)
+        DateTime, server_default=utcnow())
 
     # Relationship
     conversation: Mapped["Conversation"] = relationship(
-        "Conversation", back_populates="search_results"
+        "Conversation", back_populates="search_results", lazy="raise_on_sql"
     )
 
     __table_args__ = (
-        Index("idx_search_conversation", "conversation_id"),
+        Index("uq_search_conv_url", "conversation_id", "url", unique=True),
         Index("idx_search_url", "url"),
     )
 
+    @classmethod
+    async def bulk_insert(
+        cls,
+        session: AsyncSession,
+        rows: List[Dict[str, Any]]
+    ) -> None:
+        """
+        Insert many search results in one statement, skipping URLs already
+        stored for the same conversation.
+        """
+        if not rows:
+            return
+        stmt = _dialect_insert(session, cls).on_conflict_do_nothing(
+            index_elements=[cls.conversation_id, cls.url])
+        await session.execute(stmt, rows)
+
 
 class UserSession(Base):
     """
@@ -212,15 +453,15 @@ class UserSession(Base):
     """
     __tablename__ = "user_sessions"
 
-    id: Mapped[str] = mapped_column(String(36), primary_key=True)
+    id: Mapped[str] = mapped_column(UuidKey, primary_key=True)
     ip_address: Mapped[Optional[str]] = mapped_column(
         String(45), nullable=True)
     user_agent: Mapped[Optional[str]] = mapped_column(
         String(500), nullable=True)
     created_at: Mapped[datetime] = mapped_column(
-        DateTime, default=datetime.utcnow)
+        DateTime, server_default=utcnow())
     last_activity: Mapped[datetime] = mapped_column(
-        DateTime, default=datetime.utcnow, onupdate=datetime.utcnow
+        DateTime, server_default=utcnow(), onupdate=utcnow()
     )
     request_count: Mapped[int] = mapped_column(Integer, default=0)
 
@@ -242,7 +483,7 @@ class ProviderUsage(Base):
     # 'gemini', 'google', etc.
     provider_name: Mapped[str] = mapped_column(String(50))
     conversation_id: Mapped[Optional[str]] = mapped_column(
-        String(36), nullable=True)
+        UuidKey, nullable=True)
 
     # Usage metrics
     request_count: Mapped[int] = mapped_column(Integer, default=1)
@@ -253,9 +494,87 @@ class ProviderUsage(Base):
     error_message: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
 
     timestamp: Mapped[datetime] = mapped_column(
-        DateTime, default=datetime.utcnow)
+        DateTime, server_default=utcnow())
 
     __table_args__ = (
-        Index("idx_usage_provider", "provider_type", "provider_name"),
+        Index("idx_usage_provider_ts", "provider_type",
+              "provider_name", "timestamp"),
         Index("idx_usage_timestamp", "timestamp"),
     )
+
+
+class ProviderUsageDaily(Base):
+    """
+    Per-day rollup of ProviderUsage for dashboards.
+    One row per provider per UTC day, rebuilt by UsageRepository.rollup_day.
+    """
+    __tablename__ = "provider_usage_daily"
+
+    id: Mapped[int] = mapped_column(
+        Integer, primary_key=True, autoincrement=True)
+    day: Mapped[date] = mapped_column(Date)
+    provider_type: Mapped[str] = mapped_column(String(50))
+    provider_name: Mapped[str] = mapped_column(String(50))
+
+    request_count: Mapped[int] = mapped_column(Integer, default=0)
+    error_count: Mapped[int] = mapped_column(Integer, default=0)
+    tokens_used: Mapped[int] = mapped_column(Integer, default=0)
+    avg_response_time_ms: Mapped[Optional[float]
+                                 ] = mapped_column(Float, nullable=True)
+    p50_response_time_ms: Mapped[Optional[int]
+                                 ] = mapped_column(Integer, nullable=True)
+    p95_response_time_ms: Mapped[Optional[int]
+                                 ] = mapped_column(Integer, nullable=True)
+
+    __table_args__ = (
+        Index("idx_usage_daily_day_provider", "day",
+              "provider_type", "provider_name", unique=True),
+    )
+
+
+class ProviderUsageHourly(Base):
+    """
+    Running per-hour usage totals, kept in step with ProviderUsage inserts.
+    Answers usage stats without scanning individual events.
+    """
+    __tablename__ = "provider_usage_hourly"
+
+    id: Mapped[int] = mapped_column(
+        Integer, primary_key=True, autoincrement=True)
+    provider_type: Mapped[str] = mapped_column(String(50))
+    provider_name: Mapped[str] = mapped_column(String(50))
+    bucket_hour: Mapped[datetime] = mapped_column(DateTime)
+
+    requests: Mapped[int] = mapped_column(Integer, default=0)
+    errors: Mapped[int] = mapped_column(Integer, default=0)
+    tokens: Mapped[int] = mapped_column(Integer, default=0)
+    # Requests that reported a response time, and their total
+    timed_requests: Mapped[int] = mapped_column(Integer, default=0)
+    sum_ms: Mapped[int] = mapped_column(Integer, default=0)
+
+    __table_args__ = (
+        Index("uq_usage_hourly_provider_hour", "provider_type",
+              "provider_name", "bucket_hour", unique=True),
+        Index("idx_usage_hourly_hour", "bucket_hour"),
+    )
+
+    @classmethod
+    async def add_counts(
+        cls,
+        session: AsyncSession,
+        rows: List[Dict[str, Any]]
+    ) -> None:
+        """Add pre-aggregated counts to their hourly buckets in one statement."""
+        if not rows:
+            return
+        stmt = _dialect_insert(session, cls)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[cls.provider_type, cls.provider_name, cls.bucket_hour],
+            set_={
+                "requests": cls.requests + stmt.excluded.requests,
+                "errors": cls.errors + stmt.excluded.errors,
+                "tokens": cls.tokens + stmt.excluded.tokens,
+                "timed_requests": cls.timed_requests + stmt.excluded.timed_requests,
+                "sum_ms": cls.sum_ms + stmt.excluded.sum_ms,
+            })
+        await session.execute(stmt, rows)
@@ -3,18 +3,20 @@ Repository pattern for database operations.
 Provides clean interface for CRUD operations on all models.
 """
 
-from typing import List, Optional, Dict, Any
-from datetime import datetime, timedelta
-from sqlalchemy import select, delete, update, func, Integer
+from typing import List, Optional, Dict, Any, AsyncIterator, Union
+from datetime import date, datetime, time, timedelta
+from sqlalchemy import select, insert, delete, update, func, lambda_stmt
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import raiseload, selectinload
 import logging
 
 from app.database.models import (
-    Conversation, Message, Investor,
+    Conversation, Message, Investor, InvestorProfileRecord,
     ConversationInvestor, SearchResultRecord,
-    ProviderUsage
+    ProviderUsage, ProviderUsageDaily, ProviderUsageHourly, fold_name,
+    utc_hours_ago
 )
+from app.database.types import compress_text
 from app.models import (
     ChatMessage, MessageRole,
     InvestorProfile, SearchResult
@@ -23,6 +25,44 @@ from app.models import (
 logger = logging.getLogger(__name__)
 
 
+# Batches at least this large go through COPY on PostgreSQL (asyncpg)
+COPY_THRESHOLD = 50
+
+
+async def _bulk_copy(
+    session: AsyncSession,
+    table: str,
+    columns: tuple,
+    records: List[tuple],
+    conflict_columns: tuple
+) -> None:
+    """
+    Load rows with PostgreSQL COPY, keeping ON CONFLICT DO NOTHING semantics.
+
+    COPY can't skip conflicting rows, so records are copied into a
+    transaction-scoped staging table and moved over with one
+    INSERT ... SELECT. The staging table has only the copied columns and
+    no defaults, so staging draws nothing from the target's id sequence.
+    Records must already be in driver format (TypeDecorator bind
+    processing doesn't run here).
+    """
+    stage = f"_stage_{table}"
+    cols = ", ".join(columns)
+    conn = await session.connection()
+    await conn.exec_driver_sql(
+        f"CREATE TEMP TABLE IF NOT EXISTS {stage} ON COMMIT DELETE ROWS "
+        f"AS SELECT {cols} FROM {table} WITH NO DATA")
+    await conn.exec_driver_sql(f"TRUNCATE {stage}")
+
+    raw = await conn.get_raw_connection()
+    await raw.driver_connection.copy_records_to_table(
+        stage, records=records, columns=list(columns))
+
+    await conn.exec_driver_sql(
+        f"INSERT INTO {table} ({cols}) SELECT {cols} FROM {stage} "
+        f"ON CONFLICT ({', '.join(conflict_columns)}) DO NOTHING")
+
+
 class ConversationRepository:
     """
     Repository for Conversation CRUD operations.
@@ -32,16 +72,19 @@ class ConversationRepository:
         self.session = session
 
     async def create(self, conversation_id: str) -> Conversation:
-        """Create a new conversation."""
+        """
+        Create a new conversation. Nothing is flushed: sessions run with
+        autoflush off, so queries won't see the row until the caller
+        flushes or commits.
+        """
         conversation = Conversation(id=conversation_id)
         self.session.add(conversation)
-        await self.session.flush()
         logger.debug(f"Created conversation: {conversation_id}")
         return conversation
 
     async def get(self, conversation_id: str) -> Optional[Conversation]:
-        """Get conversation by ID with related data."""
-        stmt = (
+        """Get conversation by ID with all related data."""
+        stmt = lambda_stmt(lambda: (
             select(Conversation)
             .options(
                 selectinload(Conversation.messages),
@@ -50,13 +93,47 @@ class ConversationRepository:
                 selectinload(Conversation.search_results)
             )
             .where(Conversation.id == conversation_id)
-        )
+        ))
+        result = await self.session.execute(stmt)
+        return result.scalar_one_or_none()
+
+    async def get_meta(self, conversation_id: str) -> Optional[Conversation]:
+        """Get conversation columns only, without any related rows."""
+        stmt = lambda_stmt(lambda: (
+            select(Conversation)
+            .options(raiseload(Conversation.investors))
+            .where(Conversation.id == conversation_id)
+        ))
+        result = await self.session.execute(stmt)
+        return result.scalar_one_or_none()
+
+    async def get_with_messages(self, conversation_id: str) -> Optional[Conversation]:
+        """Get conversation with its messages loaded."""
+        stmt = lambda_stmt(lambda: (
+            select(Conversation)
+            .options(
+                selectinload(Conversation.messages),
+                raiseload(Conversation.investors)
+            )
+            .where(Conversation.id == conversation_id)
+        ))
+        result = await self.session.execute(stmt)
+        return result.scalar_one_or_none()
+
+    async def get_with_investors(self, conversation_id: str) -> Optional[Conversation]:
+        """
+        Get conversation with its investor links loaded.
+        For a single page use InvestorRepository.get_for_conversation,
+        which filters and limits in SQL.
+        """
+        stmt = lambda_stmt(
+            lambda: select(Conversation).where(Conversation.id == conversation_id))
         result = await self.session.execute(stmt)
         return result.scalar_one_or_none()
 
     async def get_or_create(self, conversation_id: str) -> Conversation:
         """Get existing or create new conversation."""
-        conversation = await self.get(conversation_id)
+        conversation = await self.get_meta(conversation_id)
         if not conversation:
             conversation = await self.create(conversation_id)
         return conversation
@@ -70,10 +147,7 @@ class ConversationRepository:
         stmt = (
             update(Conversation)
             .where(Conversation.id == conversation_id)
-            .values(
-                sectors_discussed=sectors,
-                updated_at=datetime.utcnow()
-            )
+            .values(sectors_discussed=sectors)
         )
         await self.session.execute(stmt)
 
@@ -91,6 +165,7 @@ class ConversationRepository:
         """List active conversations."""
         stmt = (
             select(Conversation)
+            .options(raiseload(Conversation.investors))
             .where(Conversation.is_active == True)
             .order_by(Conversation.updated_at.desc())
             .limit(limit)
@@ -101,10 +176,9 @@ class ConversationRepository:
 
     async def cleanup_old(self, hours: int = 24) -> int:
         """Delete conversations older than specified hours."""
-        cutoff = datetime.utcnow() - timedelta(hours=hours)
         stmt = (
             delete(Conversation)
-            .where(Conversation.updated_at < cutoff)
+            .where(Conversation.updated_at < utc_hours_ago(hours))
         )
         result = await self.session.execute(stmt)
         logger.info(f"Cleaned up {result.rowcount} old conversations")
@@ -126,7 +200,11 @@ class MessageRepository:
         content: str,
         token_count: Optional[int] = None
     ) -> Message:
-        """Add a message to a conversation."""
+        """
+        Add a message to a conversation. Nothing is flushed: sessions run
+        with autoflush off, so flush before querying for the message or
+        reading its id.
+        """
         message = Message(
             conversation_id=conversation_id,
             role=role,
@@ -134,7 +212,6 @@ class MessageRepository:
             token_count=token_count
         )
         self.session.add(message)
-        await self.session.flush()
         return message
 
     async def get_history(
@@ -143,17 +220,30 @@ class MessageRepository:
         limit: Optional[int] = None
     ) -> List[Message]:
         """Get message history for a conversation."""
-        stmt = (
+        stmt = lambda_stmt(lambda: (
             select(Message)
             .where(Message.conversation_id == conversation_id)
-            .order_by(Message.timestamp.asc())
-        )
+            .order_by(Message.timestamp.asc(), Message.id.asc())
+        ))
         if limit:
-            stmt = stmt.limit(limit)
+            stmt += lambda s: s.limit(limit)
 
         result = await self.session.execute(stmt)
         return list(result.scalars().all())
 
+    async def stream_messages(
+        self,
+        conversation_id: str
+    ) -> AsyncIterator[Message]:
+        """Yield a conversation's messages in order without loading them all."""
+        stmt = (
+            select(Message)
+            .where(Message.conversation_id == conversation_id)
+            .order_by(Message.timestamp.asc(), Message.id.asc())
+        )
+        async for message in await self.session.stream_scalars(stmt):
+            yield message
+
     async def count(self, conversation_id: str) -> int:
         """Count messages in a conversation."""
         stmt = (
@@ -171,57 +261,177 @@ class InvestorRepository:
 
     def __init__(self, session: AsyncSession):
         self.session = session
+        # Ids only, keyed by LinkedIn URL / fold_name(name). The repository
+        # lives as long as its session, so hits resolve from the identity map.
+        self._linkedin_cache: Dict[str, int] = {}
+        self._name_cache: Dict[str, int] = {}
+
+    def _remember(self, investor: Investor) -> None:
+        """Cache an investor's id under its LinkedIn URL and name."""
+        if investor.linkedin_url:
+            self._linkedin_cache[investor.linkedin_url] = investor.id
+        else:
+            self._name_cache[investor.name_lower] = investor.id
+
+    def invalidate(self, key: Union[int, str]) -> None:
+        """Forget cached ids for an investor id or LinkedIn URL."""
+        if isinstance(key, str):
+            self._linkedin_cache.pop(key, None)
+            return
+        for cache in (self._linkedin_cache, self._name_cache):
+            for cached_key in [k for k, v in cache.items() if v == key]:
+                del cache[cached_key]
+
+    async def _get_cached(self, cache: Dict[str, int], key: str) -> Optional[Investor]:
+        """Resolve a cached id, dropping it if the row is gone."""
+        investor_id = cache.get(key)
+        if investor_id is None:
+            return None
+        investor = await self.session.get(Investor, investor_id)
+        if investor is None:
+            del cache[key]
+        return investor
 
     async def get_by_linkedin(self, linkedin_url: str) -> Optional[Investor]:
         """Get investor by LinkedIn URL."""
-        stmt = select(Investor).where(Investor.linkedin_url == linkedin_url)
+        investor = await self._get_cached(self._linkedin_cache, linkedin_url)
+        if investor is not None:
+            return investor
+
+        stmt = lambda_stmt(
+            lambda: select(Investor).where(Investor.linkedin_url == linkedin_url))
         result = await self.session.execute(stmt)
-        return result.scalar_one_or_none()
+        investor = result.scalar_one_or_none()
+        if investor is not None:
+            self._linkedin_cache[linkedin_url] = investor.id
+        return investor
 
     async def get_by_name(self, name: str) -> Optional[Investor]:
         """Get investor by name (case-insensitive)."""
-        stmt = select(Investor).where(Investor.name_lower == name.lower())
+        key = fold_name(name)
+        investor = await self._get_cached(self._name_cache, key)
+        if investor is not None:
+            return investor
+
+        stmt = lambda_stmt(
+            lambda: select(Investor).where(Investor.name_lower == key))
         result = await self.session.execute(stmt)
-        return result.scalar_one_or_none()
+        investor = result.scalar_one_or_none()
+        if investor is not None:
+            self._name_cache[key] = investor.id
+        return investor
+
+    @staticmethod
+    def _profile_row(profile: InvestorProfile) -> Dict[str, Any]:
+        """Map a profile to Investor column values."""
+        source = profile.source
+        return {
+            "name": profile.name,
+            "name_lower": fold_name(profile.name),
+            "title": profile.title,
+            "company": profile.company,
+            "email": profile.email,
+            "linkedin_url": profile.linkedin_url,
+            "location": profile.location,
+            "investment_focus": profile.investment_focus,
+            "source": source,
+            "enriched": 'enriched' in (source or '')
+        }
 
     async def create(self, profile: InvestorProfile) -> Investor:
         """Create a new investor from profile."""
-        investor = Investor(
-            name=profile.name,
-            name_lower=profile.name.lower(),
-            title=profile.title,
-            company=profile.company,
-            email=profile.email,
-            linkedin_url=profile.linkedin_url,
-            location=getattr(profile, 'location', None),
-            bio=getattr(profile, 'bio', None),
-            investment_focus=getattr(profile, 'investment_focus', []),
-            source=getattr(profile, 'source', None),
-            enriched='enriched' in (getattr(profile, 'source', '') or '')
-        )
+        investor = Investor(**self._profile_row(profile))
+        if profile.bio:
+            investor.profile = InvestorProfileRecord(bio=profile.bio)
         self.session.add(investor)
         await self.session.flush()
+        self._remember(investor)
         return investor
 
+    async def bulk_upsert(
+        self,
+        profiles: List[InvestorProfile]
+    ) -> Dict[str, int]:
+        """
+        Insert profiles that have a LinkedIn URL in one batch, keeping
+        existing rows. Returns investor ids keyed by LinkedIn URL.
+        """
+        by_url = {p.linkedin_url: p for p in profiles if p.linkedin_url}
+        if not by_url:
+            return {}
+
+        await Investor.bulk_upsert(
+            self.session, [self._profile_row(p) for p in by_url.values()])
+        stmt = (
+            select(Investor.linkedin_url, Investor.id)
+            .where(Investor.linkedin_url.in_(by_url.keys()))
+        )
+        result = await self.session.execute(stmt)
+        ids = dict(result.tuples().all())
+
+        await InvestorProfileRecord.bulk_insert(self.session, [
+            {"investor_id": ids[url], "bio": p.bio}
+            for url, p in by_url.items() if p.bio
+        ])
+        return ids
+
     async def get_or_create(self, profile: InvestorProfile) -> Investor:
         """Get existing investor or create new one."""
-        # Try LinkedIn URL first (more unique)
-        if profile.linkedin_url:
-            investor = await self.get_by_linkedin(profile.linkedin_url)
-            if investor:
-                return investor
-
-        # Try name
-        investor = await self.get_by_name(profile.name)
-        if investor:
-            return investor
+        return (await self.get_or_create_many([profile]))[0]
 
-        # Create new
-        return await self.create(profile)
+    async def get_or_create_many(
+        self,
+        profiles: List[InvestorProfile]
+    ) -> List[Investor]:
+        """
+        Get or create investors for profiles with one upsert per identity
+        kind (LinkedIn URL, or name for profiles without one).
+        Returns investors in the order of the given profiles.
+        """
+        resolved: Dict[str, Investor] = {}
+        with_url: Dict[str, InvestorProfile] = {}
+        without_url: Dict[str, InvestorProfile] = {}
+        for p in profiles:
+            if p.linkedin_url:
+                key, cache, pending = p.linkedin_url, self._linkedin_cache, with_url
+            else:
+                key, cache, pending = fold_name(p.name), self._name_cache, without_url
+            if key in resolved or key in pending:
+                continue
+            investor = await self._get_cached(cache, key)
+            if investor is not None:
+                resolved[key] = investor
+            else:
+                pending[key] = p
+
+        by_url = await Investor.upsert_returning(
+            self.session, [self._profile_row(p) for p in with_url.values()],
+            by_url=True)
+        by_name = await Investor.upsert_returning(
+            self.session, [self._profile_row(p) for p in without_url.values()],
+            by_url=False)
+
+        resolved.update(zip(with_url, by_url))
+        resolved.update(zip(without_url, by_name))
+        for investor in (*by_url, *by_name):
+            self._remember(investor)
+
+        await InvestorProfileRecord.bulk_insert(self.session, [
+            {"investor_id": investor.id, "bio": p.bio}
+            for p, investor in zip(
+                [*with_url.values(), *without_url.values()], [*by_url, *by_name])
+            if p.bio
+        ])
+
+        return [
+            resolved[p.linkedin_url or fold_name(p.name)] for p in profiles
+        ]
 
     async def update(self, investor_id: int, **kwargs) -> None:
         """Update investor fields."""
-        kwargs['updated_at'] = datetime.utcnow()
+        self.invalidate(investor_id)
+        if "name" in kwargs:
+            kwargs["name_lower"] = fold_name(kwargs["name"])
         stmt = (
             update(Investor)
             .where(Investor.id == investor_id)
@@ -236,15 +446,23 @@ class InvestorRepository:
         source: Optional[str] = None,
         limit: int = 50
     ) -> List[Investor]:
-        """Search investors with filters."""
+        """
+        Search investors with filters. Name and company match substrings
+        (served by trigram indexes on PostgreSQL); queries shorter than a
+        trigram match name prefixes instead.
+        """
         stmt = select(Investor)
 
         if query:
-            stmt = stmt.where(
-                Investor.name_lower.contains(query.lower())
-            )
+            query = fold_name(query)
+            if len(query) < 3:
+                stmt = stmt.where(
+                    Investor.name_lower.startswith(query, autoescape=True))
+            else:
+                stmt = stmt.where(
+                    Investor.name_lower.contains(query, autoescape=True))
         if company:
-            stmt = stmt.where(Investor.company.contains(company))
+            stmt = stmt.where(Investor.company.icontains(company, autoescape=True))
         if source:
             stmt = stmt.where(Investor.source == source)
 
@@ -258,16 +476,38 @@ class InvestorRepository:
         investor_id: int,
         page_number: int = 0
     ) -> ConversationInvestor:
-        """Link investor to a conversation."""
+        """
+        Link investor to a conversation. Nothing is flushed: sessions run
+        with autoflush off, so queries won't see the link until the caller
+        flushes or commits.
+        """
         link = ConversationInvestor(
             conversation_id=conversation_id,
             investor_id=investor_id,
             page_number=page_number
         )
         self.session.add(link)
-        await self.session.flush()
         return link
 
+    async def add_many_to_conversation(
+        self,
+        conversation_id: str,
+        investor_ids: List[int],
+        page_number: int = 0
+    ) -> None:
+        """
+        Link investors to a conversation in one statement. Investors that
+        are already linked keep their original page.
+        """
+        await ConversationInvestor.bulk_insert(self.session, [
+            {
+                "conversation_id": conversation_id,
+                "investor_id": investor_id,
+                "page_number": page_number
+            }
+            for investor_id in dict.fromkeys(investor_ids)
+        ])
+
     async def get_for_conversation(
         self,
         conversation_id: str,
@@ -301,21 +541,32 @@ class SearchResultRepository:
         self,
         conversation_id: str,
         results: List[SearchResult]
-    ) -> List[SearchResultRecord]:
-        """Add multiple search results to a conversation."""
-        records = []
-        for r in results:
-            record = SearchResultRecord(
-                conversation_id=conversation_id,
-                title=r.title,
-                url=r.url,
-                snippet=r.snippet
+    ) -> None:
+        """Add search results to a conversation, ignoring duplicate URLs."""
+        if (len(results) >= COPY_THRESHOLD
+                and self.session.get_bind().dialect.driver == "asyncpg"):
+            await _bulk_copy(
+                self.session,
+                SearchResultRecord.__tablename__,
+                ("conversation_id", "title", "url", "snippet"),
+                [
+                    (conversation_id, r.title, r.url,
+                     compress_text(r.snippet) if r.snippet is not None else None)
+                    for r in results
+                ],
+                conflict_columns=("conversation_id", "url")
             )
-            self.session.add(record)
-            records.append(record)
-
-        await self.session.flush()
-        return records
+            return
+
+        await SearchResultRecord.bulk_insert(self.session, [
+            {
+                "conversation_id": conversation_id,
+                "title": r.title,
+                "url": r.url,
+                "snippet": r.snippet
+            }
+            for r in results
+        ])
 
     async def get_for_conversation(
         self,
@@ -332,6 +583,19 @@ class SearchResultRepository:
         result = await self.session.execute(stmt)
         return list(result.scalars().all())
 
+    async def stream_for_conversation(
+        self,
+        conversation_id: str
+    ) -> AsyncIterator[SearchResultRecord]:
+        """Yield all search results for a conversation, newest first."""
+        stmt = (
+            select(SearchResultRecord)
+            .where(SearchResultRecord.conversation_id == conversation_id)
+            .order_by(SearchResultRecord.created_at.desc())
+        )
+        async for record in await self.session.stream_scalars(stmt):
+            yield record
+
 
 class UsageRepository:
     """
@@ -363,31 +627,71 @@ class UsageRepository:
         )
         self.session.add(usage)
         await self.session.flush()
+        await self._add_to_hourly([{
+            "provider_type": provider_type,
+            "provider_name": provider_name,
+            "tokens_used": tokens_used,
+            "response_time_ms": response_time_ms,
+            "success": success,
+            "timestamp": usage.timestamp
+        }])
         return usage
 
+    async def record_many(self, rows: List[Dict[str, Any]]) -> None:
+        """Record many usage events (ProviderUsage column dicts) at once."""
+        if not rows:
+            return
+        await self.session.execute(insert(ProviderUsage), rows)
+        await self._add_to_hourly(rows)
+
+    async def _add_to_hourly(self, rows: List[Dict[str, Any]]) -> None:
+        """Fold usage events into their ProviderUsageHourly buckets."""
+        buckets: Dict[tuple, Dict[str, Any]] = {}
+        for row in rows:
+            hour = row["timestamp"].replace(minute=0, second=0, microsecond=0)
+            key = (row["provider_type"], row["provider_name"], hour)
+            bucket = buckets.get(key)
+            if bucket is None:
+                bucket = buckets[key] = {
+                    "provider_type": key[0], "provider_name": key[1],
+                    "bucket_hour": hour, "requests": 0, "errors": 0,
+                    "tokens": 0, "timed_requests": 0, "sum_ms": 0
+                }
+            bucket["requests"] += 1
+            bucket["errors"] += 0 if row.get("success", True) else 1
+            bucket["tokens"] += row.get("tokens_used") or 0
+            response_ms = row.get("response_time_ms")
+            if response_ms is not None:
+                bucket["timed_requests"] += 1
+                bucket["sum_ms"] += response_ms
+
+        await ProviderUsageHourly.add_counts(self.session, list(buckets.values()))
+
     async def get_stats(
         self,
         provider_type: Optional[str] = None,
         provider_name: Optional[str] = None,
         since: Optional[datetime] = None
     ) -> Dict[str, Any]:
-        """Get usage statistics."""
+        """
+        Get usage statistics from the hourly rollup.
+        since is applied at hour resolution (its whole hour is included).
+        """
         stmt = select(
-            func.count(ProviderUsage.id).label('total_requests'),
-            func.sum(ProviderUsage.tokens_used).label('total_tokens'),
-            func.avg(ProviderUsage.response_time_ms).label(
-                'avg_response_time'),
-            func.sum(
-                func.cast(ProviderUsage.success == False, Integer)
-            ).label('error_count')
+            func.sum(ProviderUsageHourly.requests).label('total_requests'),
+            func.sum(ProviderUsageHourly.tokens).label('total_tokens'),
+            func.sum(ProviderUsageHourly.timed_requests).label('timed_requests'),
+            func.sum(ProviderUsageHourly.sum_ms).label('sum_ms'),
+            func.sum(ProviderUsageHourly.errors).label('error_count')
         )
 
         if provider_type:
-            stmt = stmt.where(ProviderUsage.provider_type == provider_type)
+            stmt = stmt.where(ProviderUsageHourly.provider_type == provider_type)
         if provider_name:
-            stmt = stmt.where(ProviderUsage.provider_name == provider_name)
+            stmt = stmt.where(ProviderUsageHourly.provider_name == provider_name)
         if since:
-            stmt = stmt.where(ProviderUsage.timestamp >= since)
+            stmt = stmt.where(ProviderUsageHourly.bucket_hour >= since.replace(
+                minute=0, second=0, microsecond=0))
 
         result = await self.session.execute(stmt)
         row = result.one()
@@ -395,6 +699,68 @@ class UsageRepository:
         return {
             'total_requests': row.total_requests or 0,
             'total_tokens': row.total_tokens or 0,
-            'avg_response_time_ms': float(row.avg_response_time or 0),
+            'avg_response_time_ms': (
+                row.sum_ms / row.timed_requests if row.timed_requests else 0.0),
             'error_count': row.error_count or 0
         }
+
+    async def rollup_day(self, day: date) -> int:
+        """
+        Aggregate one UTC day of usage into ProviderUsageDaily.
+
+        Re-running for the same day replaces its rollup rows.
+        Returns the number of rollup rows written.
+        """
+        start = datetime.combine(day, time.min)
+        end = start + timedelta(days=1)
+        in_day = (ProviderUsage.timestamp >= start, ProviderUsage.timestamp < end)
+        provider = (ProviderUsage.provider_type, ProviderUsage.provider_name)
+
+        totals = await self.session.execute(
+            select(
+                *provider,
+                func.count().label("request_count"),
+                func.count().filter(
+                    ProviderUsage.success.is_(False)).label("error_count"),
+                func.coalesce(func.sum(ProviderUsage.tokens_used), 0).label(
+                    "tokens_used"),
+                func.avg(ProviderUsage.response_time_ms).label(
+                    "avg_response_time_ms")
+            )
+            .where(*in_day)
+            .group_by(*provider)
+        )
+
+        # Percentiles need the individual times, already sorted per provider
+        timings = await self.session.execute(
+            select(*provider, ProviderUsage.response_time_ms)
+            .where(*in_day, ProviderUsage.response_time_ms.is_not(None))
+            .order_by(*provider, ProviderUsage.response_time_ms)
+        )
+        times: Dict[tuple, List[int]] = {}
+        for provider_type, provider_name, response_ms in timings:
+            times.setdefault((provider_type, provider_name), []).append(response_ms)
+
+        await self.session.execute(
+            delete(ProviderUsageDaily).where(ProviderUsageDaily.day == day))
+
+        rows = []
+        for row in totals:
+            provider_times = times.get((row.provider_type, row.provider_name), [])
+            rows.append({
+                "day": day,
+                **row._asdict(),
+                "p50_response_time_ms": _percentile(provider_times, 50),
+                "p95_response_time_ms": _percentile(provider_times, 95),
+            })
+        if rows:
+            await self.session.execute(insert(ProviderUsageDaily), rows)
+        return len(rows)
+
+
+def _percentile(sorted_values: List[int], pct: int) -> Optional[int]:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    rank = max(1, -(-pct * len(sorted_values) // 100))
+    return sorted_values[rank - 1]
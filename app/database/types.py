@@ -0,0 +1,79 @@
+"""
+Custom column types for database models.
+"""
+
+from typing import Optional
+import zlib
+
+from sqlalchemy import LargeBinary
+from sqlalchemy.types import TypeDecorator
+
+try:  # Optional faster/better codec; falls back to zlib from the stdlib
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# One-byte codec marker at the start of every stored value. Text never
+# starts with these control bytes, so legacy plaintext rows still decode.
+_RAW = b"\x00"
+_ZSTD = b"\x01"
+_ZLIB = b"\x02"
+
+COMPRESS_THRESHOLD = 256
+
+_zstd_compressor = zstandard.ZstdCompressor(level=3) if zstandard else None
+_zstd_decompressor = zstandard.ZstdDecompressor() if zstandard else None
+
+
+def compress_text(value: str) -> bytes:
+    """Encode text, compressing it when that actually saves space."""
+    data = value.encode("utf-8")
+    if len(data) < COMPRESS_THRESHOLD:
+        return _RAW + data
+
+    if _zstd_compressor is not None:
+        packed = _ZSTD + _zstd_compressor.compress(data)
+    else:
+        packed = _ZLIB + zlib.compress(data, 6)
+    return packed if len(packed) < len(data) + 1 else _RAW + data
+
+
+def decompress_text(value) -> str:
+    """Decode a value written by compress_text, or a legacy plaintext row."""
+    if isinstance(value, str):
+        return value
+
+    data = bytes(value)
+    marker, payload = data[:1], data[1:]
+    if marker == _RAW:
+        return payload.decode("utf-8")
+    if marker == _ZSTD:
+        if _zstd_decompressor is None:
+            raise RuntimeError(
+                "zstandard is required to read zstd-compressed rows")
+        return _zstd_decompressor.decompress(payload).decode("utf-8")
+    if marker == _ZLIB:
+        return zlib.decompress(payload).decode("utf-8")
+    return data.decode("utf-8")
+
+
+class CompressedText(TypeDecorator):
+    """
+    Text stored as a compressed blob.
+
+    Values over COMPRESS_THRESHOLD bytes are zstd-compressed (zlib if
+    zstandard isn't installed); shorter ones are stored as-is.
+    """
+
+    impl = LargeBinary
+    cache_ok = True
+
+    def process_bind_param(self, value: Optional[str], dialect) -> Optional[bytes]:
+        if value is None:
+            return None
+        return compress_text(value)
+
+    def process_result_value(self, value, dialect) -> Optional[str]:
+        if value is None:
+            return None
+        return decompress_text(value)
@@ -0,0 +1,146 @@
+"""
+Background writer for provider usage rows.
+
+Usage logging is telemetry, so it stays off the request path: callers
+enqueue a row and return, and a background task writes rows in batches.
+Rows still queued when the process dies are lost.
+"""
+
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+import asyncio
+import logging
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.database.repositories import UsageRepository
+
+logger = logging.getLogger(__name__)
+
+
+class UsageSink:
+    """
+    Queue of ProviderUsage rows drained by a background task.
+
+    A batch is written when batch_size rows are waiting or flush_interval
+    seconds after the first row of the batch arrived, whichever is first.
+    """
+
+    def __init__(
+        self,
+        batch_size: int = 200,
+        flush_interval: float = 0.5,
+        max_pending: int = 10_000
+    ):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self._session_factory: Optional[async_sessionmaker[AsyncSession]] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._batch_ready: Optional[asyncio.Event] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._flushing = False
+
+    @property
+    def running(self) -> bool:
+        """Whether the background writer is accepting rows."""
+        return self._worker is not None and not self._worker.done()
+
+    def start(self, session_factory: async_sessionmaker[AsyncSession]) -> None:
+        """Start the background writer on the running loop."""
+        if self.running:
+            return
+        self._session_factory = session_factory
+        self._queue = asyncio.Queue(maxsize=self.max_pending)
+        self._batch_ready = asyncio.Event()
+        self._worker = asyncio.get_running_loop().create_task(
+            self._run_worker(self._queue))
+
+    def record(
+        self,
+        provider_type: str,
+        provider_name: str,
+        conversation_id: Optional[str] = None,
+        tokens_used: Optional[int] = None,
+        response_time_ms: Optional[int] = None,
+        success: bool = True,
+        error_message: Optional[str] = None
+    ) -> None:
+        """Queue a usage row and return immediately."""
+        if not self.running:
+            logger.debug("Usage sink not running, dropping usage row")
+            return
+
+        row: Dict[str, Any] = {
+            "provider_type": provider_type,
+            "provider_name": provider_name,
+            "conversation_id": conversation_id,
+            "tokens_used": tokens_used,
+            "response_time_ms": response_time_ms,
+            "success": success,
+            "error_message": error_message,
+            # Stamp now; the database default would record the flush time
+            "timestamp": datetime.now(timezone.utc).replace(tzinfo=None),
+        }
+        try:
+            self._queue.put_nowait(row)
+        except asyncio.QueueFull:
+            logger.warning("Usage queue full, dropping usage row")
+            return
+
+        if self._queue.qsize() >= self.batch_size:
+            self._batch_ready.set()
+
+    async def _run_worker(self, queue: asyncio.Queue) -> None:
+        """Collect rows into batches and write them."""
+        while True:
+            first = await queue.get()
+            if not self._flushing and queue.qsize() + 1 < self.batch_size:
+                try:
+                    await asyncio.wait_for(
+                        self._batch_ready.wait(), self.flush_interval)
+                except asyncio.TimeoutError:
+                    pass
+            self._batch_ready.clear()
+
+            batch = [first]
+            while len(batch) < self.batch_size and not queue.empty():
+                batch.append(queue.get_nowait())
+
+            try:
+                await self._write(batch)
+            except Exception as e:
+                logger.error("Failed to write %d usage rows: %s", len(batch), e)
+            finally:
+                for _ in batch:
+                    queue.task_done()
+
+    async def _write(self, batch: list) -> None:
+        """Insert one batch and update the hourly rollup."""
+        async with self._session_factory() as session:
+            await UsageRepository(session).record_many(batch)
+            await session.commit()
+
+    async def flush(self) -> None:
+        """Write every queued row now."""
+        if self.running:
+            self._flushing = True
+            self._batch_ready.set()
+            try:
+                await self._queue.join()
+            finally:
+                self._flushing = False
+
+    async def stop(self) -> None:
+        """Write pending rows, then stop the background writer."""
+        await self.flush()
+        if self._worker is not None:
+            if not self._worker.get_loop().is_closed():
+                self._worker.cancel()
+            self._worker = None
+            self._queue = None
+            self._batch_ready = None
+
+
+# Global usage sink instance
+usage_sink = UsageSink()
@@ -9,7 +9,7 @@ from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse, JSONResponse
+from fastapi.responses import FileResponse, JSONResponse, ORJSONResponse
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.util import get_remote_address
 from slowapi.middleware import SlowAPIMiddleware
@@ -17,12 +17,18 @@ from slowapi.errors import RateLimitExceeded
 
 from app.config import get_settings
 from app.routes import chat_router, export_router, auth_router
-from app.core.providers import registry
+from app.core.providers import registry, warmup
+from app.core.events import event_bus
 from app.core.exceptions import AppException
-from app.database import init_db, close_db
+from app.database import init_db, close_db, db_manager, usage_sink
 
-# Import providers to register them
-import app.providers  # noqa: F401
+try:  # Optional faster JSON encoder for responses; stdlib json otherwise
+    import orjson
+except ImportError:
+    orjson = None
+
+# Providers are registered lazily in app.core.providers; a provider module
+# (and its SDK) is imported the first time that provider is looked up.
 
 
 # Configure logging
@@ -54,13 +60,22 @@ async def lifespan(app: FastAPI):
     # Initialize database
     logger.info("📦 Initializing database...")
     await init_db()
+    # Request-scoped dependencies read these instead of going through db_manager
+    app.state.session_factory = db_manager.session_factory
+    app.state.read_session_factory = db_manager.read_session_factory
+    usage_sink.start(db_manager.session_factory)
     logger.info("✅ Database initialized")
 
+    if settings.warmup_providers:
+        await warmup(settings)
+
     yield
 
     # Shutdown
     logger.info("👋 Shutting down...")
+    await event_bus.shutdown()
     await registry.cleanup_all()
+    await usage_sink.stop()
     await close_db()
     logger.info("✅ Cleanup complete")
 
@@ -73,6 +88,7 @@ app = FastAPI(
     lifespan=lifespan,
     docs_url="/docs" if settings.debug else None,
     redoc_url="/redoc" if settings.debug else None,
+    default_response_class=ORJSONResponse if orjson else JSONResponse,
 )
 app.state.limiter = limiter
 app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
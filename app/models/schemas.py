@@ -6,6 +6,7 @@ from pydantic import BaseModel, Field, field_validator
 from typing import Optional, List, Dict, Any
 from datetime import datetime
 from enum import Enum
+import uuid
 
 
 class MessageRole(str, Enum):
@@ -32,8 +33,9 @@ class InvestorProfile(BaseModel):
     source: str = "web_search"
     created_at: datetime = Field(default_factory=datetime.utcnow)
 
-    class Config:
-        json_schema_extra = {
+    model_config = {
+        "frozen": True,
+        "json_schema_extra": {
             "example": {
                 "name": "John Doe",
                 "title": "Partner",
@@ -42,6 +44,7 @@ class InvestorProfile(BaseModel):
                 "investment_focus": ["health", "ai"]
             }
         }
+    }
 
 
 class SearchResult(BaseModel):
@@ -52,6 +55,10 @@ class SearchResult(BaseModel):
     snippet: str
     relevance_score: Optional[float] = None
 
+    model_config = {
+        "frozen": True
+    }
+
 
 class ChatMessage(BaseModel):
     """Chat message model."""
@@ -61,6 +68,10 @@ class ChatMessage(BaseModel):
     timestamp: datetime = Field(default_factory=datetime.utcnow)
     metadata: Dict[str, Any] = Field(default_factory=dict)
 
+    model_config = {
+        "frozen": True
+    }
+
 
 class ChatRequest(BaseModel):
     """Chat request from user."""
@@ -76,6 +87,16 @@ class ChatRequest(BaseModel):
             raise ValueError("Message cannot be empty")
         return v.strip()
 
+    @field_validator("conversation_id")
+    @classmethod
+    def conversation_id_is_uuid(cls, v: Optional[str]) -> Optional[str]:
+        if v is None:
+            return v
+        try:
+            return str(uuid.UUID(v))
+        except ValueError:
+            raise ValueError("conversation_id must be a UUID")
+
     model_config = {
         "protected_namespaces": ()
     }
@@ -1,9 +1,9 @@
 """
 Providers package.
-Import all provider modules to register them with the registry.
+Provider classes are imported lazily; the registry knows their import paths.
 """
 
-# Import provider modules to trigger registration
+# Subpackages only; no provider SDK is imported here
 from app.providers import llm
 from app.providers import search
 from app.providers import scraper
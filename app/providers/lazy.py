@@ -0,0 +1,33 @@
+"""
+Lazy class exports for the provider subpackages.
+
+Each subpackage lists its providers as AVAILABLE: name -> "module:Class".
+The registry registers these lazily, and the classes are imported on first
+attribute access (PEP 562), so importing a package doesn't pull in every
+provider's SDK.
+"""
+
+from typing import Any, Callable, Dict, List
+import importlib
+
+
+def class_names(available: Dict[str, str]) -> List[str]:
+    """Class names exported by a package's AVAILABLE table."""
+    return [path.rpartition(":")[2] for path in available.values()]
+
+
+def make_lazy_getattr(
+    package: str,
+    available: Dict[str, str]
+) -> Callable[[str], Any]:
+    """Build a module __getattr__ that imports AVAILABLE classes on demand."""
+    classes = {path.rpartition(":")[2]: path for path in available.values()}
+
+    def __getattr__(name: str) -> Any:
+        path = classes.get(name)
+        if path is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        module, _, attr = path.partition(":")
+        return getattr(importlib.import_module(module), attr)
+
+    return __getattr__
@@ -1,10 +1,15 @@
 """
 LLM Providers package.
-Import all providers here to register them with the registry.
 """
 
-from app.providers.llm.gemini import GeminiProvider
-from app.providers.llm.openai_provider import OpenAIProvider
-from app.providers.llm.anthropic import AnthropicProvider
+from app.providers.lazy import class_names, make_lazy_getattr
 
-__all__ = ["GeminiProvider", "OpenAIProvider", "AnthropicProvider"]
+# Provider name -> "module:Class", imported on first use
+AVAILABLE = {
+    "gemini": "app.providers.llm.gemini:GeminiProvider",
+    "openai": "app.providers.llm.openai_provider:OpenAIProvider",
+    "anthropic": "app.providers.llm.anthropic:AnthropicProvider",
+}
+
+__all__ = class_names(AVAILABLE)
+__getattr__ = make_lazy_getattr(__name__, AVAILABLE)
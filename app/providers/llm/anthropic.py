@@ -5,12 +5,13 @@ Uses the same structured prompt as other providers for consistency.
 
 import logging
 import os
-from typing import List, Optional, Dict, Any, AsyncIterator
+from typing import List, Optional, Dict, Any, AsyncIterator, Tuple
 
 from app.core.protocols import LLMConfig, ProviderMixin
 from app.core.providers import register
 from app.core.exceptions import LLMProviderError, ConfigurationError
-from app.models import ChatMessage
+from app.models import ChatMessage, MessageRole
+from app.providers.llm.prompts import DEFAULT_SYSTEM_PROMPT
 
 logger = logging.getLogger(__name__)
 
@@ -21,31 +22,15 @@ class AnthropicProvider(ProviderMixin):
     Anthropic Claude LLM provider implementation.
     """
 
-    DEFAULT_SYSTEM_PROMPT = """You are a concise, factual startup investor finder assistant.
-
-Goals:
-1) Understand the startup’s sector + stage + location preference (use user/location context if provided; otherwise prefer US/major hubs but do NOT fabricate location filters).
-2) List up to 10 investors per response, with clear pagination: if more exist, state how many remain and ask the user to say "more" or "show more investors" to continue.
-3) For each investor, show: Name, Title, Company, Location, Investment Focus, Bio (max ~2 sentences), LinkedIn URL. Do not invent missing fields; leave them blank/omit if unknown.
-4) Keep tone professional, non-salesy, and action-oriented.
-5) If the user’s message language is not English, respond in that language; otherwise default to English. Keep investor data as-is.
-
-Output format (markdown list):
-1. **Name**
-   Title @ Company
-   Location: <city/region or "—" if unknown>
-   Focus: tag1, tag2 (omit if unknown)
-   Bio: short, 1–2 sentences
-   LinkedIn: URL (omit if unknown)
-
-Rules:
-- Never show more than 10 investors in one response.
-- Do not promise future actions; share what you have now.
-- Highlight remaining count if more investors are available.
-- Keep paragraphs short (max 2–3 sentences overall).
-- Respect user location if given; otherwise US-first but not US-only.
-- Be explicit and avoid filler phrases.
-"""
+    DEFAULT_SYSTEM_PROMPT = DEFAULT_SYSTEM_PROMPT
+
+    # Built once; the static prompt is marked as a cacheable prefix so only
+    # the per-request context after it is processed on a cache hit
+    DEFAULT_SYSTEM_BLOCK = {
+        "type": "text",
+        "text": DEFAULT_SYSTEM_PROMPT,
+        "cache_control": {"type": "ephemeral"}
+    }
 
     def __init__(self, config: Optional[LLMConfig] = None):
         self.config = config or LLMConfig(
@@ -58,9 +43,15 @@ Rules:
         self._initialized = False
 
     @property
-    def provider_name(self) -> str:
+    def name(self) -> str:
+        """Provider name for Protocol compliance."""
         return "anthropic"
 
+    @property
+    def provider_name(self) -> str:
+        """Backward compatible property."""
+        return self.name
+
     async def initialize(self) -> None:
         """Initialize Anthropic client."""
         if self._initialized:
@@ -74,7 +65,10 @@ Rules:
                     "ANTHROPIC_API_KEY not found in environment variables"
                 )
 
-            self._client = AsyncAnthropic(api_key=api_key)
+            self._client = AsyncAnthropic(
+                api_key=api_key,
+                http_client=self.config.extra_params.get("http_client")
+            )
             self._initialized = True
             logger.info(
                 f"Anthropic provider initialized with model: {self.config.model_name}")
@@ -93,51 +87,48 @@ Rules:
         self,
         messages: List[ChatMessage],
         context: Optional[Dict[str, Any]] = None
-    ) -> List[Dict[str, str]]:
-        """Build Anthropic message format."""
-        system_content = self.config.system_prompt or self.DEFAULT_SYSTEM_PROMPT
-
-        # Include lightweight context inline in the system message
+    ) -> Tuple[List[Dict[str, Any]], List[Dict[str, str]]]:
+        """Build Anthropic system blocks and message list."""
+        if self.config.system_prompt:
+            system = [{
+                "type": "text",
+                "text": self.config.system_prompt,
+                "cache_control": {"type": "ephemeral"}
+            }]
+        else:
+            system = [self.DEFAULT_SYSTEM_BLOCK]
+
+        # Include lightweight context after the cached prefix
+        suffix = []
         if context:
             if context.get("sectors_discussed"):
-                system_content += f"\n\nSectors discussed: {', '.join(context['sectors_discussed'])}"
+                suffix.append(f"Sectors discussed: {', '.join(context['sectors_discussed'])}")
             if context.get("investors"):
-                system_content += f"\n\nInvestors in context: {len(context['investors'])} (show at most 10)."
-
-        claude_messages = [{"role": "system", "content": system_content}]
-        for msg in messages:
-            claude_messages.append({
-                "role": msg.role.value,
-                "content": msg.content
-            })
-        return claude_messages
+                suffix.append(f"Investors in context: {len(context['investors'])} (show at most 10).")
+
+        # System-role messages are rare, so only rescan when one was skipped
+        claude_messages = [
+            {"role": role.value, "content": msg.content}
+            for msg in messages
+            if (role := msg.role) is not MessageRole.SYSTEM
+        ]
+        if len(claude_messages) < len(messages):
+            suffix.extend(
+                msg.content for msg in messages if msg.role is MessageRole.SYSTEM)
+
+        if suffix:
+            system = [*system, {"type": "text", "text": "\n\n".join(suffix)}]
+        return system, claude_messages
 
     async def generate_response(
         self,
         messages: List[ChatMessage],
         context: Optional[Dict[str, Any]] = None
     ) -> str:
-        """Generate a response from Anthropic."""
-        if not self._initialized or not self._client:
-            await self.initialize()
-
-        try:
-            claude_messages = self._build_messages(messages, context)
-            resp = await self._client.messages.create(
-                model=self.config.model_name or "claude-3-sonnet-20240229",
-                messages=claude_messages,
-                max_tokens=self.config.max_tokens,
-                temperature=self.config.temperature
-            )
-            # Anthropic returns content as a list of blocks
-            return "".join(block.text for block in resp.content if hasattr(block, "text"))
-        except Exception as e:
-            logger.error(f"Anthropic generation error: {e}")
-            raise LLMProviderError(
-                message=f"Generation failed: {str(e)}",
-                provider="anthropic",
-                original_error=e
-            )
+        """Generate a response from Anthropic by collecting the stream."""
+        return "".join([
+            chunk async for chunk in self.generate_stream(messages, context)
+        ])
 
     async def generate_stream(
         self,
@@ -149,16 +140,17 @@ Rules:
             await self.initialize()
 
         try:
-            claude_messages = self._build_messages(messages, context)
+            system, claude_messages = self._build_messages(messages, context)
             async with self._client.messages.stream(
                 model=self.config.model_name or "claude-3-sonnet-20240229",
+                system=system,
                 messages=claude_messages,
                 max_tokens=self.config.max_tokens,
                 temperature=self.config.temperature
             ) as stream:
-                async for event in stream:
-                    if hasattr(event, "text") and event.text:
-                        yield event.text
+                async for text in stream.text_stream:
+                    if text:
+                        yield text
         except Exception as e:
             logger.error(f"Anthropic streaming error: {e}")
             raise LLMProviderError(
@@ -4,18 +4,83 @@ Modern Protocol-based approach with backward compatibility.
 """
 
 import asyncio
-import google.generativeai as genai
-from typing import List, Optional, Dict, Any, AsyncIterator
+from collections import OrderedDict
+from typing import (
+    List, Optional, Dict, Any, AsyncIterator, Callable, NamedTuple, Tuple
+)
 import logging
 
+from pydantic_core import to_json
+
 from app.core.protocols import LLMConfig, ProviderMixin
 from app.core.providers import register
 from app.core.exceptions import LLMProviderError
-from app.models import ChatMessage, MessageRole
+from app.models import ChatMessage, InvestorProfile, MessageRole, SearchResult
+from app.providers.llm.prompts import DEFAULT_SYSTEM_PROMPT
 from app.config import get_settings
 
 logger = logging.getLogger(__name__)
 
+# Conversation summaries kept before the least recently used is dropped
+MAX_SUMMARIES = 1000
+# Conversations whose built prompt is kept between turns
+PROMPT_CACHE_SIZE = 256
+# Rendered investor blocks and search result lines kept before the cache
+# is reset
+RENDER_CACHE_SIZE = 2048
+# Most recent messages always sent verbatim. Older ones are folded into the
+# summary once more than twice this many are pending, so the summarization
+# call runs once every HISTORY_KEEP_MESSAGES messages, not on every turn
+HISTORY_KEEP_MESSAGES = 6
+# Temperature for the history summarization call
+SUMMARY_TEMPERATURE = 0.3
+
+SUMMARY_PROMPT = """Summarize this startup investor search conversation for \
+your own later reference. Keep the startup's sector, stage and location, \
+the investors already shown and any preferences the user stated. \
+At most 150 words, plain text."""
+
+
+def _short_bio(bio: str) -> str:
+    return bio[:200] + "..." if len(bio) > 200 else bio
+
+
+# Investor fields sent to the model as compact JSON, one object per line:
+# (attribute, key, format). Empty fields are left out.
+_INVESTOR_FIELDS: Tuple[Tuple[str, str, Callable[[Any], Any]], ...] = (
+    ("name", "n", str),
+    ("title", "t", str),
+    ("company", "c", str),
+    ("location", "l", str),
+    ("bio", "b", _short_bio),
+    ("investment_focus", "f", list),
+    ("linkedin_url", "u", str),
+)
+_INVESTOR_KEYS = ("one JSON object per line; n=name, t=title, c=company, "
+                  "l=location, b=bio, f=investment focus, u=LinkedIn URL")
+
+
+# API key the SDK's process-wide configuration was last set with
+_configured_key: Optional[str] = None
+
+
+def _configure_genai(genai: Any, api_key: Optional[str]) -> None:
+    """Configure the SDK once per process, again only if the key changes."""
+    global _configured_key
+    if _configured_key != api_key:
+        genai.configure(api_key=api_key)
+        _configured_key = api_key
+
+
+class _PromptCache(NamedTuple):
+    """Prompt pieces kept for one conversation between turns."""
+    key: tuple
+    prefix: str
+    history: Tuple[ChatMessage, ...]
+    history_text: str
+    summary: Optional[str]
+    prompt: str
+
 
 @register("llm", "gemini")
 class GeminiProvider(ProviderMixin):
@@ -26,38 +91,20 @@ class GeminiProvider(ProviderMixin):
     Uses ProviderMixin for common functionality.
     """
 
-    # Default system prompt for investor finding
-    DEFAULT_SYSTEM_PROMPT = """You are a concise, factual startup investor finder assistant.
-
-Goals:
-1) Understand the startup’s sector + stage + location preference (use user/location context if provided; otherwise prefer US/major hubs but do NOT fabricate location filters).
-2) List up to 10 investors per response, with clear pagination: if more exist, state how many remain and ask the user to say "more" or "show more investors" to continue.
-3) For each investor, show: Name, Title, Company, Location, Investment Focus, Bio (max ~2 sentences), LinkedIn URL. Do not invent missing fields; leave them blank/omit if unknown.
-4) Keep tone professional, non-salesy, and action-oriented.
-5) If the user’s message language is not English, respond in that language; otherwise default to English. Keep investor data as-is.
-
-Output format (markdown list):
-1. **Name**
-   Title @ Company
-   Location: <city/region or "—" if unknown>
-   Focus: tag1, tag2 (omit if unknown)
-   Bio: short, 1–2 sentences
-   LinkedIn: URL (omit if unknown)
-
-Rules:
-- Never show more than 10 investors in one response.
-- Do not promise future actions; share what you have now.
-- Highlight remaining count if more investors are available.
-- Keep paragraphs short (max 2–3 sentences overall).
-- Respect user location if given; otherwise US-first but not US-only.
-- Be explicit and avoid filler phrases.
-"""
+    DEFAULT_SYSTEM_PROMPT = DEFAULT_SYSTEM_PROMPT
 
     def __init__(self, config: LLMConfig):
         super().__init__()  # Initialize ProviderMixin
         self._config = config
         self._model = None
-        self._chat_sessions: Dict[str, Any] = {}
+        self._max_summaries: int = config.extra_params.get(
+            "max_summaries", MAX_SUMMARIES)
+        self._prompt_cache: Dict[str, _PromptCache] = {}
+        self._rendered: Dict[int, Tuple[Any, str]] = {}
+        self._history_keep_messages: int = config.extra_params.get(
+            "history_keep_messages", HISTORY_KEEP_MESSAGES)
+        # Rolling summary per conversation: (last summarized message, text)
+        self._summaries: OrderedDict[str, Tuple[ChatMessage, str]] = OrderedDict()
 
     @property
     def name(self) -> str:
@@ -76,8 +123,10 @@ Rules:
     async def initialize(self) -> None:
         """Initialize Gemini API."""
         try:
-            settings = get_settings()
-            genai.configure(api_key=settings.gemini_api_key)
+            # Imported here so the SDK only loads once Gemini is actually used
+            import google.generativeai as genai
+
+            _configure_genai(genai, get_settings().gemini_api_key)
 
             model_name = self._config.model_name or "gemini-pro"
             self._model = genai.GenerativeModel(model_name)
@@ -94,19 +143,29 @@ Rules:
                 original_error=e
             )
 
-    def _get_or_create_session(self, conversation_id: str) -> Any:
-        """Get or create a chat session."""
-        if conversation_id not in self._chat_sessions:
-            self._chat_sessions[conversation_id] = self._model.start_chat(
-                history=[])
-        return self._chat_sessions[conversation_id]
-
-    def _build_prompt(
-        self,
-        messages: List[ChatMessage],
-        context: Optional[Dict[str, Any]] = None
-    ) -> str:
-        """Build the prompt from messages and context with memory support."""
+    @staticmethod
+    def _context_key(context: Optional[Dict[str, Any]]) -> tuple:
+        """
+        Everything the prompt prefix is built from. Investors and search
+        results are frozen models, so comparing keys is an identity check
+        per item when the same objects are passed again.
+        """
+        if not context:
+            return ()
+        summary = context.get("conversation_summary") or {}
+        return (
+            tuple(summary.get("sectors_discussed") or ()),
+            summary.get("investors_found", 0),
+            tuple(context.get("sectors_discussed") or ()),
+            tuple(context.get("search_results") or ()),
+            tuple(context.get("investors") or ()),
+            context.get("total_investors"),
+            context.get("current_page", 0),
+            context.get("is_pagination", False),
+        )
+
+    def _build_prefix(self, context: Optional[Dict[str, Any]] = None) -> str:
+        """Build the system prompt and context block that precede the history."""
         parts = []
 
         # Add system prompt
@@ -133,9 +192,8 @@ Rules:
             search_results = context["search_results"]
             parts.append(
                 f"\n\n🔍 Web search results ({len(search_results)} results):")
-            for result in search_results[:15]:  # Show more results
-                parts.append(
-                    f"- {result.title}: {result.snippet[:150]}...")
+            # Show more results
+            parts.extend(map(self._render_result, search_results[:15]))
 
         # Add investors for this page (10 at a time)
         if context and context.get("investors"):
@@ -146,28 +204,13 @@ Rules:
 
             if is_pagination:
                 parts.append(
-                    f"\n\n👥 Next investors (page {current_page + 1}, showing {len(investors)} on this page, {total_count} total):")
+                    f"\n\n👥 Next investors (page {current_page + 1}, showing {len(investors)} on this page, {total_count} total; {_INVESTOR_KEYS}):")
             else:
                 parts.append(
-                    f"\n\n👥 Found investors (showing {len(investors)} on this page, {total_count} total):")
-
-            for inv in investors:  # Only current page investors
-                inv_info = f"\n### {inv.name}"
-                if inv.title:
-                    inv_info += f"\n   📌 Title: {inv.title}"
-                if inv.company:
-                    inv_info += f"\n   🏢 Company: {inv.company}"
-                if hasattr(inv, 'location') and inv.location:
-                    inv_info += f"\n   📍 Location: {inv.location}"
-                if hasattr(inv, 'bio') and inv.bio:
-                    bio_short = inv.bio[:200] + \
-                        "..." if len(inv.bio) > 200 else inv.bio
-                    inv_info += f"\n   📝 Bio: {bio_short}"
-                if hasattr(inv, 'investment_focus') and inv.investment_focus:
-                    inv_info += f"\n   🎯 Investment Focus: {', '.join(inv.investment_focus)}"
-                if inv.linkedin_url:
-                    inv_info += f"\n   🔗 LinkedIn: {inv.linkedin_url}"
-                parts.append(inv_info)
+                    f"\n\n👥 Found investors (showing {len(investors)} on this page, {total_count} total; {_INVESTOR_KEYS}):")
+
+            # Only current page investors
+            parts.extend(map(self._render_investor, investors))
 
             if total_count > len(investors):
                 remaining = total_count - (current_page + 1) * 10
@@ -175,14 +218,166 @@ Rules:
                     parts.append(
                         f"\n\n📢 {remaining} more investors available. If user says 'more' or 'show more investors', show next 10.")
 
-        # Add conversation history for context
-        parts.append("\n\n💬 Conversation history:")
-        for msg in messages:
-            role_label = "User" if msg.role == MessageRole.USER else "Assistant"
-            parts.append(f"{role_label}: {msg.content}")
-
         return "\n".join(parts)
 
+    def _render_cached(self, item: Any, render: Callable[[Any], str]) -> str:
+        """
+        Render a prompt block once per item object. Investors and search
+        results are frozen, so the text can't go stale; the object is kept
+        with its text so a recycled id() never matches.
+        """
+        cached = self._rendered.get(id(item))
+        if cached is not None and cached[0] is item:
+            return cached[1]
+        if len(self._rendered) >= RENDER_CACHE_SIZE:
+            self._rendered.clear()
+        text = render(item)
+        self._rendered[id(item)] = (item, text)
+        return text
+
+    def _render_investor(self, inv: InvestorProfile) -> str:
+        return self._render_cached(inv, self._investor_block)
+
+    def _render_result(self, result: SearchResult) -> str:
+        return self._render_cached(result, self._result_line)
+
+    @staticmethod
+    def _result_line(result: SearchResult) -> str:
+        return f"- {result.title}: {result.snippet[:150]}..."
+
+    @staticmethod
+    def _investor_block(inv: InvestorProfile) -> str:
+        """Render one investor as a compact JSON line, skipping empty fields."""
+        return to_json({key: fmt(value)
+                        for attr, key, fmt in _INVESTOR_FIELDS
+                        if (value := getattr(inv, attr))}).decode()
+
+    @staticmethod
+    def _history_line(msg: ChatMessage) -> str:
+        role_label = "User" if msg.role == MessageRole.USER else "Assistant"
+        return f"{role_label}: {msg.content}"
+
+    def _summarized(
+        self,
+        conversation_id: str,
+        messages: List[ChatMessage]
+    ) -> Tuple[Optional[str], int]:
+        """
+        Return the conversation's summary and the index of the first message
+        it doesn't cover. Without a summary, or if its last message is no
+        longer in the history, nothing is covered.
+        """
+        cached = self._summaries.get(conversation_id)
+        if cached is None:
+            return None, 0
+        self._summaries.move_to_end(conversation_id)
+        for i in range(len(messages) - 1, -1, -1):
+            if messages[i] == cached[0]:
+                return cached[1], i + 1
+        return None, 0
+
+    async def _summarize_old_turns(
+        self,
+        conversation_id: str,
+        messages: List[ChatMessage]
+    ) -> None:
+        """
+        Fold messages into the conversation's rolling summary once more than
+        2 * history_keep_messages are pending, keeping the last
+        history_keep_messages verbatim. Only the pending messages are sent,
+        along with the previous summary. On failure the summary is left as
+        is and the prompt carries the longer history.
+        """
+        keep = self._history_keep_messages
+        previous, start = self._summarized(conversation_id, messages)
+        if len(messages) - start <= 2 * keep:
+            return
+        older = messages[start:-keep]
+
+        parts = [SUMMARY_PROMPT]
+        if previous:
+            parts.append(f"Current summary:\n{previous}")
+        parts.append("New turns:\n" + "\n".join(
+            self._history_line(msg) for msg in older))
+        try:
+            response = await self._model.generate_content_async(
+                "\n\n".join(parts),
+                generation_config={"temperature": SUMMARY_TEMPERATURE},
+            )
+            summary = response.text.strip()
+        except Exception as e:
+            logger.warning(f"Gemini history summary failed: {e}")
+            return
+
+        self._summaries[conversation_id] = (older[-1], summary)
+        if len(self._summaries) > self._max_summaries:
+            self._summaries.popitem(last=False)
+
+    def _history_window(
+        self,
+        conversation_id: str,
+        messages: List[ChatMessage]
+    ) -> Tuple[Optional[str], List[ChatMessage]]:
+        """
+        Return the summary and the messages after it, which are sent
+        verbatim. Without a usable summary the whole history is sent.
+        """
+        summary, start = self._summarized(conversation_id, messages)
+        return summary, messages[start:]
+
+    def _build_prompt(
+        self,
+        messages: List[ChatMessage],
+        context: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """
+        Build the prompt from messages and context with memory support.
+
+        The context prefix and the rendered history are cached per
+        conversation: the prefix is reused while its inputs are unchanged,
+        and history only renders messages added since the last turn. A
+        retry with the same inputs gets the previous prompt back as is.
+        Messages covered by the rolling summary are replaced by it.
+        """
+        conversation_id = context.get(
+            "conversation_id", "default") if context else "default"
+        summary, messages = self._history_window(conversation_id, messages)
+        cached = self._prompt_cache.pop(conversation_id, None)
+
+        key = self._context_key(context)
+        history = tuple(messages)
+        if (cached is not None and cached.key == key
+                and cached.history == history and cached.summary == summary):
+            self._prompt_cache[conversation_id] = cached
+            return cached.prompt
+
+        if cached is not None and cached.key == key:
+            prefix = cached.prefix
+        else:
+            prefix = self._build_prefix(context)
+
+        seen = len(cached.history) if cached is not None else 0
+        if cached is not None and history[:seen] == cached.history:
+            new_lines = [self._history_line(msg) for msg in history[seen:]]
+            history_text = "\n".join(
+                [cached.history_text, *new_lines] if seen else new_lines)
+        else:
+            history_text = "\n".join(self._history_line(msg) for msg in history)
+
+        # Add conversation history for context; one join, no intermediates
+        frags = [prefix, "\n\n\n💬 Conversation history:"]
+        if summary:
+            frags += ["\n📜 Prior summary:\n", summary, "\n"]
+        if history:
+            frags += ["\n", history_text]
+        prompt = "".join(frags)
+
+        self._prompt_cache[conversation_id] = _PromptCache(
+            key, prefix, history, history_text, summary, prompt)
+        if len(self._prompt_cache) > PROMPT_CACHE_SIZE:
+            del self._prompt_cache[next(iter(self._prompt_cache))]
+        return prompt
+
     async def generate_response(
         self,
         messages: List[ChatMessage],
@@ -199,11 +394,11 @@ Rules:
             self.record_request()  # Track usage
             conversation_id = context.get(
                 "conversation_id", "default") if context else "default"
-            chat = self._get_or_create_session(conversation_id)
 
+            await self._summarize_old_turns(conversation_id, messages)
             prompt = self._build_prompt(messages, context)
-            response = chat.send_message(prompt)
-
+            # Stateless call: the prompt carries the history
+            response = await self._model.generate_content_async(prompt)
             return response.text
 
         except Exception as e:
@@ -231,22 +426,19 @@ Rules:
             self.record_request()  # Track usage
             conversation_id = context.get(
                 "conversation_id", "default") if context else "default"
-            chat = self._get_or_create_session(conversation_id)
 
+            await self._summarize_old_turns(conversation_id, messages)
             prompt = self._build_prompt(messages, context)
-            response = chat.send_message(prompt, stream=True)
 
-            # Gemini returns a sync iterator, yield chunks with delay for better UX
-            for chunk in response:
+            # Chunks are forwarded as the SDK delivers them; typing-effect
+            # pacing is opt-in via extra_params["pacing_ms"] (default off)
+            pacing = self._config.extra_params.get("pacing_ms", 0) / 1000
+            response = await self._model.generate_content_async(
+                prompt, stream=True)
+            async for chunk in response:
                 if chunk.text:
-                    # Split chunk into smaller pieces for smoother streaming effect
-                    text = chunk.text
-                    # Yield character by character for very smooth effect
-                    chunk_size = 3  # Characters per yield
-                    for i in range(0, len(text), chunk_size):
-                        yield text[i:i+chunk_size]
-                        # Delay for typing effect - 30ms per chunk
-                        await asyncio.sleep(0.03)
+                    yield chunk.text
+                    await asyncio.sleep(pacing)
 
         except Exception as e:
             self.record_error()
@@ -259,6 +451,8 @@ Rules:
 
     async def cleanup(self) -> None:
         """Cleanup resources."""
-        self._chat_sessions.clear()
+        self._prompt_cache.clear()
+        self._rendered.clear()
+        self._summaries.clear()
         self._state.initialized = False
         logger.info("Gemini provider cleaned up")
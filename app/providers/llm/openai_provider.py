@@ -4,17 +4,27 @@ Ready-to-use template for OpenAI integration.
 Uses modern Protocol-based architecture.
 """
 
-from typing import List, Optional, Dict, Any, AsyncIterator
+from typing import List, Optional, Dict, Any, AsyncIterator, Tuple, Union
+from collections import OrderedDict
 import logging
 import os
 
-from app.core.protocols import LLMProvider, LLMConfig, ProviderMixin
+from app.core.protocols import (
+    LLMProvider, LLMConfig, ProviderMixin, gather_responses
+)
 from app.core.providers import register
 from app.core.exceptions import LLMProviderError, ConfigurationError
 from app.models import ChatMessage, MessageRole
+from app.providers.llm.prompts import DEFAULT_SYSTEM_PROMPT
 
 logger = logging.getLogger(__name__)
 
+# Client-level retry and timeout; the shared HTTP client sets the pool size
+MAX_RETRIES = 2
+REQUEST_TIMEOUT = 30.0
+# Conversations whose system message is kept between requests
+SYSTEM_CACHE_SIZE = 256
+
 
 @register("llm", "openai")
 class OpenAIProvider(ProviderMixin):
@@ -27,31 +37,10 @@ class OpenAIProvider(ProviderMixin):
     3. Select 'openai' as model_provider in chat request
     """
 
-    DEFAULT_SYSTEM_PROMPT = """You are a concise, factual startup investor finder assistant.
-
-Goals:
-1) Understand the startup’s sector + stage + location preference (use user/location context if provided; otherwise prefer US/major hubs but do NOT fabricate location filters).
-2) List up to 10 investors per response, with clear pagination: if more exist, state how many remain and ask the user to say "more" or "show more investors" to continue.
-3) For each investor, show: Name, Title, Company, Location, Investment Focus, Bio (max ~2 sentences), LinkedIn URL. Do not invent missing fields; leave them blank/omit if unknown.
-4) Keep tone professional, non-salesy, and action-oriented.
-5) If the user’s message language is not English, respond in that language; otherwise default to English. Keep investor data as-is.
-
-Output format (markdown list):
-1. **Name**
-   Title @ Company
-   Location: <city/region or "—" if unknown>
-   Focus: tag1, tag2 (omit if unknown)
-   Bio: short, 1–2 sentences
-   LinkedIn: URL (omit if unknown)
-
-Rules:
-- Never show more than 10 investors in one response.
-- Do not promise future actions; share what you have now.
-- Highlight remaining count if more investors are available.
-- Keep paragraphs short (max 2–3 sentences overall).
-- Respect user location if given; otherwise US-first but not US-only.
-- Be explicit and avoid filler phrases.
-"""
+    DEFAULT_SYSTEM_PROMPT = DEFAULT_SYSTEM_PROMPT
+
+    # Process-wide SDK clients: api_key -> (http_client, AsyncOpenAI)
+    _clients: Dict[str, Tuple[Any, Any]] = {}
 
     def __init__(self, config: Optional[LLMConfig] = None):
         self.config = config or LLMConfig(
@@ -62,11 +51,19 @@ Rules:
         )
         self._client = None
         self._initialized = False
+        # Least recently used first: conversation_id -> (inputs, content)
+        self._system_cache: OrderedDict[str, Tuple[tuple, str]] = OrderedDict()
 
     @property
-    def provider_name(self) -> str:
+    def name(self) -> str:
+        """Provider name for Protocol compliance."""
         return "openai"
 
+    @property
+    def provider_name(self) -> str:
+        """Backward compatible property."""
+        return self.name
+
     async def initialize(self) -> None:
         """Initialize OpenAI client."""
         if self._initialized:
@@ -82,7 +79,8 @@ Rules:
                     "OPENAI_API_KEY not found in environment variables"
                 )
 
-            self._client = AsyncOpenAI(api_key=api_key)
+            self._client = self._shared_client(
+                AsyncOpenAI, api_key, self.config.extra_params.get("http_client"))
             self._initialized = True
 
             logger.info(
@@ -99,40 +97,81 @@ Rules:
                 original_error=e
             )
 
+    @classmethod
+    def _shared_client(cls, client_cls: type, api_key: str, http_client: Any) -> Any:
+        """
+        One AsyncOpenAI client per API key, shared by all instances so they
+        reuse its connection pool. It's replaced when instances are handed a
+        different HTTP client, e.g. after registry.cleanup_all() closed the
+        old one, so at most one client per key is ever kept.
+        """
+        cached = cls._clients.get(api_key)
+        if (cached is not None and cached[0] is http_client
+                and not getattr(http_client, "is_closed", False)):
+            return cached[1]
+
+        client = client_cls(
+            api_key=api_key,
+            max_retries=MAX_RETRIES,
+            timeout=REQUEST_TIMEOUT,
+            http_client=http_client
+        )
+        cls._clients[api_key] = (http_client, client)
+        return client
+
+    def _system_content(self, context: Optional[Dict[str, Any]]) -> str:
+        """
+        System prompt plus search results and investors. Cached per
+        conversation and rebuilt only when those inputs change; they're
+        frozen models, so the key comparison is cheap when the same
+        objects are passed again.
+        """
+        if not context:
+            return self.config.system_prompt or self.DEFAULT_SYSTEM_PROMPT
+
+        key = (
+            tuple((context.get("search_results") or ())[:5]),
+            tuple(context.get("investors") or ()),
+        )
+        conversation_id = context.get("conversation_id", "default")
+        cached = self._system_cache.get(conversation_id)
+        if cached is not None and cached[0] == key:
+            self._system_cache.move_to_end(conversation_id)
+            return cached[1]
+
+        parts = [self.config.system_prompt or self.DEFAULT_SYSTEM_PROMPT]
+        search_results, investors = key
+        if search_results:
+            parts.append("\n\nWeb search results:")
+            parts.extend(f"\n- {r.title}: {r.snippet}" for r in search_results)
+
+        if investors:
+            parts.append("\n\nInvestors found:")
+            for inv in investors:
+                parts.append(f"\n- {inv.name}")
+                if inv.title:
+                    parts.append(f" | {inv.title}")
+                if inv.company:
+                    parts.append(f" at {inv.company}")
+                if inv.email:
+                    parts.append(f" | Email: {inv.email}")
+
+        content = "".join(parts)
+        self._system_cache[conversation_id] = (key, content)
+        if len(self._system_cache) > SYSTEM_CACHE_SIZE:
+            self._system_cache.popitem(last=False)
+        return content
+
     def _build_messages(
         self,
         messages: List[ChatMessage],
         context: Optional[Dict[str, Any]] = None
     ) -> List[Dict[str, str]]:
         """Build OpenAI message format."""
-        openai_messages = []
-
-        # Add system message
-        system_content = self.config.system_prompt or self.DEFAULT_SYSTEM_PROMPT
-
-        # Add context to system message
-        if context:
-            if context.get("search_results"):
-                system_content += "\n\nWeb search results:"
-                for result in context["search_results"][:5]:
-                    system_content += f"\n- {result.title}: {result.snippet}"
-
-            if context.get("investors"):
-                system_content += "\n\nInvestors found:"
-                for inv in context["investors"]:
-                    inv_info = f"\n- {inv.name}"
-                    if inv.title:
-                        inv_info += f" | {inv.title}"
-                    if inv.company:
-                        inv_info += f" at {inv.company}"
-                    if inv.email:
-                        inv_info += f" | Email: {inv.email}"
-                    system_content += inv_info
-
-        openai_messages.append({
+        openai_messages = [{
             "role": "system",
-            "content": system_content
-        })
+            "content": self._system_content(context)
+        }]
 
         # Add conversation messages
         for msg in messages:
@@ -172,6 +211,23 @@ Rules:
                 original_error=e
             )
 
+    async def generate_responses_batch(
+        self,
+        requests: List[Tuple[List[ChatMessage], Optional[Dict[str, Any]]]]
+    ) -> List[Union[str, BaseException]]:
+        """
+        Generate replies for independent (messages, context) pairs, e.g.
+        several conversations, over the one client so their round trips
+        overlap. In-flight requests are capped by
+        extra_params["max_concurrency"]. Results follow input order; a
+        failed request yields its exception (normally LLMProviderError)
+        instead of a reply.
+        """
+        if not self._initialized or not self._client:
+            await self.initialize()
+
+        return await gather_responses(self, requests, return_exceptions=True)
+
     async def generate_stream(
         self,
         messages: List[ChatMessage],
@@ -208,4 +264,5 @@ Rules:
         """Cleanup resources."""
         self._client = None
         self._initialized = False
+        self._system_cache.clear()
         logger.info("OpenAI provider cleaned up")
@@ -2,6 +2,12 @@
 Scraper Providers package.
 """
 
-from app.providers.scraper.linkedin import LinkedInScraperProvider
+from app.providers.lazy import class_names, make_lazy_getattr
 
-__all__ = ["LinkedInScraperProvider"]
+# Provider name -> "module:Class", imported on first use
+AVAILABLE = {
+    "linkedin": "app.providers.scraper.linkedin:LinkedInScraperProvider",
+}
+
+__all__ = class_names(AVAILABLE)
+__getattr__ = make_lazy_getattr(__name__, AVAILABLE)
@@ -6,21 +6,76 @@ Modern Protocol-based approach.
 
 import asyncio
 import re
-from typing import Optional, List
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Optional, List, Tuple
 import logging
 import random
 
 import httpx
-from bs4 import BeautifulSoup
-from playwright.async_api import async_playwright
+from bs4 import BeautifulSoup, SoupStrainer
 
-from app.core.providers import register
+from app.core.providers import register, cookieless_client
 from app.core.exceptions import ScraperError
 from app.models import InvestorProfile
 from app.config import get_settings
 
 logger = logging.getLogger(__name__)
 
+# Enriched profiles kept before the least recently used is dropped
+SCRAPED_PROFILE_CACHE_SIZE = 1024
+
+_SUPPORTED_DOMAINS = ("linkedin.com/in/", "linkedin.com/company/")
+
+# The public profile parser only reads og:* meta tags, the <h1> and, for
+# block detection, the page title; skip building the rest of the tree
+_PROFILE_STRAINER = SoupStrainer(["meta", "title", "h1"])
+
+# Patterns compiled once at import
+_SUPPORTED_DOMAIN_RE = re.compile("|".join(map(re.escape, _SUPPORTED_DOMAINS)))
+_USERNAME_RE = re.compile(r'linkedin\.com/in/([^/?]+)')
+_PAGE_COMPANY_RE = re.compile(r' at ([^\.·]+)')
+_PAGE_LOCATION_RES = (
+    re.compile(r'(?:based in|located in|from)\s+([^\.·]+)'),
+    re.compile(r'([A-Z][a-z]+(?:,\s*[A-Z][a-z]+)?(?:\s+Area)?)\s*·'),
+)
+_SNIPPET_COMPANY_RE = re.compile(r' at ([^\.·\n]+)')
+_SNIPPET_LOCATION_RES = (
+    re.compile(r'([A-Z][a-z]+(?:,\s*[A-Z][a-z]+)?(?:\s+Area)?)\s*·'),
+    re.compile(r'Location:\s*([^\.·\n]+)'),
+    re.compile(r'based in\s+([^\.·\n]+)'),
+)
+
+# Investment focus categories and the substrings that indicate them, in
+# output order. Each check is a C-level substring scan, which beats a
+# single combined regex pass for a keyword set this small.
+_FOCUS_KEYWORDS = (
+    ("health", ("health", "healthcare", "biotech", "medtech", "medical")),
+    ("ai", ("ai", "artificial intelligence", "machine learning", "ml", "deep learning")),
+    ("fintech", ("fintech", "finance", "banking", "payments", "crypto", "blockchain")),
+    ("e-commerce", ("e-commerce", "ecommerce", "retail", "marketplace", "d2c")),
+    ("saas", ("saas", "software", "b2b", "enterprise")),
+    ("edtech", ("edtech", "education", "learning")),
+    ("cleantech", ("climate", "cleantech", "sustainability", "green", "energy")),
+    ("gaming", ("gaming", "games", "esports")),
+    ("mobility", ("mobility", "transportation", "automotive", "ev")),
+    ("foodtech", ("food", "foodtech", "agtech", "agriculture")),
+)
+
+
+@lru_cache(maxsize=2048)
+def _focus_for(text: str) -> Tuple[str, ...]:
+    """
+    Focus categories found in text, at most 5. Cached because the same bio
+    or snippet is scanned again on each enrichment pass.
+    """
+    text_lower = text.lower()
+    found_focus = [
+        category for category, keywords in _FOCUS_KEYWORDS
+        if any(kw in text_lower for kw in keywords)
+    ]
+    return tuple(found_focus[:5])
+
 
 @register("scraper", "linkedin")
 class LinkedInScraperProvider:
@@ -42,7 +97,10 @@ class LinkedInScraperProvider:
             "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
             "Accept-Language": "en-US,en;q=0.8,tr;q=0.6",
         }
-        self._scraped_profiles_cache: dict = {}  # Cache for scraped profiles
+        # Scraped profile details by URL, least recently used first
+        self._scraped_profiles_cache: OrderedDict[str, dict] = OrderedDict()
+        # Own connection pool, without cookies; see cookieless_client()
+        self._client: Optional[httpx.AsyncClient] = None
         self._initialized = False
         self._proxy = self._settings.linkedin_proxy
         self._proxies = self._parse_proxy_list(self._settings.linkedin_proxies)
@@ -59,58 +117,79 @@ class LinkedInScraperProvider:
 
     @property
     def supported_domains(self) -> List[str]:
-        return ["linkedin.com/in/", "linkedin.com/company/"]
+        return list(_SUPPORTED_DOMAINS)
 
     def can_handle(self, url: str) -> bool:
         """Check if this scraper can handle the given URL."""
-        return any(domain in url for domain in self.supported_domains)
+        return _SUPPORTED_DOMAIN_RE.search(url) is not None
 
     async def initialize(self) -> None:
         """Initialize scraper."""
+        self._http()
         self._initialized = True
         logger.info("LinkedIn scraper initialized (httpx mode)")
 
+    def _http(self) -> httpx.AsyncClient:
+        """Return the scraper's HTTP client, reopening it if closed."""
+        if self._client is None or self._client.is_closed:
+            self._client = cookieless_client()
+        return self._client
+
+    async def _get(
+        self,
+        url: str,
+        timeout: float,
+        proxy: Optional[str] = None
+    ) -> httpx.Response:
+        """
+        GET a page through the provider's connection pool. A proxied
+        request needs a client of its own, since httpx sets proxies per client.
+        """
+        if proxy:
+            async with cookieless_client(
+                follow_redirects=True, proxies=proxy, timeout=timeout
+            ) as client:
+                return await client.get(url, headers=self._headers)
+        return await self._http().get(
+            url, headers=self._headers, follow_redirects=True, timeout=timeout)
+
     async def scrape_profile(self, url: str) -> Optional[InvestorProfile]:
         """Scrape a LinkedIn profile using httpx (no login required for basic info)."""
         try:
             # rotate user agent each call
             self._headers["User-Agent"] = random.choice(self._user_agents)
-            async with httpx.AsyncClient(
-                follow_redirects=True,
-                proxies=self._pick_proxy(),
-                timeout=self._settings.scraping_timeout
-            ) as client:
-                response = await client.get(url, headers=self._headers)
-
-                if response.status_code in (429, 999):
-                    logger.warning(
-                        f"LinkedIn rate limited ({response.status_code}) for {url}")
-                    await asyncio.sleep(random.uniform(self._settings.linkedin_min_delay, self._settings.linkedin_max_delay))
-                    return self._extract_from_url(url)
-
-                if response.status_code != 200:
-                    logger.warning(
-                        f"LinkedIn returned {response.status_code} for {url}")
-                    # Try to extract info from URL itself
-                    return self._extract_from_url(url)
-
-                html = response.text
-                soup = BeautifulSoup(html, 'html.parser')
-
-                profile_data = self._parse_public_profile(soup, url)
-
-                if profile_data and profile_data.get("name"):
-                    profile_data["linkedin_url"] = url
-                    profile_data["source"] = "linkedin"
-                    return InvestorProfile(**profile_data)
-                else:
-                    # Fallback to URL parsing
-                    basic = self._extract_from_url(url)
-                    if basic:
-                        return basic
-                    if self._settings.playwright_enabled:
-                        return await self._scrape_with_playwright(url)
-                    return None
+            response = await self._get(
+                url, self._settings.scraping_timeout, self._pick_proxy())
+
+            if response.status_code in (429, 999):
+                logger.warning(
+                    f"LinkedIn rate limited ({response.status_code}) for {url}")
+                await asyncio.sleep(random.uniform(self._settings.linkedin_min_delay, self._settings.linkedin_max_delay))
+                return self._extract_from_url(url)
+
+            if response.status_code != 200:
+                logger.warning(
+                    f"LinkedIn returned {response.status_code} for {url}")
+                # Try to extract info from URL itself
+                return self._extract_from_url(url)
+
+            html = response.text
+            soup = BeautifulSoup(html, 'lxml', parse_only=_PROFILE_STRAINER)
+
+            profile_data = self._parse_public_profile(soup, url)
+
+            if profile_data and profile_data.get("name"):
+                profile_data["linkedin_url"] = url
+                profile_data["source"] = "linkedin"
+                return InvestorProfile(**profile_data)
+            else:
+                # Fallback to URL parsing
+                basic = self._extract_from_url(url)
+                if basic:
+                    return basic
+                if self._settings.playwright_enabled:
+                    return await self._scrape_with_playwright(url)
+                return None
 
         except Exception as e:
             logger.error(f"LinkedIn scrape error for {url}: {e}")
@@ -150,17 +229,13 @@ class LinkedInScraperProvider:
 
                 # Extract company from description
                 if ' at ' in desc:
-                    company_match = re.search(r' at ([^\.·]+)', desc)
+                    company_match = _PAGE_COMPANY_RE.search(desc)
                     if company_match:
                         data["company"] = company_match.group(1).strip()[:100]
 
                 # Extract location
-                location_patterns = [
-                    r'(?:based in|located in|from)\s+([^\.·]+)',
-                    r'([A-Z][a-z]+(?:,\s*[A-Z][a-z]+)?(?:\s+Area)?)\s*·'
-                ]
-                for pattern in location_patterns:
-                    loc_match = re.search(pattern, desc)
+                for pattern in _PAGE_LOCATION_RES:
+                    loc_match = pattern.search(desc)
                     if loc_match:
                         data["location"] = loc_match.group(1).strip()[:100]
                         break
@@ -184,7 +259,8 @@ class LinkedInScraperProvider:
                 if h1:
                     data["name"] = h1.get_text(strip=True)[:100]
 
-            # Very simple block detection (captcha/login pages)
+            # Very simple block detection (captcha/login pages); the strained
+            # tree only holds the title and headings
             page_text = soup.get_text(" ", strip=True).lower()
             if "captcha" in page_text or "verify" in page_text:
                 logger.warning("LinkedIn captcha detected, returning minimal data")
@@ -200,7 +276,7 @@ class LinkedInScraperProvider:
         """Extract basic info from LinkedIn URL."""
         try:
             # Extract username from URL
-            match = re.search(r'linkedin\.com/in/([^/?]+)', url)
+            match = _USERNAME_RE.search(url)
             if match:
                 username = match.group(1)
                 # Convert URL slug to readable name
@@ -218,30 +294,13 @@ class LinkedInScraperProvider:
 
     def _extract_investment_focus(self, text: str) -> List[str]:
         """Extract investment focus keywords from text."""
-        focus_keywords = {
-            "health": ["health", "healthcare", "biotech", "medtech", "medical"],
-            "ai": ["ai", "artificial intelligence", "machine learning", "ml", "deep learning"],
-            "fintech": ["fintech", "finance", "banking", "payments", "crypto", "blockchain"],
-            "e-commerce": ["e-commerce", "ecommerce", "retail", "marketplace", "d2c"],
-            "saas": ["saas", "software", "b2b", "enterprise"],
-            "edtech": ["edtech", "education", "learning"],
-            "cleantech": ["climate", "cleantech", "sustainability", "green", "energy"],
-            "gaming": ["gaming", "games", "esports"],
-            "mobility": ["mobility", "transportation", "automotive", "ev"],
-            "foodtech": ["food", "foodtech", "agtech", "agriculture"]
-        }
-
-        text_lower = text.lower()
-        found_focus = []
-
-        for category, keywords in focus_keywords.items():
-            if any(kw in text_lower for kw in keywords):
-                found_focus.append(category)
-
-        return found_focus[:5]  # Limit to 5
+        return list(_focus_for(text))
 
     async def _scrape_with_playwright(self, url: str) -> Optional[InvestorProfile]:
         """Fallback scraping using Playwright for tougher pages."""
+        # Only the fallback path needs Playwright; don't load it with the module
+        from playwright.async_api import async_playwright
+
         proxy = self._pick_proxy()
         launch_args = {"headless": self._settings.playwright_headless}
         if proxy:
@@ -254,7 +313,7 @@ class LinkedInScraperProvider:
                 await page.goto(url, wait_until="domcontentloaded", timeout=self._settings.scraping_timeout * 1000)
                 await page.wait_for_timeout(random.uniform(self._settings.linkedin_min_delay, self._settings.linkedin_max_delay) * 1000)
                 content = await page.content()
-                soup = BeautifulSoup(content, "html.parser")
+                soup = BeautifulSoup(content, "lxml")
                 data = self._parse_public_profile(soup, url)
                 if data and data.get("name"):
                     data["linkedin_url"] = url
@@ -301,18 +360,13 @@ class LinkedInScraperProvider:
 
                 # Look for company
                 if ' at ' in snippet:
-                    company_match = re.search(r' at ([^\.·\n]+)', snippet)
+                    company_match = _SNIPPET_COMPANY_RE.search(snippet)
                     if company_match:
                         data["company"] = company_match.group(1).strip()[:100]
 
                 # Look for location
-                location_patterns = [
-                    r'([A-Z][a-z]+(?:,\s*[A-Z][a-z]+)?(?:\s+Area)?)\s*·',
-                    r'Location:\s*([^\.·\n]+)',
-                    r'based in\s+([^\.·\n]+)'
-                ]
-                for pattern in location_patterns:
-                    loc_match = re.search(pattern, snippet)
+                for pattern in _SNIPPET_LOCATION_RES:
+                    loc_match = pattern.search(snippet)
                     if loc_match:
                         data["location"] = loc_match.group(1).strip()[:100]
                         break
@@ -339,35 +393,33 @@ class LinkedInScraperProvider:
 
         # Check cache first
         cache_key = profile.linkedin_url
-        if cache_key in self._scraped_profiles_cache:
-            cached = self._scraped_profiles_cache[cache_key]
+        cached = self._scraped_profiles_cache.get(cache_key)
+        if cached is not None:
+            self._scraped_profiles_cache.move_to_end(cache_key)
             return self._merge_profiles(profile, cached)
 
         try:
-            async with httpx.AsyncClient(follow_redirects=True) as client:
-                response = await client.get(
-                    profile.linkedin_url,
-                    headers=self._headers,
-                    timeout=10
-                )
+            response = await self._get(profile.linkedin_url, 10)
 
-                if response.status_code != 200:
-                    logger.warning(
-                        f"LinkedIn returned {response.status_code} for {profile.linkedin_url}")
-                    return profile
+            if response.status_code != 200:
+                logger.warning(
+                    f"LinkedIn returned {response.status_code} for {profile.linkedin_url}")
+                return profile
 
-                html = response.text
-                soup = BeautifulSoup(html, 'html.parser')
+            html = response.text
+            soup = BeautifulSoup(html, 'lxml')
 
-                # Get additional data from the page
-                enriched_data = self._extract_detailed_info(soup)
+            # Get additional data from the page
+            enriched_data = self._extract_detailed_info(soup)
 
-                if enriched_data:
-                    # Cache the result
-                    self._scraped_profiles_cache[cache_key] = enriched_data
+            if enriched_data:
+                # Cache the result
+                self._scraped_profiles_cache[cache_key] = enriched_data
+                if len(self._scraped_profiles_cache) > SCRAPED_PROFILE_CACHE_SIZE:
+                    self._scraped_profiles_cache.popitem(last=False)
 
-                    # Merge with existing profile
-                    return self._merge_profiles(profile, enriched_data)
+                # Merge with existing profile
+                return self._merge_profiles(profile, enriched_data)
 
         except Exception as e:
             logger.warning(
@@ -485,4 +537,7 @@ class LinkedInScraperProvider:
     async def cleanup(self) -> None:
         """Cleanup resources."""
         self._scraped_profiles_cache.clear()
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
         logger.info("LinkedIn scraper cleaned up")
@@ -2,6 +2,12 @@
 Search Providers package.
 """
 
-from app.providers.search.google import GoogleSearchProvider
+from app.providers.lazy import class_names, make_lazy_getattr
 
-__all__ = ["GoogleSearchProvider"]
+# Provider name -> "module:Class", imported on first use
+AVAILABLE = {
+    "google": "app.providers.search.google:GoogleSearchProvider",
+}
+
+__all__ = class_names(AVAILABLE)
+__getattr__ = make_lazy_getattr(__name__, AVAILABLE)
@@ -6,19 +6,91 @@ Modern Protocol-based approach.
 
 import re
 import asyncio
+import time
 from typing import List, Optional
 import logging
 
 import httpx
-from bs4 import BeautifulSoup
+import lxml.html
+from lxml import etree
 
-from app.core.providers import register
+from app.core.providers import register, cookieless_client
 from app.core.exceptions import SearchProviderError
 from app.models import SearchResult
 from app.config import get_settings
 
 logger = logging.getLogger(__name__)
 
+_EMAIL_RE = re.compile(r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}')
+
+# Responses that mean the API is shedding load rather than rejecting the query
+_OVERLOAD_STATUSES = frozenset({429, 502, 503})
+# Pause after an overload response without a usable Retry-After, and the cap
+DEFAULT_RETRY_AFTER = 1.0
+MAX_RETRY_AFTER = 30.0
+
+
+class _AdaptiveLimit:
+    """
+    AIMD cap on in-flight API calls. Each success widens the window by half
+    a slot up to the ceiling; an overload response halves it and holds back
+    new calls until the server's Retry-After has passed.
+    """
+
+    def __init__(self, ceiling: int):
+        self.ceiling = max(1, ceiling)
+        self.limit = float(self.ceiling)
+        self._in_flight = 0
+        self._resume_at = 0.0
+        self._changed = asyncio.Condition()
+
+    async def __aenter__(self) -> None:
+        async with self._changed:
+            while True:
+                pause = self._resume_at - time.monotonic()
+                if pause > 0:
+                    try:
+                        await asyncio.wait_for(self._changed.wait(), pause)
+                    except asyncio.TimeoutError:
+                        pass
+                elif self._in_flight < int(self.limit):
+                    break
+                else:
+                    await self._changed.wait()
+            self._in_flight += 1
+
+    async def __aexit__(self, *exc_info) -> None:
+        async with self._changed:
+            self._in_flight -= 1
+            self._changed.notify_all()
+
+    def succeeded(self) -> None:
+        self.limit = min(float(self.ceiling), self.limit + 0.5)
+
+    def overloaded(self, retry_after: float) -> None:
+        self.limit = max(1.0, self.limit / 2)
+        self._resume_at = max(self._resume_at, time.monotonic() + retry_after)
+
+
+def _retry_after(response: httpx.Response) -> float:
+    """Seconds from a Retry-After header; HTTP dates fall back to the default."""
+    try:
+        seconds = float(response.headers.get("Retry-After", DEFAULT_RETRY_AFTER))
+    except ValueError:
+        seconds = DEFAULT_RETRY_AFTER
+    return min(max(seconds, 0.0), MAX_RETRY_AFTER)
+
+
+def _page_text(html: bytes) -> str:
+    """
+    Visible text of a page, whitespace-collapsed. Parsed with lxml directly;
+    bytes let it pick the encoding from the page's own declaration.
+    """
+    tree = lxml.html.fromstring(html)
+    etree.strip_elements(
+        tree, etree.Comment, "script", "style", "nav", "footer", with_tail=False)
+    return " ".join(" ".join(tree.itertext()).split())
+
 
 @register("search", "google")
 class GoogleSearchProvider:
@@ -31,9 +103,14 @@ class GoogleSearchProvider:
         settings = get_settings()
         self._api_key = settings.google_search_api_key
         self._search_engine_id = settings.google_search_engine_id
+        # Caps in-flight API calls to stay under Google's per-second quota,
+        # backing off when the API signals overload
+        self._limit = _AdaptiveLimit(settings.search_max_concurrency)
         self._headers = {
             "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36"
         }
+        # Own connection pool, without cookies; see cookieless_client()
+        self._client: Optional[httpx.AsyncClient] = None
 
     @property
     def name(self) -> str:
@@ -45,6 +122,22 @@ class GoogleSearchProvider:
         """Backward compatible property."""
         return self.name
 
+    async def initialize(self) -> None:
+        """Open the provider's HTTP client."""
+        self._http()
+
+    def _http(self) -> httpx.AsyncClient:
+        """Return the provider's HTTP client, reopening it if closed."""
+        if self._client is None or self._client.is_closed:
+            self._client = cookieless_client()
+        return self._client
+
+    async def cleanup(self) -> None:
+        """Close the provider's HTTP client."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
     async def search(
         self,
         query: str,
@@ -65,10 +158,22 @@ class GoogleSearchProvider:
                 "num": min(num_results, 10)  # Max 10 per request
             }
 
-            async with httpx.AsyncClient() as client:
-                response = await client.get(url, params=params, timeout=30)
-                response.raise_for_status()
-                data = response.json()
+            # An overloaded call is retried once, after the pause it triggers
+            for attempt in range(2):
+                async with self._limit:
+                    response = await self._http().get(
+                        url, params=params, timeout=30)
+                    if response.status_code in _OVERLOAD_STATUSES:
+                        self._limit.overloaded(_retry_after(response))
+                    else:
+                        self._limit.succeeded()
+                if response.status_code not in _OVERLOAD_STATUSES:
+                    break
+                logger.warning(
+                    f"Google API overloaded ({response.status_code}), "
+                    f"concurrency now {int(self._limit.limit)}")
+            response.raise_for_status()
+            data = response.json()
 
             results = []
             for item in data.get("items", []):
@@ -136,10 +241,19 @@ class GoogleSearchProvider:
             f"site:angel.co investor {sector_query} {location_suffix}",
         ]
 
-        # Run searches
-        for query in search_queries:
-            try:
-                query_results = await self.search(query, 10)
+        # Run searches concurrently (bounded in search()) and merge them in
+        # query order; queries still waiting for a slot once there are
+        # enough results are cancelled so they don't spend API quota
+        tasks = [asyncio.ensure_future(self.search(query, 10))
+                 for query in search_queries]
+        try:
+            for query, task in zip(search_queries, tasks):
+                try:
+                    query_results = await task
+                except Exception as e:
+                    logger.warning(f"Search query failed: {query[:50]}... - {e}")
+                    continue
+
                 for result in query_results:
                     # Filter out LinkedIn posts, only keep profiles and companies
                     if "/posts/" in result.url or "/pulse/" in result.url:
@@ -151,10 +265,11 @@ class GoogleSearchProvider:
                 # Limit total results
                 if len(results) >= num_results:
                     break
-
-            except Exception as e:
-                logger.warning(f"Search query failed: {query[:50]}... - {e}")
-                continue
+        finally:
+            for task in tasks:
+                task.cancel()
+            # Retrieve outcomes of the remaining tasks so none go unobserved
+            await asyncio.gather(*tasks, return_exceptions=True)
 
         logger.info(
             f"Total unique US investor results found: {len(results)} for sectors: {sectors}")
@@ -163,16 +278,15 @@ class GoogleSearchProvider:
     async def extract_emails(self, url: str) -> List[str]:
         """Extract emails from a URL."""
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    url,
-                    headers=self._headers,
-                    timeout=10,
-                    follow_redirects=True
-                )
+            response = await self._http().get(
+                url,
+                headers=self._headers,
+                timeout=10,
+                follow_redirects=True
+            )
 
-                if response.status_code == 200:
-                    return await self.extract_emails_from_text(response.text)
+            if response.status_code == 200:
+                return await self.extract_emails_from_text(response.text)
 
         except Exception as e:
             logger.warning(f"Email extraction failed for {url}: {e}")
@@ -181,8 +295,7 @@ class GoogleSearchProvider:
 
     async def extract_emails_from_text(self, text: str) -> List[str]:
         """Extract emails from text content."""
-        email_pattern = r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}'
-        emails = re.findall(email_pattern, text)
+        emails = _EMAIL_RE.findall(text)
 
         # Filter false positives
         filtered = [
@@ -197,22 +310,15 @@ class GoogleSearchProvider:
     async def fetch_page_content(self, url: str) -> Optional[str]:
         """Fetch and parse webpage content."""
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    url,
-                    headers=self._headers,
-                    timeout=10,
-                    follow_redirects=True
-                )
-
-                if response.status_code == 200:
-                    soup = BeautifulSoup(response.text, 'lxml')
-
-                    for element in soup(['script', 'style', 'nav', 'footer']):
-                        element.decompose()
-
-                    text = soup.get_text(separator=' ', strip=True)
-                    return text[:5000]
+            response = await self._http().get(
+                url,
+                headers=self._headers,
+                timeout=10,
+                follow_redirects=True
+            )
+
+            if response.status_code == 200:
+                return _page_text(response.content)[:5000]
 
         except Exception as e:
             logger.warning(f"Page fetch failed for {url}: {e}")
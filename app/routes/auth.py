@@ -7,7 +7,11 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 
 from app.models.auth import UserCreate, UserLogin, Token, UserResponse
-from app.services.auth_service import AuthService, get_auth_service
+from app.services.auth_service import (
+    AuthService,
+    get_auth_service,
+    get_read_auth_service,
+)
 from app.core.exceptions import AppException
 
 logger = logging.getLogger(__name__)
@@ -46,7 +50,7 @@ async def register(
 @router.post("/login", response_model=Token)
 async def login(
     credentials: UserLogin,
-    auth_service: AuthService = Depends(get_auth_service)
+    auth_service: AuthService = Depends(get_read_auth_service)
 ):
     """
     Login and get an access token.
@@ -74,7 +78,7 @@ async def login(
 
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    auth_service: AuthService = Depends(get_auth_service)
+    auth_service: AuthService = Depends(get_read_auth_service)
 ) -> UserResponse:
     """
     Dependency to get the current authenticated user from JWT token.
@@ -126,7 +130,7 @@ async def get_me(current_user: UserResponse = Depends(get_current_user)):
 @router.post("/refresh", response_model=Token)
 async def refresh_token(
     current_user: UserResponse = Depends(get_current_user),
-    auth_service: AuthService = Depends(get_auth_service)
+    auth_service: AuthService = Depends(get_read_auth_service)
 ):
     """
     Refresh the access token.
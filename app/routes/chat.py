@@ -4,9 +4,9 @@ Chat API routes.
 
 from typing import List
 from fastapi import APIRouter, HTTPException, Depends
-from fastapi.responses import StreamingResponse
+from fastapi.responses import Response, StreamingResponse
+from pydantic_core import to_json
 import logging
-import json
 
 from app.models import (
     ChatRequest,
@@ -68,11 +68,12 @@ async def chat_stream(
     async def generate_stream():
         try:
             async for chunk in chat_service.process_message_stream(request):
-                data = json.dumps(chunk, ensure_ascii=False)
+                # Chunks may carry pydantic models; to_json encodes them directly
+                data = to_json(chunk).decode()
                 yield f"data: {data}\n\n"
         except Exception as e:
             logger.error(f"Stream error: {e}")
-            error_data = json.dumps({"type": "error", "error": str(e)})
+            error_data = to_json({"type": "error", "error": str(e)}).decode()
             yield f"data: {error_data}\n\n"
 
     return StreamingResponse(
@@ -103,7 +104,9 @@ async def chat(
     - `openai` (requires OPENAI_API_KEY)
     """
     try:
-        return await chat_service.process_message(request)
+        response = await chat_service.process_message(request)
+        # Already validated; skip FastAPI's dump/re-validate/encode pass
+        return Response(response.model_dump_json(), media_type="application/json")
     except AppException as e:
         raise HTTPException(status_code=500, detail=e.to_dict())
     except Exception as e:
@@ -133,12 +136,13 @@ async def search_investors(
 
         processing_time = int((time.time() - start_time) * 1000)
 
-        return InvestorSearchResponse(
+        response = InvestorSearchResponse(
             investors=investors,
             total_found=len(investors),
             search_query=" ".join(request.sectors),
             processing_time_ms=processing_time
         )
+        return Response(response.model_dump_json(), media_type="application/json")
     except AppException as e:
         raise HTTPException(status_code=500, detail=e.to_dict())
     except Exception as e:
@@ -52,6 +52,8 @@ def investors_to_csv(investors: List[InvestorProfile]) -> str:
     writer.writeheader()
 
     for inv in investors:
+        bio = inv.bio or ""
+        focus = inv.investment_focus
         row = {
             "name": inv.name or "",
             "title": inv.title or "",
@@ -59,8 +61,8 @@ def investors_to_csv(investors: List[InvestorProfile]) -> str:
             "email": inv.email or "",
             "linkedin_url": inv.linkedin_url or "",
             "location": inv.location or "",
-            "bio": (inv.bio[:200] + "...") if inv.bio and len(inv.bio) > 200 else (inv.bio or ""),
-            "investment_focus": ", ".join(inv.investment_focus) if inv.investment_focus else "",
+            "bio": bio[:200] + "..." if len(bio) > 200 else bio,
+            "investment_focus": ", ".join(focus) if focus else "",
             "source": inv.source or ""
         }
         writer.writerow(row)
@@ -102,6 +104,8 @@ def investors_to_excel_bytes(investors: List[InvestorProfile]) -> bytes:
 
     # Data rows
     for row_idx, inv in enumerate(investors, 2):
+        bio = inv.bio or ""
+        focus = inv.investment_focus
         ws.cell(row=row_idx, column=1, value=inv.name or "")
         ws.cell(row=row_idx, column=2, value=inv.title or "")
         ws.cell(row=row_idx, column=3, value=inv.company or "")
@@ -109,9 +113,8 @@ def investors_to_excel_bytes(investors: List[InvestorProfile]) -> bytes:
         ws.cell(row=row_idx, column=5, value=inv.linkedin_url or "")
         ws.cell(row=row_idx, column=6, value=inv.location or "")
         ws.cell(row=row_idx, column=7, value=(
-            inv.bio[:500] + "...") if inv.bio and len(inv.bio) > 500 else (inv.bio or ""))
-        ws.cell(row=row_idx, column=8, value=", ".join(
-            inv.investment_focus) if inv.investment_focus else "")
+            bio[:500] + "...") if len(bio) > 500 else bio)
+        ws.cell(row=row_idx, column=8, value=", ".join(focus) if focus else "")
         ws.cell(row=row_idx, column=9, value=inv.source or "")
 
     # Adjust column widths
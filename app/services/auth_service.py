@@ -8,12 +8,13 @@ from datetime import datetime, timedelta
 from typing import Optional
 
 from passlib.context import CryptContext
+from fastapi import Depends
 from jose import jwt, JWTError
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import get_settings
-from app.database import get_db
+from app.database import get_db, get_db_ro
 from app.database.models import User
 from app.models.auth import UserCreate, UserResponse, Token, TokenData
 from app.core.exceptions import AppException
@@ -172,7 +173,11 @@ class AuthService:
 
 
 # Dependency for getting auth service
-async def get_auth_service():
+async def get_auth_service(db: AsyncSession = Depends(get_db)) -> AuthService:
     """Dependency to get AuthService with database session."""
-    async for session in get_db():
-        yield AuthService(session)
+    return AuthService(db)
+
+
+async def get_read_auth_service(db: AsyncSession = Depends(get_db_ro)) -> AuthService:
+    """Dependency to get AuthService on a read-only session (no commit)."""
+    return AuthService(db)
@@ -28,6 +28,9 @@ from app.services.memory_service import MemoryService, get_memory_service
 
 logger = logging.getLogger(__name__)
 
+# "in <city>", "from <city>", "at <city>"
+_LOCATION_RE = re.compile(r"(?:in|from|at)\s+([a-zA-Z\s]+)")
+
 
 class ChatService:
     """
@@ -349,7 +352,7 @@ class ChatService:
                         "showing": len(current_page_investors),
                         "has_more": remaining > 0,
                         "remaining": remaining,
-                        "investors": [inv.model_dump(mode='json') for inv in current_page_investors]
+                        "investors": list(current_page_investors)
                     }
             except Exception as e:
                 logger.error(f"Investor search failed: {e}")
@@ -435,7 +438,7 @@ class ChatService:
             "current_page": current_page,
             "page_size": page_size,
             "has_more_investors": has_more,
-            "investors": [inv.model_dump(mode='json') for inv in display_investors],
+            "investors": list(display_investors),
             "processing_time_ms": processing_time,
             "model_used": provider_name
         }
@@ -541,7 +544,7 @@ class ChatService:
                 return loc.title() if len(loc.split()) > 1 else loc.upper()
 
         # Regex patterns like "in <city>" or "from <city>"
-        match = re.search(r"(?:in|from|at)\s+([a-zA-Z\s]+)", message_lower)
+        match = _LOCATION_RE.search(message_lower)
         if match:
             candidate = match.group(1).strip()
             if 2 <= len(candidate) <= 40:
@@ -18,6 +18,7 @@ from app.database.repositories import (
     SearchResultRepository,
     UsageRepository
 )
+from app.database.usage_sink import usage_sink
 from app.database.models import (
     Conversation as DBConversation,
     Message as DBMessage,
@@ -201,16 +202,15 @@ class DatabaseMemoryService:
     ) -> None:
         """Add investors to conversation in database."""
         try:
-            for inv_profile in investors:
-                # Get or create investor in shared table
-                investor = await self.investor_repo.get_or_create(inv_profile)
+            # Get or create all investors in the shared table at once
+            db_investors = await self.investor_repo.get_or_create_many(investors)
 
-                # Link to conversation
-                await self.investor_repo.add_to_conversation(
-                    conversation_id=conversation_id,
-                    investor_id=investor.id,
-                    page_number=page_number
-                )
+            # Link the whole page to the conversation at once
+            await self.investor_repo.add_many_to_conversation(
+                conversation_id=conversation_id,
+                investor_ids=[i.id for i in db_investors],
+                page_number=page_number
+            )
 
             await self.session.commit()
 
@@ -346,6 +346,19 @@ class DatabaseMemoryService:
         error_message: Optional[str] = None
     ) -> None:
         """Record provider usage for analytics."""
+        if usage_sink.running:
+            # Written in the background, off the request path
+            usage_sink.record(
+                provider_type=provider_type,
+                provider_name=provider_name,
+                conversation_id=conversation_id,
+                tokens_used=tokens_used,
+                response_time_ms=response_time_ms,
+                success=success,
+                error_message=error_message
+            )
+            return
+
         try:
             await self.usage_repo.record(
                 provider_type=provider_type,
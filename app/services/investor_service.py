@@ -69,7 +69,7 @@ class InvestorService:
             return cached["investors"], cached["search_results"]
 
         # Publish search started event
-        await event_bus.publish(Event(
+        event_bus.publish_nowait(Event(
             type=EventType.SEARCH_STARTED,
             data={"sectors": sectors, "location": location}
         ))
@@ -158,7 +158,7 @@ class InvestorService:
                         seen_names.add(profile.name.lower())
                         investors.append(profile)
 
-                        await event_bus.publish(Event(
+                        event_bus.publish_nowait(Event(
                             type=EventType.INVESTOR_FOUND,
                             data={"name": profile.name, "source": "linkedin"}
                         ))
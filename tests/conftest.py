@@ -7,6 +7,7 @@ from pathlib import Path
 from typing import List
 from unittest.mock import AsyncMock, MagicMock, patch
 import pytest
+import pytest_asyncio
 
 # Ensure project root is on path
 ROOT = Path(__file__).resolve().parents[1]
@@ -14,6 +15,7 @@ if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
 from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 
 from app.models import InvestorProfile, SearchResult, ChatMessage, MessageRole
 
@@ -125,6 +127,28 @@ def client():
     return TestClient(app)
 
 
+# ============================================================================
+# Database Fixtures
+# ============================================================================
+
+@pytest_asyncio.fixture
+async def engine():
+    """In-memory SQLite engine with every table created."""
+    from app.database import Base
+
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield engine
+    await engine.dispose()
+
+
+@pytest.fixture
+def session_factory(engine):
+    """Session factory bound to the in-memory test engine."""
+    return async_sessionmaker(engine, expire_on_commit=False)
+
+
 # ============================================================================
 # Mock Fixtures
 # ============================================================================
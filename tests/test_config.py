@@ -0,0 +1,73 @@
+"""
+Unit tests for application settings.
+"""
+
+from app.config import Settings, get_settings
+import sys
+from pathlib import Path
+import pytest
+
+# Ensure project root is on path
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+
+class TestSettings:
+    """Tests for Settings helpers."""
+
+    def test_get_settings_is_singleton(self):
+        """Test get_settings returns the same instance."""
+        assert get_settings() is get_settings()
+
+    def test_parsed_allowed_origins(self):
+        """Test comma-separated origins are split and trimmed."""
+        settings = Settings(allowed_origins=" https://a.com, https://b.com ,")
+
+        assert settings.parsed_allowed_origins() == (
+            "https://a.com", "https://b.com")
+
+    def test_parsed_allowed_origins_empty(self):
+        """Test empty origins fall back to wildcard."""
+        settings = Settings(allowed_origins="  ")
+
+        assert settings.parsed_allowed_origins() == ("*",)
+
+    def test_llm_config_lookup(self):
+        """Test provider config lookup and configured check."""
+        settings = Settings(openai_api_key="sk-test", openai_model="gpt-4o")
+
+        assert settings.get_llm_config("openai")["model"] == "gpt-4o"
+        assert settings.is_provider_configured("openai")
+        assert settings.get_llm_config("unknown") == {}
+        assert not settings.is_provider_configured("unknown")
+
+    def test_llm_config_is_read_only(self):
+        """Test the shared provider config can't be mutated by callers."""
+        settings = Settings()
+
+        with pytest.raises(TypeError):
+            settings.get_llm_config("gemini")["model"] = "other"
+
+    def test_sqlite_pool_settings_coerced(self):
+        """Test pool sizing is zeroed for SQLite and kept otherwise."""
+        sqlite = Settings(database_url="sqlite+aiosqlite:///./x.db",
+                          database_pool_size=5, database_max_overflow=10)
+        postgres = Settings(database_url="postgresql+asyncpg://h/db",
+                            database_pool_size=5, database_max_overflow=10)
+
+        assert (sqlite.database_pool_size, sqlite.database_max_overflow) == (0, 0)
+        assert (postgres.database_pool_size, postgres.database_max_overflow) == (5, 10)
+
+    def test_sql_echo_only_in_development(self):
+        """Test SQL echo needs both debug and the development environment."""
+        assert Settings(debug=True, environment="development").sql_echo
+        assert not Settings(debug=True, environment="production").sql_echo
+        assert not Settings(debug=False, environment="development").sql_echo
+
+    def test_postgres_urls_use_asyncpg(self):
+        """Test sync PostgreSQL URLs are switched to the asyncpg driver."""
+        for url in ("postgres://u@h/db", "postgresql://u@h/db",
+                    "postgresql+psycopg2://u@h/db"):
+            assert Settings(database_url=url).database_url == "postgresql+asyncpg://u@h/db"
+        assert Settings(database_url="sqlite+aiosqlite://").database_url == "sqlite+aiosqlite://"
@@ -0,0 +1,550 @@
+"""
+Unit tests for database connection setup.
+"""
+
+from app.config import Settings
+from app.database import (
+    apply_sqlite_pragmas, Conversation, Investor, InvestorProfileRecord,
+    ProviderUsage, ProviderUsageDaily, ProviderUsageHourly, UsageSink
+)
+from app.database.repositories import (
+    COPY_THRESHOLD, ConversationRepository, InvestorRepository, MessageRepository,
+    SearchResultRepository, UsageRepository
+)
+from app.database.types import compress_text, decompress_text
+from app.models import InvestorProfile, SearchResult
+from app.database.connection import (
+    DatabaseManager, _ensure_sqlite_dir, _sqlite_read_only_url
+)
+from datetime import date, datetime, timedelta
+import sqlite3
+import uuid
+from sqlalchemy import event, func, select, text, update
+from sqlalchemy.exc import InvalidRequestError
+import pytest
+import sys
+from pathlib import Path
+
+# Ensure project root is on path
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+
+class TestSqlitePragmas:
+    """Tests for SQLite connection tuning."""
+
+    def test_apply_sqlite_pragmas(self, tmp_path):
+        """Test configured PRAGMAs are applied to a new connection."""
+        settings = Settings(sqlite_cache_size=-2000, sqlite_synchronous="NORMAL")
+        conn = sqlite3.connect(tmp_path / "test.db")
+        try:
+            apply_sqlite_pragmas(conn, settings)
+
+            assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+            assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1
+            assert conn.execute("PRAGMA cache_size").fetchone()[0] == -2000
+        finally:
+            conn.close()
+
+    def test_read_only_pragmas_skip_journal_mode(self, tmp_path):
+        """Test read-only connections don't try to change the journal mode."""
+        db = tmp_path / "test.db"
+        sqlite3.connect(db).close()
+        conn = sqlite3.connect(f"file:{db}?mode=ro", uri=True)
+        try:
+            apply_sqlite_pragmas(conn, Settings(), read_only=True)
+
+            assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "delete"
+            assert conn.execute("PRAGMA busy_timeout").fetchone()[0] == 5000
+        finally:
+            conn.close()
+
+    def test_read_only_url(self):
+        """Test file URLs are rewritten to read-only URI form."""
+        url = _sqlite_read_only_url("sqlite+aiosqlite:///./data/app.db")
+
+        assert url == "sqlite+aiosqlite:///file:./data/app.db?mode=ro&uri=true"
+
+
+class TestServerDefaults:
+    """Tests for database-generated timestamps."""
+
+    @pytest.mark.asyncio
+    async def test_timestamps_stamped_by_database(self, session_factory):
+        """Test created_at/updated_at are filled in and loaded on insert."""
+        async with session_factory() as session:
+            conversation = Conversation(id=str(uuid.uuid4()))
+            session.add(conversation)
+            await session.commit()
+
+            assert conversation.created_at is not None
+            assert conversation.updated_at is not None
+
+    @pytest.mark.asyncio
+    async def test_cleanup_old_uses_database_clock(self, session_factory):
+        """Test the retention cutoff is computed by the database."""
+        async with session_factory() as session:
+            fresh = Conversation(id=str(uuid.uuid4()))
+            stale = Conversation(id=str(uuid.uuid4()))
+            session.add_all([fresh, stale])
+            await session.flush()
+            await session.execute(
+                update(Conversation)
+                .where(Conversation.id == stale.id)
+                .values(updated_at=text(
+                    "STRFTIME('%Y-%m-%d %H:%M:%f', 'now', '-30 hours')")))
+
+            removed = await ConversationRepository(session).cleanup_old(hours=24)
+            remaining = await session.scalars(select(Conversation.id))
+
+            assert removed == 1
+            assert list(remaining) == [fresh.id]
+
+
+class TestIndexes:
+    """Tests for query-serving indexes."""
+
+    @pytest.mark.asyncio
+    async def test_message_history_served_from_composite_index(self, engine):
+        """Test conversation history is read in index order without a sort."""
+        async with engine.connect() as conn:
+            result = await conn.exec_driver_sql(
+                "EXPLAIN QUERY PLAN SELECT * FROM messages "
+                "WHERE conversation_id = 'c1' ORDER BY timestamp DESC LIMIT 20")
+            plan = " ".join(row[-1] for row in result)
+
+        assert "idx_message_conv_ts" in plan
+        assert "TEMP B-TREE" not in plan
+
+    @pytest.mark.asyncio
+    async def test_investor_page_served_from_composite_index(self, engine):
+        """Test a page of investors is read in added order without a sort."""
+        async with engine.connect() as conn:
+            result = await conn.exec_driver_sql(
+                "EXPLAIN QUERY PLAN SELECT investors.* FROM investors "
+                "JOIN conversation_investors ci ON investors.id = ci.investor_id "
+                "WHERE ci.conversation_id = 'c1' AND ci.page_number = 0 "
+                "ORDER BY ci.added_at LIMIT 10")
+            plan = " ".join(row[-1] for row in result)
+
+        assert "ix_convinv_cid_page_added" in plan
+        assert "TEMP B-TREE" not in plan
+
+
+class TestUuidKeys:
+    """Tests for UUID-typed conversation keys."""
+
+    @pytest.mark.asyncio
+    async def test_string_ids_round_trip(self, session_factory):
+        """Test UUID strings are stored compactly and read back unchanged."""
+        conversation_id = str(uuid.uuid4())
+        async with session_factory() as session:
+            session.add(Conversation(id=conversation_id))
+            await session.commit()
+
+        async with session_factory() as session:
+            loaded = await session.get(Conversation, conversation_id)
+            stored = await session.scalar(
+                text("SELECT id FROM conversations"))
+
+        assert loaded.id == conversation_id
+        assert stored == conversation_id.replace("-", "")
+
+
+class TestInvestorBulkUpsert:
+    """Tests for batched investor inserts."""
+
+    @pytest.mark.asyncio
+    async def test_existing_linkedin_urls_are_kept(self, session_factory):
+        """Test re-inserted URLs keep their row and new ones are added."""
+        def profile(name):
+            return InvestorProfile(
+                name=name, linkedin_url=f"https://linkedin.com/in/{name.lower()}")
+
+        async with session_factory() as session:
+            repo = InvestorRepository(session)
+            first = await repo.bulk_upsert([profile("Ann"), profile("Bob")])
+            second = await repo.bulk_upsert(
+                [profile("Bob"), profile("Cy"), InvestorProfile(name="NoUrl")])
+            total = await session.scalar(select(func.count(Investor.id)))
+
+        assert second["https://linkedin.com/in/bob"] == first["https://linkedin.com/in/bob"]
+        assert len(second) == 2
+        assert total == 3
+
+    @pytest.mark.asyncio
+    async def test_name_lower_set_on_insert(self, session_factory):
+        """Test name_lower is filled in on insert and used for name lookup."""
+        async with session_factory() as session:
+            repo = InvestorRepository(session)
+            created = await repo.create(InvestorProfile(name="Ann Lee"))
+            found = await repo.get_by_name("ANN LEE")
+
+        assert created.name_lower == "ann lee"
+        assert found is created
+
+    @pytest.mark.asyncio
+    async def test_non_ascii_names_match_case_insensitively(self, session_factory):
+        """Test names outside ASCII fold the same in the database and caches."""
+        async with session_factory() as session:
+            repo = InvestorRepository(session)
+            created = await repo.get_or_create(InvestorProfile(name="Ömer Çelik"))
+            await session.commit()
+
+        async with session_factory() as session:
+            repo = InvestorRepository(session)
+            found = await repo.get_by_name("ömer çelik")
+            again = await repo.get_or_create(InvestorProfile(name="ÖMER ÇELIK"))
+            matches = await repo.search(query="ömer")
+            total = await session.scalar(select(func.count(Investor.id)))
+
+        assert created.name_lower == "ömer çelik"
+        assert found.id == again.id == created.id
+        assert [i.id for i in matches] == [created.id]
+        assert total == 1
+
+    @pytest.mark.asyncio
+    async def test_get_or_create_many_upserts_in_order(self, session_factory):
+        """Test URL and name identities resolve to stable rows in input order."""
+        profiles = [
+            InvestorProfile(name="Ann", linkedin_url="https://linkedin.com/in/ann"),
+            InvestorProfile(name="Bob"),
+            InvestorProfile(name="BOB"),
+        ]
+        async with session_factory() as session:
+            repo = InvestorRepository(session)
+            first = await repo.get_or_create_many(profiles)
+            second = await repo.get_or_create_many(list(reversed(profiles)))
+            single = await repo.get_or_create(InvestorProfile(name="bob"))
+            total = await session.scalar(select(func.count(Investor.id)))
+
+        assert [i.id for i in first] == [i.id for i in reversed(second)]
+        assert first[1] is first[2] is single
+        assert total == 2
+
+    @pytest.mark.asyncio
+    async def test_repeated_lookups_skip_the_database(self, engine, session_factory):
+        """Test cached ids answer repeat lookups until the investor is updated."""
+        statements = []
+        event.listen(engine.sync_engine, "before_cursor_execute",
+                     lambda *args: statements.append(args[2]))
+
+        url = "https://linkedin.com/in/ann"
+        async with session_factory() as session:
+            repo = InvestorRepository(session)
+            ann = await repo.get_or_create(InvestorProfile(name="Ann", linkedin_url=url))
+            bob = await repo.get_or_create(InvestorProfile(name="Bob"))
+
+            statements.clear()
+            assert await repo.get_by_linkedin(url) is ann
+            assert await repo.get_by_name("BOB") is bob
+            assert await repo.get_or_create(InvestorProfile(name="bob")) is bob
+            assert statements == []
+
+            await repo.update(ann.id, title="Partner")
+            assert await repo.get_by_linkedin(url) is ann
+            assert len(statements) == 2
+
+    @pytest.mark.asyncio
+    async def test_search_substring_and_short_prefix(self, session_factory):
+        """Test search matches substrings, prefixes for short queries, and escapes LIKE."""
+        async with session_factory() as session:
+            repo = InvestorRepository(session)
+            await repo.get_or_create_many([
+                InvestorProfile(name="Anna Lee", company="Acme Ventures"),
+                InvestorProfile(name="Lee Park", company="100%_Capital"),
+            ])
+
+            substring = await repo.search(query="LEE")
+            prefix = await repo.search(query="le")
+            by_company = await repo.search(company="acme")
+            escaped = await repo.search(company="%_")
+
+        assert {i.name for i in substring} == {"Anna Lee", "Lee Park"}
+        assert [i.name for i in prefix] == ["Lee Park"]
+        assert [i.name for i in by_company] == ["Anna Lee"]
+        assert [i.name for i in escaped] == ["Lee Park"]
+
+
+class TestCompressedText:
+    """Tests for the compressed text column type."""
+
+    def test_round_trip(self):
+        """Test short and long values decode to the original text."""
+        short = "hello"
+        long = "investor " * 200
+
+        assert compress_text(short) == b"\x00hello"
+        assert len(compress_text(long)) < len(long)
+        assert decompress_text(compress_text(short)) == short
+        assert decompress_text(compress_text(long)) == long
+
+    def test_legacy_plaintext_rows(self):
+        """Test rows written before compression still decode."""
+        assert decompress_text("plain text") == "plain text"
+        assert decompress_text(b"plain bytes") == "plain bytes"
+
+
+class TestUsageRollup:
+    """Tests for the daily provider usage rollup."""
+
+    @pytest.mark.asyncio
+    async def test_rollup_day_aggregates_and_replaces(self, session_factory):
+        """Test one day's usage is grouped per provider and re-runs replace it."""
+        day = date(2025, 1, 15)
+        noon = datetime(2025, 1, 15, 12)
+        async with session_factory() as session:
+            for ms in (100, 200, 300, 400):
+                session.add(ProviderUsage(
+                    provider_type="llm", provider_name="gemini",
+                    response_time_ms=ms, tokens_used=10, timestamp=noon))
+            session.add(ProviderUsage(
+                provider_type="llm", provider_name="gemini", success=False,
+                timestamp=noon))
+            session.add(ProviderUsage(
+                provider_type="llm", provider_name="gemini",
+                response_time_ms=999, timestamp=noon + timedelta(days=1)))
+            await session.flush()
+
+            repo = UsageRepository(session)
+            await repo.rollup_day(day)
+            written = await repo.rollup_day(day)
+            rollup = (await session.execute(select(ProviderUsageDaily))).scalars().all()
+
+        assert written == 1
+        assert len(rollup) == 1
+        assert (rollup[0].request_count, rollup[0].error_count) == (5, 1)
+        assert rollup[0].tokens_used == 40
+        assert rollup[0].avg_response_time_ms == 250
+        assert (rollup[0].p50_response_time_ms, rollup[0].p95_response_time_ms) == (200, 400)
+
+    @pytest.mark.asyncio
+    async def test_get_stats_reads_hourly_rollup(self, session_factory):
+        """Test recorded usage is folded into hourly buckets for get_stats."""
+        async with session_factory() as session:
+            repo = UsageRepository(session)
+            await repo.record("llm", "gemini", tokens_used=10, response_time_ms=100)
+            await repo.record("llm", "gemini", tokens_used=5, success=False)
+            await repo.record_many([{
+                "provider_type": "llm", "provider_name": "gemini",
+                "tokens_used": 1, "response_time_ms": 300, "success": True,
+                "timestamp": datetime(2020, 1, 1, 9, 30)
+            }])
+            await repo.record("search", "google", response_time_ms=50)
+
+            stats = await repo.get_stats(provider_type="llm", provider_name="gemini")
+            recent = await repo.get_stats(
+                provider_name="gemini", since=datetime(2021, 1, 1))
+            buckets = (await session.execute(
+                select(func.count()).select_from(ProviderUsageHourly))).scalar()
+
+        assert stats == {"total_requests": 3, "total_tokens": 16,
+                         "avg_response_time_ms": 200.0, "error_count": 1}
+        assert (recent["total_requests"], recent["avg_response_time_ms"]) == (2, 100.0)
+        assert buckets == 3
+
+
+class TestMessageStreaming:
+    """Tests for streaming conversation messages."""
+
+    @pytest.mark.asyncio
+    async def test_stream_messages_in_order(self, session_factory):
+        """Test messages are streamed in order and never lazy-loaded."""
+        conversation_id = str(uuid.uuid4())
+        async with session_factory() as session:
+            session.add(Conversation(id=conversation_id))
+            repo = MessageRepository(session)
+            for n in range(3):
+                await repo.add(conversation_id, "user", f"m{n}")
+            await session.commit()
+
+        async with session_factory() as session:
+            repo = MessageRepository(session)
+            contents = [m.content async for m in repo.stream_messages(conversation_id)]
+            conversation = await session.get(Conversation, conversation_id)
+
+            assert contents == ["m0", "m1", "m2"]
+            with pytest.raises(InvalidRequestError):
+                conversation.messages
+
+    @pytest.mark.asyncio
+    async def test_focused_conversation_loaders(self, session_factory):
+        """Test get_meta loads no collections and get_with_messages loads messages."""
+        conversation_id = str(uuid.uuid4())
+        async with session_factory() as session:
+            session.add(Conversation(id=conversation_id))
+            await MessageRepository(session).add(conversation_id, "user", "hi")
+            await session.commit()
+
+        async with session_factory() as session:
+            meta = await ConversationRepository(session).get_meta(conversation_id)
+            with pytest.raises(InvalidRequestError):
+                meta.investors
+
+        async with session_factory() as session:
+            full = await ConversationRepository(session).get_with_messages(conversation_id)
+
+            assert [m.content for m in full.messages] == ["hi"]
+
+
+class TestDatabaseManager:
+    """Tests for DatabaseManager lifecycle."""
+
+    @pytest.mark.asyncio
+    async def test_instances_are_independent(self):
+        """Test each manager owns its own engine and must be initialized."""
+        manager = DatabaseManager(Settings(database_url="sqlite+aiosqlite://"))
+
+        assert manager is not DatabaseManager()
+        with pytest.raises(RuntimeError):
+            await manager.create_tables()
+
+        await manager.initialize()
+        await manager.create_tables()
+
+        assert manager.read_session_factory is manager.session_factory
+
+        await manager.close()
+        assert manager.engine is None
+
+    def test_ensure_sqlite_dir(self, tmp_path):
+        """Test the database directory is created for file URLs only."""
+        db_dir = tmp_path / "nested" / "data"
+
+        _ensure_sqlite_dir(f"sqlite+aiosqlite:///{db_dir}/app.db")
+        _ensure_sqlite_dir("sqlite+aiosqlite:///:memory:")
+        _ensure_sqlite_dir("sqlite+aiosqlite://")
+
+        assert db_dir.is_dir()
+
+
+class TestSearchResultInsert:
+    """Tests for idempotent search result inserts."""
+
+    @pytest.mark.asyncio
+    async def test_duplicate_urls_ignored_per_conversation(self, session_factory):
+        """Test re-adding a URL to a conversation doesn't duplicate it."""
+        conversation_id = str(uuid.uuid4())
+        async with session_factory() as session:
+            session.add(Conversation(id=conversation_id))
+            repo = SearchResultRepository(session)
+            await repo.add_many(conversation_id, [
+                SearchResult(title="A", url="https://a.com", snippet="a")])
+            await repo.add_many(conversation_id, [
+                SearchResult(title="A", url="https://a.com", snippet="a"),
+                SearchResult(title="B", url="https://b.com", snippet="b")])
+            records = await repo.get_for_conversation(conversation_id)
+
+        assert sorted(r.url for r in records) == ["https://a.com", "https://b.com"]
+
+
+    @pytest.mark.asyncio
+    async def test_large_batches_copied_through_staging_table(self):
+        """Test asyncpg batches are staged with only the copied columns."""
+        from types import SimpleNamespace
+
+        statements, copies = [], []
+
+        class FakeDriver:
+            async def copy_records_to_table(self, table, records, columns):
+                copies.append((table, records, columns))
+
+        class FakeConnection:
+            async def exec_driver_sql(self, sql):
+                statements.append(sql)
+
+            async def get_raw_connection(self):
+                return SimpleNamespace(driver_connection=FakeDriver())
+
+        class FakeSession:
+            def get_bind(self):
+                return SimpleNamespace(dialect=SimpleNamespace(driver="asyncpg"))
+
+            async def connection(self):
+                return FakeConnection()
+
+        results = [SearchResult(title=f"R{n}", url=f"https://r{n}.com", snippet="s")
+                   for n in range(COPY_THRESHOLD)]
+        await SearchResultRepository(FakeSession()).add_many("c1", results)
+
+        cols = "conversation_id, title, url, snippet"
+        assert statements == [
+            "CREATE TEMP TABLE IF NOT EXISTS _stage_search_results "
+            f"ON COMMIT DELETE ROWS AS SELECT {cols} FROM search_results WITH NO DATA",
+            "TRUNCATE _stage_search_results",
+            f"INSERT INTO search_results ({cols}) SELECT {cols} "
+            "FROM _stage_search_results ON CONFLICT (conversation_id, url) DO NOTHING",
+        ]
+        [(table, records, columns)] = copies
+        assert table == "_stage_search_results"
+        assert columns == cols.split(", ")
+        assert records[0] == ("c1", "R0", "https://r0.com", compress_text("s"))
+        assert len(records) == COPY_THRESHOLD
+
+
+class TestConversationInvestorLinks:
+    """Tests for batched conversation investor links."""
+
+    @pytest.mark.asyncio
+    async def test_links_added_once_and_keep_first_page(self, session_factory):
+        """Test a page is linked in one go and re-found investors keep their page."""
+        conversation_id = str(uuid.uuid4())
+        async with session_factory() as session:
+            session.add(Conversation(id=conversation_id))
+            repo = InvestorRepository(session)
+            ann, bob, cat = await repo.get_or_create_many([
+                InvestorProfile(name=name) for name in ("Ann", "Bob", "Cat")])
+
+            await repo.add_many_to_conversation(
+                conversation_id, [ann.id, bob.id, ann.id], page_number=0)
+            await repo.add_many_to_conversation(
+                conversation_id, [bob.id, cat.id], page_number=1)
+
+            first_page = await repo.get_for_conversation(conversation_id, page=0)
+            second_page = await repo.get_for_conversation(conversation_id, page=1)
+
+        assert sorted(i.name for i in first_page) == ["Ann", "Bob"]
+        assert [i.name for i in second_page] == ["Cat"]
+
+
+class TestInvestorProfiles:
+    """Tests for the split-out investor profile table."""
+
+    @pytest.mark.asyncio
+    async def test_bio_stored_in_profile_table(self, session_factory):
+        """Test bios are written to investor_profiles, not investors."""
+        async with session_factory() as session:
+            repo = InvestorRepository(session)
+            await repo.create(InvestorProfile(name="Ann", bio="Seed investor"))
+            await repo.bulk_upsert([InvestorProfile(
+                name="Bob", bio="Series A", linkedin_url="https://linkedin.com/in/bob")])
+            await repo.bulk_upsert([InvestorProfile(name="Cy")])
+            bios = (await session.execute(
+                select(InvestorProfileRecord.bio)
+                .order_by(InvestorProfileRecord.investor_id))).scalars().all()
+
+        assert bios == ["Seed investor", "Series A"]
+
+
+class TestUsageSink:
+    """Tests for background usage writes."""
+
+    @pytest.mark.asyncio
+    async def test_rows_written_in_batches(self, session_factory):
+        """Test queued rows are written by the background task on flush."""
+        sink = UsageSink(batch_size=2, flush_interval=10)
+        sink.record("llm", "dropped")
+        sink.start(session_factory)
+        for n in range(3):
+            sink.record("llm", "gemini", tokens_used=n)
+        await sink.flush()
+        await sink.stop()
+
+        async with session_factory() as session:
+            tokens = (await session.execute(
+                select(ProviderUsage.tokens_used)
+                .order_by(ProviderUsage.id))).scalars().all()
+
+        assert tokens == [0, 1, 2]
+        assert not sink.running
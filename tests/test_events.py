@@ -0,0 +1,275 @@
+"""
+Unit tests for the EventBus.
+"""
+
+from app.core.events import EventBus, Event, EventType, _is_coroutine_handler
+import asyncio
+import json
+import sys
+from pathlib import Path
+import pytest
+
+# Ensure project root is on path
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+
+class TestEventBusPublish:
+    """Tests for event publishing and dispatch."""
+
+    def setup_method(self):
+        """Reset the event bus before each test."""
+        self.bus = EventBus()
+        self.bus.clear()
+
+    def teardown_method(self):
+        """Clear handlers after each test."""
+        self.bus.clear()
+
+    @pytest.mark.asyncio
+    async def test_sync_and_async_handlers_called(self):
+        """Test both handler kinds receive the event."""
+        received = []
+
+        def sync_handler(event):
+            received.append(("sync", event.type))
+
+        async def async_handler(event):
+            received.append(("async", event.type))
+
+        self.bus.subscribe(EventType.SEARCH_STARTED, sync_handler)
+        self.bus.subscribe(EventType.SEARCH_STARTED, async_handler)
+
+        await self.bus.publish(Event(type=EventType.SEARCH_STARTED))
+
+        assert ("sync", EventType.SEARCH_STARTED) in received
+        assert ("async", EventType.SEARCH_STARTED) in received
+
+    @pytest.mark.asyncio
+    async def test_nested_publish_is_drained_in_order(self):
+        """Test events published from a handler run after the current one."""
+        order = []
+
+        async def on_search(event):
+            order.append("search.start")
+            await self.bus.publish(Event(type=EventType.SCRAPE_STARTED))
+            order.append("search.end")
+
+        async def on_scrape(event):
+            order.append("scrape")
+
+        self.bus.subscribe(EventType.SEARCH_STARTED, on_search)
+        self.bus.subscribe(EventType.SCRAPE_STARTED, on_scrape)
+
+        await self.bus.publish(Event(type=EventType.SEARCH_STARTED))
+
+        assert order == ["search.start", "search.end", "scrape"]
+
+    @pytest.mark.asyncio
+    async def test_handler_error_does_not_stop_dispatch(self):
+        """Test a failing handler doesn't block the others."""
+        received = []
+
+        def failing(event):
+            raise RuntimeError("boom")
+
+        async def ok(event):
+            received.append(event.type)
+
+        self.bus.subscribe(EventType.INVESTOR_FOUND, failing)
+        self.bus.subscribe(EventType.INVESTOR_FOUND, ok)
+
+        await self.bus.publish(Event(type=EventType.INVESTOR_FOUND))
+        await self.bus.publish(Event(type=EventType.INVESTOR_FOUND))
+
+        assert received == [EventType.INVESTOR_FOUND] * 2
+
+    @pytest.mark.asyncio
+    async def test_unsubscribe(self):
+        """Test unsubscribed handlers are no longer called."""
+        received = []
+
+        def handler(event):
+            received.append(event)
+
+        self.bus.subscribe(EventType.SEARCH_COMPLETED, handler)
+        self.bus.unsubscribe(EventType.SEARCH_COMPLETED, handler)
+
+        await self.bus.publish(Event(type=EventType.SEARCH_COMPLETED))
+
+        assert received == []
+
+    def test_subscribe_unknown_type(self):
+        """Test subscribing to an unknown event type fails."""
+        with pytest.raises(ValueError):
+            self.bus.subscribe("not.an.event", lambda event: None)
+
+    @pytest.mark.asyncio
+    async def test_handlers_called_in_subscription_order(self):
+        """Test handlers run in order and a duplicate subscribe is ignored."""
+        order = []
+
+        def first(event):
+            order.append("first")
+
+        def second(event):
+            order.append("second")
+
+        self.bus.subscribe(EventType.SEARCH_FAILED, first)
+        self.bus.subscribe(EventType.SEARCH_FAILED, second)
+        self.bus.subscribe(EventType.SEARCH_FAILED, first)
+
+        await self.bus.publish(Event(type=EventType.SEARCH_FAILED))
+
+        assert order == ["first", "second"]
+
+    @pytest.mark.asyncio
+    async def test_publish_without_subscribers_is_noop(self):
+        """Test events with no subscribers are dropped before queueing."""
+        received = []
+        self.bus.subscribe(EventType.SEARCH_FAILED, received.append)
+
+        await self.bus.publish(Event(type=EventType.RATE_LIMIT_EXCEEDED))
+
+        assert received == []
+
+    @pytest.mark.asyncio
+    async def test_concurrent_publishers_drain_independently(self):
+        """Test a slow handler in one call chain doesn't defer another's events."""
+        release = asyncio.Event()
+        received = []
+
+        async def slow(event):
+            await release.wait()
+
+        def fast(event):
+            received.append(event.type)
+
+        self.bus.subscribe(EventType.SEARCH_STARTED, slow)
+        self.bus.subscribe(EventType.SEARCH_COMPLETED, fast)
+
+        first = asyncio.ensure_future(
+            self.bus.publish(Event(type=EventType.SEARCH_STARTED)))
+        await asyncio.sleep(0)
+        await self.bus.publish(Event(type=EventType.SEARCH_COMPLETED))
+
+        assert received == [EventType.SEARCH_COMPLETED]
+        assert not first.done()
+        release.set()
+        await first
+
+    @pytest.mark.asyncio
+    async def test_publish_from_task_outliving_drain(self):
+        """Test a task spawned by a handler still delivers after the drain ends."""
+        received = []
+        spawned = []
+
+        async def on_search(event):
+            async def later():
+                await asyncio.sleep(0)
+                await self.bus.publish(Event(type=EventType.SCRAPE_COMPLETED))
+            spawned.append(asyncio.ensure_future(later()))
+
+        self.bus.subscribe(EventType.SEARCH_STARTED, on_search)
+        self.bus.subscribe(EventType.SCRAPE_COMPLETED, received.append)
+
+        await self.bus.publish(Event(type=EventType.SEARCH_STARTED))
+        await spawned[0]
+
+        assert [e.type for e in received] == [EventType.SCRAPE_COMPLETED]
+
+
+class TestEventBusBackground:
+    """Tests for background delivery via publish_nowait."""
+
+    def setup_method(self):
+        """Reset the event bus before each test."""
+        self.bus = EventBus()
+        self.bus.clear()
+
+    def teardown_method(self):
+        """Clear handlers and stop the worker after each test."""
+        self.bus.clear()
+
+    @pytest.mark.asyncio
+    async def test_publish_nowait_delivers_in_background(self):
+        """Test events are delivered by the worker in order."""
+        received = []
+
+        async def handler(event):
+            received.append(event.data["n"])
+
+        self.bus.subscribe(EventType.INVESTOR_FOUND, handler)
+
+        for n in range(3):
+            self.bus.publish_nowait(
+                Event(type=EventType.INVESTOR_FOUND, data={"n": n}))
+        assert received == []
+
+        await self.bus.flush()
+
+        assert received == [0, 1, 2]
+
+    @pytest.mark.asyncio
+    async def test_conflatable_events_keep_latest(self):
+        """Test pending progress events collapse to the newest one."""
+        received = []
+
+        def handler(event):
+            received.append(event.data["n"])
+
+        self.bus.subscribe(EventType.SCRAPE_STARTED, handler)
+
+        for n in range(5):
+            self.bus.publish_nowait(
+                Event(type=EventType.SCRAPE_STARTED, data={"n": n}))
+        await self.bus.flush()
+
+        assert received == [4]
+
+
+class TestHandlerClassification:
+    """Tests for async handler detection."""
+
+    def test_functions_and_bound_methods(self):
+        """Test plain functions and bound methods are classified correctly."""
+        def sync_handler(event):
+            pass
+
+        async def async_handler(event):
+            pass
+
+        class Listener:
+            async def on_event(self, event):
+                pass
+
+        listener = Listener()
+
+        assert not _is_coroutine_handler(sync_handler)
+        assert _is_coroutine_handler(async_handler)
+        assert _is_coroutine_handler(listener.on_event)
+        # Cached result is reused on the second lookup
+        assert _is_coroutine_handler(listener.on_event)
+
+    def test_non_weakrefable_handler(self):
+        """Test handlers that can't be weak-referenced still work."""
+        assert not _is_coroutine_handler(print)
+
+
+class TestEvent:
+    """Tests for the Event dataclass."""
+
+    def test_timestamp_derived_from_ns(self):
+        """Test timestamp and to_dict are formatted from timestamp_ns."""
+        event = Event(type=EventType.SEARCH_STARTED, timestamp_ns=1_700_000_000_000_000_000)
+
+        assert event.timestamp.year == 2023
+        assert event.to_dict()["timestamp"] == "2023-11-14T22:13:20+00:00"
+
+    def test_to_json(self):
+        """Test JSON encoding matches to_dict."""
+        event = Event(type=EventType.INVESTOR_FOUND, data={"name": "Jane"},
+                      source="test")
+
+        assert json.loads(event.to_json()) == event.to_dict()
@@ -0,0 +1,44 @@
+"""
+Unit tests for application exceptions.
+"""
+
+from app.core.exceptions import AppException, LLMProviderError, SearchProviderError
+import sys
+from pathlib import Path
+
+# Ensure project root is on path
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+
+class TestAppException:
+    """Tests for exception details."""
+
+    def test_details_merge_context_first(self):
+        """Test caller details are merged over the subclass context."""
+        error = SearchProviderError(
+            "failed", provider="google", query="vc",
+            details={"query": "override", "status": 429})
+
+        assert error.details == {
+            "provider": "google", "query": "override", "status": 429}
+
+    def test_to_dict(self):
+        """Test API serialization includes code and details."""
+        error = LLMProviderError("boom", provider="gemini")
+
+        assert error.to_dict() == {
+            "error": {
+                "code": "LLM_PROVIDER_ERROR",
+                "message": "boom",
+                "details": {"provider": "gemini"}
+            }
+        }
+
+    def test_empty_details(self):
+        """Test base exception without details exposes an empty dict."""
+        error = AppException("plain")
+
+        assert error.details == {}
+        assert str(error) == "plain"
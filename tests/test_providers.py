@@ -0,0 +1,950 @@
+"""
+Unit tests for the provider registry and factory functions.
+"""
+
+from app.core import providers
+from app.core.protocols import LLMConfig, ProviderMixin
+from app.core.providers import Registry, LLMCache, MemoryCacheBackend
+from app.models.schemas import ChatMessage, MessageRole
+import asyncio
+import sys
+from pathlib import Path
+import pytest
+
+# Ensure project root is on path
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+
+class DummyProvider:
+    """Minimal provider used for registry tests."""
+
+    def __init__(self, *args, **kwargs):
+        self.cleaned_up = False
+
+    async def cleanup(self) -> None:
+        self.cleaned_up = True
+
+
+class TestRegistry:
+    """Tests for Registry lookups."""
+
+    def setup_method(self):
+        """Create a fresh registry for each test."""
+        self.registry = Registry()
+
+    def test_register_and_get_class_case_insensitive(self):
+        """Test names are matched case-insensitively."""
+        self.registry.register("llm", "Dummy", DummyProvider)
+
+        assert self.registry.get_class("llm", "dummy") is DummyProvider
+        assert self.registry.get_class("llm", "DUMMY") is DummyProvider
+        assert self.registry.get_class("search", "dummy") is None
+
+    def test_register_unknown_type(self):
+        """Test registering an unknown provider type fails."""
+        with pytest.raises(ValueError):
+            self.registry.register("storage", "dummy", DummyProvider)
+
+    def test_list_providers_by_type(self):
+        """Test listing only returns providers of the requested type."""
+        self.registry.register("llm", "a", DummyProvider)
+        self.registry.register("search", "b", DummyProvider)
+
+        assert self.registry.list_providers("llm") == ["a"]
+        assert self.registry.list_providers("search") == ["b"]
+        assert self.registry.list_providers("scraper") == []
+
+    def test_register_records_lifecycle_caps(self):
+        """Test lifecycle methods are detected once at registration."""
+        class Plain:
+            pass
+
+        self.registry.register("llm", "dummy", DummyProvider)
+        self.registry.register("llm", "plain", Plain)
+
+        assert DummyProvider._provider_caps == providers.CAP_CLEANUP
+        assert Plain._provider_caps == 0
+
+    def test_lazy_registration_imports_on_first_lookup(self):
+        """Test lazily registered providers are listed and resolved on demand."""
+        self.registry.register_lazy(
+            "search", "lazy", f"{__name__}:DummyProvider")
+
+        assert self.registry.list_providers("search") == ["lazy"]
+        assert self.registry.get_class("search", "lazy") is DummyProvider
+        assert self.registry.list_providers("search") == ["lazy"]
+
+    @pytest.mark.asyncio
+    async def test_cleanup_all(self):
+        """Test cleanup runs on cached instances and clears them."""
+        instance = DummyProvider()
+        self.registry.set_instance("scraper", "dummy", instance)
+
+        await self.registry.cleanup_all()
+
+        assert instance.cleaned_up
+        assert self.registry.get_instance("scraper", "dummy") is None
+
+    @pytest.mark.asyncio
+    async def test_cleanup_all_continues_after_failure(self):
+        """Test one failing cleanup doesn't skip the other instances."""
+        class Broken:
+            async def cleanup(self) -> None:
+                raise RuntimeError("boom")
+
+        healthy = DummyProvider()
+        self.registry.set_instance("llm", "broken", Broken())
+        self.registry.set_instance("search", "dummy", healthy)
+
+        await self.registry.cleanup_all()
+
+        assert healthy.cleaned_up
+        assert self.registry.get_instance("llm", "broken") is None
+
+
+class TestProviderMixin:
+    """Tests for ProviderMixin usage tracking."""
+
+    def test_record_request_throttles_last_used(self):
+        """Test request_count always increments but last_used is refreshed lazily."""
+        mixin = ProviderMixin()
+
+        mixin.record_request()
+        first = mixin.state.last_used
+        mixin.record_request()
+
+        assert mixin.state.request_count == 2
+        assert first is not None
+        assert mixin.state.last_used is first
+
+
+class TestFactoryFunctions:
+    """Tests for cached provider creation."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_get_llm_initializes_once(self, monkeypatch):
+        """Test concurrent first calls share one initialized instance."""
+        created = []
+
+        class SlowProvider:
+            def __init__(self, config):
+                created.append(self)
+
+            async def initialize(self) -> None:
+                await asyncio.sleep(0.01)
+
+        test_registry = Registry()
+        test_registry.register("llm", "slow", SlowProvider)
+        monkeypatch.setattr(providers, "registry", test_registry)
+
+        config = LLMConfig(model_name="m")
+        results = await asyncio.gather(
+            *(providers.get_llm("slow", config) for _ in range(5)))
+
+        assert len(created) == 1
+        assert all(r is created[0] for r in results)
+
+    @pytest.mark.asyncio
+    async def test_get_llm_injects_shared_http_client(self, monkeypatch):
+        """Test LLM providers receive the registry's pooled HTTP client."""
+        class ClientAwareLLM:
+            def __init__(self, config):
+                self.config = config
+
+        test_registry = Registry()
+        test_registry.register("llm", "aware", ClientAwareLLM)
+        monkeypatch.setattr(providers, "registry", test_registry)
+
+        llm = await providers.get_llm("aware", LLMConfig(model_name="m"))
+        client = llm.config.extra_params["http_client"]
+
+        assert client is test_registry.http_client
+        await test_registry.cleanup_all()
+        assert client.is_closed
+
+
+class CountingLLM:
+    """Fake deterministic LLM that counts calls."""
+
+    name = "counting"
+
+    def __init__(self):
+        self.config = LLMConfig(model_name="m", temperature=0)
+        self.calls = 0
+
+    async def generate_response(self, messages, context=None) -> str:
+        self.calls += 1
+        return f"reply {self.calls}"
+
+
+class TestGenerateBatch:
+    """Tests for default batch inference."""
+
+    @pytest.mark.asyncio
+    async def test_generate_batch_preserves_order_and_bounds_concurrency(self):
+        """Test results follow input order and in-flight calls are capped."""
+        class EchoLLM(ProviderMixin):
+            def __init__(self):
+                super().__init__()
+                self.config = LLMConfig(
+                    model_name="m", extra_params={"max_concurrency": 2})
+                self.in_flight = 0
+                self.peak = 0
+
+            async def generate_response(self, messages, context=None) -> str:
+                self.in_flight += 1
+                self.peak = max(self.peak, self.in_flight)
+                await asyncio.sleep(0.01)
+                self.in_flight -= 1
+                return messages[0].content
+
+        llm = EchoLLM()
+        batches = [[ChatMessage(role=MessageRole.USER, content=str(i))]
+                   for i in range(6)]
+
+        results = await llm.generate_batch(batches)
+
+        assert results == ["0", "1", "2", "3", "4", "5"]
+        assert llm.peak == 2
+
+    @pytest.mark.asyncio
+    async def test_cached_batch_uses_cache(self):
+        """Test batch calls through LLMCache reuse cached responses."""
+        llm = CountingLLM()
+        cached = LLMCache(llm, MemoryCacheBackend())
+        messages = [ChatMessage(role=MessageRole.USER, content="same")]
+
+        results = await cached.generate_batch([messages])
+        results += await cached.generate_batch([messages])
+
+        assert results == ["reply 1", "reply 1"]
+        assert llm.calls == 1
+
+    @pytest.mark.asyncio
+    async def test_openai_batch_overlaps_conversations(self):
+        """Test OpenAI batch requests run together and failures stay in place."""
+        from app.core.exceptions import LLMProviderError
+        from app.providers.llm.openai_provider import OpenAIProvider
+
+        state = {"in_flight": 0, "peak": 0}
+
+        class FakeCompletions:
+            async def create(self, model, messages, **kwargs):
+                state["in_flight"] += 1
+                state["peak"] = max(state["peak"], state["in_flight"])
+                await asyncio.sleep(0.01)
+                state["in_flight"] -= 1
+                content = messages[-1]["content"]
+                if content == "fail":
+                    raise RuntimeError("rate limited")
+                message = type("Message", (), {"content": content.upper()})
+                return type("Response", (), {
+                    "choices": [type("Choice", (), {"message": message})]})
+
+        llm = OpenAIProvider(LLMConfig(
+            model_name="gpt-4", extra_params={"max_concurrency": 3}))
+        llm._client = type("Client", (), {"chat": type(
+            "Chat", (), {"completions": FakeCompletions()})})
+        llm._initialized = True
+        requests = [([ChatMessage(role=MessageRole.USER, content=text)],
+                     {"conversation_id": text})
+                    for text in ("a", "fail", "b", "c", "d")]
+
+        results = await llm.generate_responses_batch(requests)
+
+        assert [r if isinstance(r, str) else "error" for r in results] == [
+            "A", "error", "B", "C", "D"]
+        assert isinstance(results[1], LLMProviderError)
+        assert state["peak"] == 3
+
+    def test_openai_client_shared_across_instances(self, monkeypatch):
+        """Test instances share one SDK client per key until the pool changes."""
+        from app.providers.llm.openai_provider import OpenAIProvider
+
+        class FakeClient:
+            def __init__(self, **kwargs):
+                self.kwargs = kwargs
+
+        monkeypatch.setattr(OpenAIProvider, "_clients", {})
+        pool = object()
+
+        first = OpenAIProvider._shared_client(FakeClient, "sk-a", pool)
+        second = OpenAIProvider._shared_client(FakeClient, "sk-a", pool)
+        other = OpenAIProvider._shared_client(FakeClient, "sk-b", pool)
+        # A new pool (e.g. after cleanup_all) replaces the old client
+        replaced = OpenAIProvider._shared_client(FakeClient, "sk-a", object())
+
+        assert first is second
+        assert other is not first
+        assert first.kwargs["http_client"] is pool
+        assert first.kwargs["max_retries"] == 2
+        assert replaced is not first
+        assert len(OpenAIProvider._clients) == 2
+
+    def test_openai_system_content_cached_per_conversation(self, monkeypatch):
+        """Test the system message is rebuilt only when its inputs change."""
+        from app.models import InvestorProfile
+        from app.providers.llm.openai_provider import OpenAIProvider
+
+        llm = OpenAIProvider(LLMConfig(model_name="gpt-4"))
+        jane = InvestorProfile(name="Jane Doe", company="Acme")
+        context = {"conversation_id": "c1", "investors": [jane]}
+        messages = [ChatMessage(role=MessageRole.USER, content="hi")]
+
+        first = llm._build_messages(messages, context)[0]["content"]
+        monkeypatch.setattr(llm, "DEFAULT_SYSTEM_PROMPT", "changed")
+        again = llm._build_messages(messages, dict(context))[0]["content"]
+        other = llm._build_messages(
+            messages, {**context, "investors": [jane, jane]})[0]["content"]
+
+        assert again is first
+        assert first.endswith("Investors found:\n- Jane Doe at Acme")
+        assert other.startswith("changed")
+
+
+class TestLLMCache:
+    """Tests for the deterministic LLM response cache."""
+
+    @pytest.mark.asyncio
+    async def test_repeated_prompt_served_from_cache(self):
+        """Test identical prompts only hit the provider once."""
+        llm = CountingLLM()
+        cached = LLMCache(llm, MemoryCacheBackend())
+        messages = [ChatMessage(role=MessageRole.USER, content="hi")]
+
+        first = await cached.generate_response(messages)
+        second = await cached.generate_response(messages)
+
+        assert first == second == "reply 1"
+        assert llm.calls == 1
+        assert cached.name == "counting"
+
+    @pytest.mark.asyncio
+    async def test_different_prompt_misses(self):
+        """Test a different prompt produces a new response."""
+        llm = CountingLLM()
+        cached = LLMCache(llm, MemoryCacheBackend())
+
+        await cached.generate_response(
+            [ChatMessage(role=MessageRole.USER, content="a")])
+        await cached.generate_response(
+            [ChatMessage(role=MessageRole.USER, content="b")])
+
+        assert llm.calls == 2
+
+    @pytest.mark.asyncio
+    async def test_key_ignores_profile_timestamps(self):
+        """Test the same investors map to one key across requests."""
+        from datetime import datetime
+        from app.models import InvestorProfile
+
+        llm = CountingLLM()
+        cached = LLMCache(llm, MemoryCacheBackend())
+        messages = [ChatMessage(role=MessageRole.USER, content="hi")]
+
+        for year in (2024, 2025):
+            jane = InvestorProfile(name="Jane", created_at=datetime(year, 1, 1))
+            await cached.generate_response(messages, {"investors": [jane]})
+        await cached.generate_response(
+            messages, {"investors": [InvestorProfile(name="Joe")]})
+
+        assert llm.calls == 2
+
+    @pytest.mark.asyncio
+    async def test_memory_backend_evicts_least_recently_used(self):
+        """Test the memory backend keeps at most max_entries values."""
+        backend = MemoryCacheBackend(max_entries=2)
+
+        await backend.set("a", "1")
+        await backend.set("b", "2")
+        await backend.get("a")
+        await backend.set("c", "3")
+
+        assert [await backend.get(k) for k in ("a", "b", "c")] == ["1", None, "3"]
+
+    def test_sdk_providers_keyed_by_name(self):
+        """Test OpenAI and Anthropic expose the name used in cache keys."""
+        from app.providers.llm.anthropic import AnthropicProvider
+        from app.providers.llm.openai_provider import OpenAIProvider
+
+        for cls, name in ((OpenAIProvider, "openai"),
+                          (AnthropicProvider, "anthropic")):
+            llm = cls(LLMConfig(model_name="m", temperature=0))
+            key = LLMCache(llm, MemoryCacheBackend()).cache_key([])
+
+            assert llm.name == llm.provider_name == name
+            assert key != LLMCache(CountingLLM(), MemoryCacheBackend()).cache_key([])
+
+    @pytest.mark.asyncio
+    async def test_get_llm_keys_instances_by_temperature(self, monkeypatch):
+        """Test cached and uncached configs of one model get separate instances."""
+        test_registry = Registry()
+        test_registry.register("llm", "counting", lambda config: CountingLLM())
+        monkeypatch.setattr(providers, "registry", test_registry)
+
+        deterministic = await providers.get_llm(
+            "counting", LLMConfig(model_name="m", temperature=0))
+        creative = await providers.get_llm("counting", LLMConfig(model_name="m"))
+
+        await test_registry.cleanup_all()
+
+        assert isinstance(deterministic, LLMCache)
+        assert not isinstance(creative, LLMCache)
+
+
+class TestWarmup:
+    """Tests for startup provider warmup."""
+
+    @pytest.mark.asyncio
+    async def test_warmup_caches_providers_and_swallows_errors(self, monkeypatch):
+        """Test warmup creates configured providers and tolerates failures."""
+        from app.config import Settings
+
+        class WarmLLM:
+            def __init__(self, config):
+                self.config = config
+
+        class BrokenSearch:
+            def __init__(self):
+                raise RuntimeError("no api key")
+
+        test_registry = Registry()
+        test_registry.register("llm", "gemini", WarmLLM)
+        test_registry.register("search", "google", BrokenSearch)
+        monkeypatch.setattr(providers, "registry", test_registry)
+        monkeypatch.setattr(
+            providers, "get_available_llm_providers", lambda: ["gemini"])
+
+        settings = Settings(gemini_model="gemini-test")
+        await providers.warmup(settings)
+
+        assert test_registry.get_instance("llm", "gemini:gemini-test:0.7") is not None
+        assert test_registry.get_instance("search", "google") is None
+
+
+class TestGoogleSearch:
+    """Tests for the Google search provider's HTTP calls."""
+
+    @pytest.mark.asyncio
+    async def test_google_search_uses_provider_client(self):
+        """Test search requests go through the provider's own client."""
+        import httpx
+        from app.providers.search.google import GoogleSearchProvider
+
+        seen = []
+
+        def handler(request):
+            seen.append(request.url.params["q"])
+            return httpx.Response(200, json={"items": [
+                {"title": "Fund", "link": "https://x", "snippet": "vc"}]})
+
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        search = GoogleSearchProvider()
+        search._client = client
+        search._api_key, search._search_engine_id = "key", "cx"
+
+        results = await search.search("ai investors")
+        await client.aclose()
+
+        assert seen == ["ai investors"]
+        assert [r.title for r in results] == ["Fund"]
+
+    @pytest.mark.asyncio
+    async def test_overloaded_search_backs_off_and_retries(self):
+        """Test a 429 halves the limit, honours Retry-After and is retried."""
+        import time
+        import httpx
+        from app.providers.search.google import GoogleSearchProvider, _AdaptiveLimit
+
+        responses = [
+            httpx.Response(429, headers={"Retry-After": "0.05"}),
+            httpx.Response(200, json={"items": [
+                {"title": "Fund", "link": "https://x", "snippet": ""}]}),
+        ]
+        client = httpx.AsyncClient(transport=httpx.MockTransport(
+            lambda request: responses.pop(0)))
+        search = GoogleSearchProvider()
+        search._client = client
+        search._api_key, search._search_engine_id = "key", "cx"
+        search._limit = _AdaptiveLimit(4)
+
+        started = time.monotonic()
+        results = await search.search("ai investors")
+        elapsed = time.monotonic() - started
+        await client.aclose()
+
+        assert [r.title for r in results] == ["Fund"]
+        assert elapsed >= 0.05
+        assert search._limit.limit == 2.5
+
+    @pytest.mark.asyncio
+    async def test_fetch_page_content_strips_page_chrome(self):
+        """Test scripts, styles, nav, footer and comments are dropped."""
+        import httpx
+        from app.providers.search.google import GoogleSearchProvider
+
+        html = (b"<html><head><style>.a{}</style><script>var x</script></head>"
+                b"<body><nav>menu</nav><!-- note --><p>Hello <b>world</b></p>"
+                b"<p>Second</p>tail<footer>footer</footer> end</body></html>")
+        client = httpx.AsyncClient(transport=httpx.MockTransport(
+            lambda request: httpx.Response(200, content=html)))
+        search = GoogleSearchProvider()
+        search._client = client
+
+        text = await search.fetch_page_content("https://x")
+        await client.aclose()
+
+        assert text == "Hello world Second tail end"
+
+    @pytest.mark.asyncio
+    async def test_investor_queries_run_concurrently_in_order(self):
+        """Test queries overlap up to the limit and merge in query order."""
+        import httpx
+        from app.providers.search.google import GoogleSearchProvider, _AdaptiveLimit
+
+        state = {"active": 0, "peak": 0, "calls": 0}
+
+        async def handler(request):
+            state["active"] += 1
+            state["calls"] += 1
+            state["peak"] = max(state["peak"], state["active"])
+            await asyncio.sleep(0.01)
+            state["active"] -= 1
+            q = request.url.params["q"]
+            return httpx.Response(200, json={"items": [
+                {"title": q, "link": f"https://x/{hash(q)}", "snippet": ""}]})
+
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        search = GoogleSearchProvider()
+        search._client = client
+        search._api_key, search._search_engine_id = "key", "cx"
+        search._limit = _AdaptiveLimit(3)
+
+        everything = await search.search_investors(["ai"], num_results=30)
+        calls_for_all = state["calls"]
+        first_two = await search.search_investors(["ai"], num_results=2)
+        await client.aclose()
+
+        assert state["peak"] == 3
+        assert len(everything) == calls_for_all == 11
+        assert [r.title for r in first_two] == [r.title for r in everything[:2]]
+        assert state["calls"] - calls_for_all < 11
+
+
+class TestLinkedInParsing:
+    """Tests for LinkedIn text extraction helpers."""
+
+    def test_can_handle_profile_and_company_urls(self):
+        """Test only LinkedIn profile and company URLs are handled."""
+        from app.providers.scraper.linkedin import LinkedInScraperProvider
+
+        scraper = LinkedInScraperProvider()
+
+        assert scraper.can_handle("https://www.linkedin.com/in/jane-doe")
+        assert scraper.can_handle("https://linkedin.com/company/acme/")
+        assert not scraper.can_handle("https://linkedin.com/posts/jane")
+        assert not scraper.can_handle("https://linkedinXcom/in/jane")
+
+    @pytest.mark.asyncio
+    async def test_enrichment_cache_evicts_least_recently_used(self, monkeypatch):
+        """Test the enrichment cache keeps only the most recently used URLs."""
+        import httpx
+        from app.models import InvestorProfile
+        from app.providers.scraper import linkedin
+
+        fetched = []
+        client = httpx.AsyncClient(transport=httpx.MockTransport(
+            lambda request: fetched.append(str(request.url)) or httpx.Response(
+                200, text="<html></html>")))
+        monkeypatch.setattr(linkedin, "SCRAPED_PROFILE_CACHE_SIZE", 2)
+        scraper = linkedin.LinkedInScraperProvider()
+        scraper._client = client
+        monkeypatch.setattr(
+            scraper, "_extract_detailed_info", lambda soup: {"location": "NYC"})
+
+        urls = [f"https://linkedin.com/in/{n}" for n in ("a", "b", "a", "c")]
+        for url in urls:
+            await scraper.enrich_profile(InvestorProfile(name="x", linkedin_url=url))
+        await client.aclose()
+
+        assert fetched == [urls[0], urls[1], urls[3]]
+        assert list(scraper._scraped_profiles_cache) == [urls[0], urls[3]]
+
+    @pytest.mark.asyncio
+    async def test_public_profile_parsed_from_strained_tree(self):
+        """Test profile meta tags still parse and block pages are still caught."""
+        import httpx
+        from app.providers.scraper import linkedin
+
+        body = "<div>" + "<p>filler</p>" * 500 + "</div>"
+        pages = {
+            "/in/jane": ('<html><head><title>Jane Doe | LinkedIn</title>'
+                         '<meta property="og:title" content="Jane Doe - Partner | LinkedIn">'
+                         '<meta property="og:description" content="Partner at Acme Ventures. Fintech.">'
+                         f'</head><body><h1>Jane Doe</h1>{body}</body></html>'),
+            "/in/blocked": ('<html><head><title>Please verify you are human | LinkedIn</title>'
+                            '<meta property="og:title" content="Jane Doe - Partner | LinkedIn">'
+                            f'</head><body>{body}</body></html>'),
+        }
+        client = httpx.AsyncClient(transport=httpx.MockTransport(
+            lambda request: httpx.Response(200, text=pages[request.url.path])))
+        scraper = linkedin.LinkedInScraperProvider()
+        scraper._client = client
+        scraper._proxy, scraper._proxies = None, []
+
+        profile = await scraper.scrape_profile("https://linkedin.com/in/jane")
+        blocked = await scraper.scrape_profile("https://linkedin.com/in/blocked")
+        await client.aclose()
+
+        assert (profile.name, profile.title, profile.company) == (
+            "Jane Doe", "Partner", "Acme Ventures")
+        assert profile.investment_focus == ["fintech"]
+        # Block page falls back to the URL slug instead of the meta name
+        assert blocked.name == "Blocked"
+
+    @pytest.mark.asyncio
+    async def test_scraper_client_drops_cookies(self):
+        """Test cookies set by LinkedIn aren't sent on the next fetch."""
+        import httpx
+        from app.providers.scraper.linkedin import LinkedInScraperProvider
+
+        sent = []
+
+        def handler(request):
+            sent.append(request.headers.get("cookie"))
+            return httpx.Response(200, headers={
+                "Set-Cookie": "li_at=session; Domain=.linkedin.com; Path=/"})
+
+        scraper = LinkedInScraperProvider()
+        scraper._client = providers.cookieless_client(
+            transport=httpx.MockTransport(handler))
+        client = scraper._client
+
+        await scraper._get("https://www.linkedin.com/in/a", 5)
+        await scraper._get("https://www.linkedin.com/in/b", 5)
+        await scraper.cleanup()
+
+        assert sent == [None, None]
+        assert client.is_closed
+
+    def test_investment_focus_cached_and_copied(self):
+        """Test repeated text hits the cache and callers get their own list."""
+        from app.providers.scraper.linkedin import LinkedInScraperProvider, _focus_for
+
+        scraper = LinkedInScraperProvider()
+        bio = "Fintech and AI investor backing enterprise software and EV startups"
+        _focus_for.cache_clear()
+
+        first = scraper._extract_investment_focus(bio)
+        first.append("mutated")
+        second = scraper._extract_investment_focus(bio)
+
+        assert second == ["ai", "fintech", "saas", "mobility"]
+        assert _focus_for.cache_info().hits == 1
+
+
+class TestDependencies:
+    """Tests for the FastAPI provider dependencies."""
+
+    @pytest.mark.asyncio
+    async def test_llm_dependency_reuses_instance_until_cleanup(self, monkeypatch):
+        """Test warm calls reuse the cached provider and cleanup resets it."""
+        class WarmLLM:
+            def __init__(self, config):
+                self.config = config
+
+        test_registry = Registry()
+        test_registry.register("llm", "warm", WarmLLM)
+        monkeypatch.setattr(providers, "registry", test_registry)
+
+        dependency = providers.llm_dependency("warm", "Model-X")
+        first = await dependency()
+        second = await dependency()
+        await test_registry.cleanup_all()
+        third = await dependency()
+
+        assert first is second
+        assert third is not first
+
+
+class TestAnthropicMessages:
+    """Tests for Anthropic request building."""
+
+    def test_static_prompt_is_shared_cached_prefix(self):
+        """Test the default prompt block is reused and context follows it."""
+        from app.providers.llm.anthropic import AnthropicProvider
+
+        llm = AnthropicProvider(LLMConfig(model_name="m"))
+        messages = [
+            ChatMessage(role=MessageRole.SYSTEM, content="Be brief."),
+            ChatMessage(role=MessageRole.USER, content="hi"),
+        ]
+
+        system, chat = llm._build_messages(
+            messages, {"sectors_discussed": ["fintech"]})
+        bare, _ = llm._build_messages(messages[1:])
+
+        assert system[0] is bare[0] is AnthropicProvider.DEFAULT_SYSTEM_BLOCK
+        assert system[0]["cache_control"] == {"type": "ephemeral"}
+        assert system[1]["text"] == "Sectors discussed: fintech\n\nBe brief."
+        assert chat == [{"role": "user", "content": "hi"}]
+
+    @pytest.mark.asyncio
+    async def test_generate_response_collects_stream(self):
+        """Test the non-streaming call is the joined text stream."""
+        from app.providers.llm.anthropic import AnthropicProvider
+
+        class FakeStream:
+            async def __aenter__(self):
+                return self
+
+            async def __aexit__(self, *exc):
+                return False
+
+            @property
+            async def text_stream(self):
+                for text in ("Hel", "", "lo"):
+                    yield text
+
+        class FakeMessages:
+            def stream(self, **kwargs):
+                self.kwargs = kwargs
+                return FakeStream()
+
+        llm = AnthropicProvider(LLMConfig(model_name="m"))
+        llm._client = type("Client", (), {"messages": FakeMessages()})()
+        llm._initialized = True
+        messages = [ChatMessage(role=MessageRole.USER, content="hi")]
+
+        chunks = [c async for c in llm.generate_stream(messages)]
+
+        assert chunks == ["Hel", "lo"]
+        assert await llm.generate_response(messages) == "Hello"
+        assert llm._client.messages.kwargs["system"][0]["text"].startswith("You are")
+
+
+class TestGeminiPrompt:
+    """Tests for Gemini prompt building."""
+
+    def test_prefix_and_history_reused_across_turns(self, monkeypatch):
+        """Test unchanged context isn't rebuilt and history only grows."""
+        from app.models import InvestorProfile
+        from app.providers.llm.gemini import GeminiProvider
+
+        llm = GeminiProvider(LLMConfig(model_name="m"))
+        builds = []
+        build_prefix = llm._build_prefix
+        monkeypatch.setattr(
+            llm, "_build_prefix", lambda ctx: builds.append(ctx) or build_prefix(ctx))
+
+        context = {"conversation_id": "c1", "sectors_discussed": ["ai"],
+                   "investors": [InvestorProfile(name="Jane Doe")]}
+        first = [ChatMessage(role=MessageRole.USER, content="find ai investors")]
+        second = first + [
+            ChatMessage(role=MessageRole.ASSISTANT, content="Here they are"),
+            ChatMessage(role=MessageRole.USER, content="thanks")]
+
+        llm._build_prompt(first, context)
+        prompt = llm._build_prompt(second, dict(context))
+
+        assert len(builds) == 1
+        assert prompt == GeminiProvider(LLMConfig(model_name="m"))._build_prompt(
+            second, context)
+        assert prompt.endswith(
+            "User: find ai investors\nAssistant: Here they are\nUser: thanks")
+
+        llm._build_prompt(second, {**context, "sectors_discussed": ["bio"]})
+        assert len(builds) == 2
+
+    def test_sdk_configured_once_per_key(self, monkeypatch):
+        """Test genai.configure only runs again when the API key changes."""
+        from app.providers.llm import gemini
+
+        calls = []
+        genai = type("FakeGenai", (), {
+            "configure": staticmethod(lambda api_key: calls.append(api_key))})
+        monkeypatch.setattr(gemini, "_configured_key", None)
+
+        for key in ("k1", "k1", "k2", "k2"):
+            gemini._configure_genai(genai, key)
+
+        assert calls == ["k1", "k2"]
+
+    def test_retry_reuses_built_prompt(self):
+        """Test building again with the same inputs returns the same prompt."""
+        from app.providers.llm.gemini import GeminiProvider
+
+        llm = GeminiProvider(LLMConfig(model_name="m"))
+        messages = [ChatMessage(role=MessageRole.USER, content="find ai investors")]
+        context = {"conversation_id": "c1", "sectors_discussed": ["ai"]}
+
+        first = llm._build_prompt(messages, context)
+        retry = llm._build_prompt(list(messages), dict(context))
+        changed = llm._build_prompt(
+            messages + [ChatMessage(role=MessageRole.USER, content="more")], context)
+
+        assert retry is first
+        assert changed.endswith("User: find ai investors\nUser: more")
+
+    def test_investor_block_rendered_once_per_profile(self, monkeypatch):
+        """Test a profile is rendered once even when the context changes."""
+        from app.models import InvestorProfile
+        from app.providers.llm.gemini import GeminiProvider
+
+        llm = GeminiProvider(LLMConfig(model_name="m"))
+        rendered = []
+        block = GeminiProvider._investor_block
+        monkeypatch.setattr(
+            GeminiProvider, "_investor_block",
+            staticmethod(lambda inv: rendered.append(inv.name) or block(inv)))
+
+        jane = InvestorProfile(name="Jane Doe", title="Partner")
+        messages = [ChatMessage(role=MessageRole.USER, content="hi")]
+        for sectors in (["ai"], ["bio"]):
+            prompt = llm._build_prompt(
+                messages, {"sectors_discussed": sectors, "investors": [jane]})
+
+        assert rendered == ["Jane Doe"]
+        assert prompt.endswith(
+            'u=LinkedIn URL):\n{"n":"Jane Doe","t":"Partner"}\n\n\n💬 Conversation history:\nUser: hi')
+
+    def test_search_result_line_rendered_once(self, monkeypatch):
+        """Test a search result's preview line is built once per object."""
+        from app.models import SearchResult
+        from app.providers.llm.gemini import GeminiProvider
+
+        llm = GeminiProvider(LLMConfig(model_name="m"))
+        rendered = []
+        line = GeminiProvider._result_line
+        monkeypatch.setattr(
+            GeminiProvider, "_result_line",
+            staticmethod(lambda r: rendered.append(r.title) or line(r)))
+
+        result = SearchResult(title="Fund", url="https://x", snippet="s" * 300)
+        messages = [ChatMessage(role=MessageRole.USER, content="hi")]
+        for sectors in (["ai"], ["bio"]):
+            prompt = llm._build_prompt(
+                messages, {"sectors_discussed": sectors, "search_results": [result]})
+
+        assert rendered == ["Fund"]
+        assert f"- Fund: {'s' * 150}...\n" in prompt
+
+    @pytest.mark.asyncio
+    async def test_stream_forwards_sdk_chunks_unsplit(self):
+        """Test async stream chunks are yielded whole, leaving the loop free."""
+        from app.providers.llm.gemini import GeminiProvider
+
+        ticks = []
+
+        class Chunk:
+            def __init__(self, text):
+                self.text = text
+
+        async def chunks_from_socket():
+            for text in ("Hello there, ", "", "investor."):
+                await asyncio.sleep(0.01)
+                yield Chunk(text)
+
+        class FakeModel:
+            async def generate_content_async(self, prompt, stream=False):
+                assert stream
+                return chunks_from_socket()
+
+        async def ticker():
+            while True:
+                ticks.append(None)
+                await asyncio.sleep(0.005)
+
+        llm = GeminiProvider(LLMConfig(model_name="m"))
+        llm._model = FakeModel()
+        llm.mark_initialized()
+
+        task = asyncio.ensure_future(ticker())
+        chunks = [c async for c in llm.generate_stream(
+            [ChatMessage(role=MessageRole.USER, content="hi")])]
+        task.cancel()
+
+        assert chunks == ["Hello there, ", "investor."]
+        assert len(ticks) > 3
+
+    @pytest.mark.asyncio
+    async def test_stateless_calls_run_concurrently(self):
+        """Test each turn is one stateless call and turns overlap."""
+        from app.providers.llm.gemini import GeminiProvider
+
+        state = {"active": 0, "peak": 0, "prompts": []}
+
+        class FakeModel:
+            async def generate_content_async(self, prompt, stream=False):
+                state["active"] += 1
+                state["peak"] = max(state["peak"], state["active"])
+                state["prompts"].append(prompt)
+                await asyncio.sleep(0.02)
+                state["active"] -= 1
+                return type("Response", (), {"text": "ok"})()
+
+        llm = GeminiProvider(LLMConfig(model_name="m"))
+        llm._model = FakeModel()
+        llm.mark_initialized()
+        messages = [ChatMessage(role=MessageRole.USER, content="hi"),
+                    ChatMessage(role=MessageRole.ASSISTANT, content="hello"),
+                    ChatMessage(role=MessageRole.USER, content="more")]
+
+        results = await asyncio.gather(*(
+            llm.generate_response(messages, {"conversation_id": "c1"})
+            for _ in range(3)))
+
+        assert results == ["ok"] * 3
+        assert state["peak"] > 1
+        assert all(p.endswith("User: hi\nAssistant: hello\nUser: more")
+                   for p in state["prompts"])
+
+    @pytest.mark.asyncio
+    async def test_old_turns_replaced_by_rolling_summary(self):
+        """Test old messages are summarized in batches, not on every turn."""
+        from app.providers.llm.gemini import GeminiProvider
+
+        requests = []
+
+        class FakeModel:
+            async def generate_content_async(self, prompt, generation_config=None):
+                requests.append((prompt, generation_config))
+                return type("Response", (), {"text": f"summary {len(requests)}"})()
+
+        llm = GeminiProvider(LLMConfig(
+            model_name="m", extra_params={"history_keep_messages": 2}))
+        llm._model = FakeModel()
+        messages = [ChatMessage(role=MessageRole.USER, content=f"turn {n}")
+                    for n in range(5)]
+
+        await llm._summarize_old_turns("c1", messages)
+        await llm._summarize_old_turns("c1", messages)
+        prompt = llm._build_prompt(messages, {"conversation_id": "c1"})
+
+        assert len(requests) == 1
+        assert requests[0][1] == {"temperature": 0.3}
+        assert "User: turn 2" in requests[0][0] and "turn 3" not in requests[0][0]
+        assert prompt.endswith(
+            "📜 Prior summary:\nsummary 1\n\nUser: turn 3\nUser: turn 4")
+        assert "turn 0" not in prompt
+
+        # Messages accumulate verbatim until more than 4 are pending again
+        for n in (5, 6):
+            messages += [ChatMessage(role=MessageRole.USER, content=f"turn {n}")]
+            await llm._summarize_old_turns("c1", messages)
+        prompt = llm._build_prompt(messages, {"conversation_id": "c1"})
+
+        assert len(requests) == 1
+        assert prompt.endswith("summary 1\n\nUser: turn 3\nUser: turn 4"
+                               "\nUser: turn 5\nUser: turn 6")
+
+        messages += [ChatMessage(role=MessageRole.USER, content="turn 7")]
+        await llm._summarize_old_turns("c1", messages)
+        prompt = llm._build_prompt(messages, {"conversation_id": "c1"})
+
+        assert len(requests) == 2
+        assert "Current summary:\nsummary 1" in requests[1][0]
+        assert "User: turn 5" in requests[1][0] and "turn 2" not in requests[1][0]
+        assert prompt.endswith("summary 2\n\nUser: turn 6\nUser: turn 7")
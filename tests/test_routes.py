@@ -105,6 +105,29 @@ class TestChatEndpoint:
 
         assert response.status_code == 422  # Validation error
 
+    def test_chat_response_serialized_once(self):
+        """Test the chat response is returned as the model's own JSON."""
+        from app.models import ChatResponse, InvestorProfile
+        from app.routes.chat import get_chat_service
+
+        class FakeChatService:
+            async def process_message(self, request):
+                return ChatResponse(
+                    message="Hi", conversation_id="c1",
+                    investors=[InvestorProfile(name="Jane Doe")])
+
+        app.dependency_overrides[get_chat_service] = FakeChatService
+        try:
+            response = client.post("/api/v1/chat", json={"message": "hello"})
+        finally:
+            app.dependency_overrides.clear()
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/json"
+        data = response.json()
+        assert data["message"] == "Hi"
+        assert data["investors"][0]["name"] == "Jane Doe"
+
 
 class TestConversationEndpoints:
     """Tests for conversation management endpoints."""